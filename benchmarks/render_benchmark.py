@@ -1,8 +1,23 @@
 #!/usr/bin/env python3
-"""Benchmark para comparar performance das implementações de _render()."""
+"""Benchmark para comparar performance das implementações de _render().
 
+Também compara, nos .graphql reais do pacote, a montagem do payload com
+valores interpolados no documento (re.sub / template pré-compilado) contra o
+caminho atual: documento constante + variáveis GraphQL.
+"""
+
+import json
 import re
+import sys
 import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from shopee_affiliate.transport import _encode_payload  # noqa: E402
+
+GRAPHQL_DIR = ROOT / "src" / "shopee_affiliate" / "graphql"
 
 
 def render_old(template: str, mapping: dict) -> str:
@@ -101,5 +116,133 @@ def benchmark():
         print(f"   ⚠️  Abaixo da meta (3-5x)")
 
 
+_PLACEHOLDER = re.compile(r"{{([a-zA-Z_][a-zA-Z0-9_]*)}}")
+
+
+class CompiledTemplate:
+    """Template pré-compilado (segmentos literais + slots), usado até os
+    documentos passarem a usar variáveis GraphQL."""
+
+    def __init__(self, source: str):
+        self._parts = []
+        self._slots = []
+        pos = 0
+        for m in _PLACEHOLDER.finditer(source):
+            self._parts.append(source[pos : m.start()])
+            self._slots.append((len(self._parts), m.group(1)))
+            self._parts.append("")
+            pos = m.end()
+        self._parts.append(source[pos:])
+
+    def render(self, mapping: dict) -> str:
+        parts = self._parts.copy()
+        for index, key in self._slots:
+            parts[index] = mapping[key]
+        return "".join(parts)
+
+
+# Valores de exemplo para as variáveis declaradas nos .graphql
+SAMPLE_VARIABLES = {
+    "keyword": "tenis corrida",
+    "sortType": 2,
+    "page": 3,
+    "limit": 50,
+    "shopId": 123456789,
+    "shopType": [1, 4],
+    "isKeySeller": True,
+    "itemId": 987654321,
+    "productCatId": 100017,
+    "listType": 0,
+    "matchId": 42,
+    "purchaseTimeStart": 1760000000,
+    "purchaseTimeEnd": 1760600000,
+    "scrollId": "c2Nyb2xsLWlk",
+    "input": {"originUrl": "https://shopee.com.br/product/1/2", "subIds": ["a1"]},
+    "feedMode": "DELTA",
+    "datafeedId": "1700000000123",
+    "offset": 1500,
+    "completeTimeStart": 1760000000,
+    "completeTimeEnd": 1760600000,
+    "searchNextToken": "c2VhcmNoLW5leHQ",
+    # filtros do conversionReport
+    "shopName": "Loja Exemplo",
+    "conversionId": 111222333,
+    "conversionStatus": "COMPLETED",
+    "checkoutId": 444555666,
+    "orderId": "240101ABCDEF",
+    "productName": "tenis",
+    "productId": 987654321,
+    "categoryLv1Id": 100001,
+    "categoryLv2Id": 100010,
+    "categoryLv3Id": 100100,
+    "categoryType": "MP",
+    "orderStatus": "COMPLETED",
+    "buyerType": "NEW",
+    "productType": "MP",
+    "fraudStatus": "VERIFIED",
+    "device": "APP",
+    "attributionType": "ORDERED_IN_SAME_SHOP",
+    "campaignPartnerName": "parceiro",
+    "campaignType": "SELLER_OPEN_CAMPAIGN",
+}
+
+
+def legacy_template(document: str) -> str:
+    """Reconstrói o template antigo ({{arg}} interpolado) a partir do documento."""
+    kind = document.split(None, 1)[0]  # query | mutation
+    body = document[document.index("{") :]
+    return kind + " " + re.sub(r"\$([A-Za-z_]\w*)", r"{{\1}}", body)
+
+
+def benchmark_real_templates(runs: int = 20000):
+    """Payload por chamada: interpolação (re.sub / compilado) x variáveis."""
+    print(
+        f"\n📂 .graphql reais ({GRAPHQL_DIR.relative_to(ROOT)}, {runs:,} iterações):"
+    )
+    print(
+        f"   {'arquivo':<32} {'re.sub':>9} {'compilado':>10} "
+        f"{'variáveis':>10} {'speedup':>8}"
+    )
+
+    totals = [0.0, 0.0, 0.0]
+    for path in sorted(GRAPHQL_DIR.glob("*.graphql")):
+        document = path.read_text(encoding="utf-8")
+        template = legacy_template(document)
+        keys = sorted(set(_PLACEHOLDER.findall(template)))
+        variables = {key: SAMPLE_VARIABLES[key] for key in keys}
+        compiled = CompiledTemplate(template)
+
+        def via_sub():
+            mapping = {k: json.dumps(v) for k, v in variables.items()}
+            payload = {"query": render_new(template, mapping)}
+            return json.dumps(payload, separators=(",", ":"))
+
+        def via_compiled():
+            mapping = {k: json.dumps(v) for k, v in variables.items()}
+            payload = {"query": compiled.render(mapping)}
+            return json.dumps(payload, separators=(",", ":"))
+
+        def via_variables():
+            return _encode_payload(document, variables)
+
+        assert via_sub() == via_compiled(), f"Saídas diferentes em {path.name}"
+
+        times = [
+            timeit.timeit(fn, number=runs)
+            for fn in (via_sub, via_compiled, via_variables)
+        ]
+        totals = [t + d for t, d in zip(totals, times)]
+        print(
+            f"   {path.name:<32} {times[0]:>8.4f}s {times[1]:>9.4f}s "
+            f"{times[2]:>9.4f}s {times[0] / times[2]:>7.2f}x"
+        )
+
+    print(
+        f"   {'TOTAL':<32} {totals[0]:>8.4f}s {totals[1]:>9.4f}s "
+        f"{totals[2]:>9.4f}s {totals[0] / totals[2]:>7.2f}x"
+    )
+
+
 if __name__ == "__main__":
     benchmark()
+    benchmark_real_templates()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Exporta conversionReport em formato colunar (Parquet / Arrow IPC).
+
+- Acumula as linhas em lotes colunares (--batch-rows) e grava um row group
+  por lote: arquivo menor e bem mais rápido de carregar no BI que o CSV.
+- Requer o extra "parquet" (pyarrow); sem ele, grava JSONL compacto.
+- Requer .env com SHOPEE_APP_ID e SHOPEE_APP_SECRET (ou SHOPEE_SECRET).
+
+Uso:
+  uv run --python .venv/bin/python python examples/python/export_conversion_report_parquet.py \
+    --days 30 --out conversion_report.parquet
+
+Dica:
+  --out conversion_report.arrow grava Arrow IPC; --format jsonl força JSONL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+
+from shopee_affiliate import ShopeeAffiliateClient
+from shopee_affiliate.export import DEFAULT_BATCH_ROWS, FORMATS, write_conversion_report
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--days", type=int, default=30, help="Janela retroativa em dias")
+    p.add_argument(
+        "--out", type=str, default="conversion_report.parquet", help="Arquivo de saída"
+    )
+    p.add_argument("--format", choices=FORMATS, default="auto", help="Formato de saída")
+    p.add_argument(
+        "--batch-rows",
+        type=int,
+        default=DEFAULT_BATCH_ROWS,
+        help="Linhas por row group/record batch",
+    )
+    p.add_argument(
+        "--max-pages", type=int, default=None, help="Limita número de páginas (debug)"
+    )
+    p.add_argument("--limit", type=int, default=500, help="Itens por página (máx 500)")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
+    app_id = os.getenv("SHOPEE_APP_ID")
+    secret = os.getenv("SHOPEE_APP_SECRET") or os.getenv("SHOPEE_SECRET")
+    if not app_id or not secret:
+        raise SystemExit(
+            "Defina SHOPEE_APP_ID e SHOPEE_APP_SECRET (ou SHOPEE_SECRET) no .env"
+        )
+
+    client = ShopeeAffiliateClient(app_id, secret)
+
+    now = int(time.time())
+    start = now - (args.days * 24 * 60 * 60)
+
+    orders = client.iter_conversion_report_orders(
+        purchase_time_start=start,
+        purchase_time_end=now,
+        limit=args.limit,
+        max_pages=args.max_pages,
+        prefetch=2,
+    )
+    summary = write_conversion_report(
+        orders, args.out, format=args.format, batch_rows=args.batch_rows
+    )
+
+    print(f"OK: exportados {summary.rows} itens para {summary.path} ({summary.format})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Gera src/shopee_affiliate/models.py a partir de docs/introspection_raw.json.
+
+Cada tipo de MODELS vira uma classe com __slots__ (ver model_base.Model).
+`_selectable`/`_nested` também alimentam a projeção de campos (projection.py),
+e `ENUMS` (valores dos enums do schema) valida os filtros de queries.py.
+Strings de baixa cardinalidade (INTERNED_FIELD) são internadas. Campos
+numéricos que a API entrega como string decimal viram LazyNumber (convertidos
+no primeiro acesso). Como a introspecção salva não traz o tipo de boa parte
+dos campos, a detecção é pelo nome (NUMERIC_FIELD).
+
+Uso:
+  python scripts/generate_models.py          # reescreve models.py
+  python scripts/generate_models.py --check  # falha se models.py estiver desatualizado
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+INTROSPECTION = ROOT / "docs" / "introspection_raw.json"
+OUTPUT = ROOT / "src" / "shopee_affiliate" / "models.py"
+
+# tipo do schema -> classe gerada (ordem: dependências antes)
+MODELS = {
+    "ConversionReportOrderItem": "ConversionItem",
+    "ConversionReportOrder": "ConversionOrder",
+    "ConversionReport": "Conversion",
+    "ProductOfferV2": "ProductOffer",
+    "ShopOfferV2": "ShopOffer",
+    "ShopeeOfferV2": "ShopeeOffer",
+    "PartnerReportOrderItem": "PartnerOrderItem",
+    "ExtInfo": "PartnerExtInfo",
+    "PartnerOrder": "PartnerOrder",
+}
+
+# (tipo, campo) -> tipo aninhado
+NESTED = {
+    ("ConversionReport", "orders"): "ConversionReportOrder",
+    ("ConversionReportOrder", "items"): "ConversionReportOrderItem",
+    ("PartnerOrder", "items"): "PartnerReportOrderItem",
+    ("PartnerOrder", "extInfo"): "ExtInfo",
+}
+
+# Campos fora do schema que o client copia para o modelo
+# (reports.conversion_page_orders leva o contexto da conversão para o order).
+EXTRA_FIELDS = {
+    "ConversionReportOrder": ("purchaseTime", "conversionId", "conversionStatus"),
+}
+
+# query raiz -> modelo dos nodes
+QUERY_MODELS = {
+    "conversionReport": "ConversionReport",
+    "productOfferV2": "ProductOfferV2",
+    "shopOfferV2": "ShopOfferV2",
+    "shopeeOfferV2": "ShopeeOfferV2",
+    "partnerOrderReport": "PartnerOrder",
+}
+
+NUMERIC_FIELD = re.compile(
+    r"(Rate|Commission|commission|Capped|Price|price|Amount|Fee|ratingStar|sales"
+    r"|Ratio|remainingBudget)"
+)
+NOT_NUMERIC = {"campaignPartnerName"}
+
+# Strings repetidas entre milhares de registros: internadas no from_dict.
+INTERNED_FIELD = re.compile(
+    r"(Status|Type|Lv\dName|^shopName|Reason|^device|^referrer)$"
+)
+
+
+def _schema_fields(path: Path) -> dict[str, dict[str, str | None]]:
+    """tipo -> {campo: kind do tipo do campo} (ordem do schema)."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    schema = data.get("data", data).get("__schema", data)
+    return {
+        t["name"]: {f["name"]: (f.get("type") or {}).get("kind") for f in t["fields"]}
+        for t in schema["types"]
+        if t.get("kind") == "OBJECT" and t.get("fields")
+    }
+
+
+def _schema_enums(path: Path) -> dict[str, list[str]]:
+    """enum -> valores (ordem do schema), sem os enums de introspecção."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    schema = data.get("data", data).get("__schema", data)
+    return {
+        t["name"]: [v["name"] for v in t.get("enumValues") or []]
+        for t in schema["types"]
+        if t.get("kind") == "ENUM" and not t["name"].startswith("__")
+    }
+
+
+def render(path: Path = INTROSPECTION) -> str:
+    fields_by_type = _schema_fields(path)
+    out = [
+        '"""Modelos de resposta com __slots__ e decodificação numérica preguiçosa.',
+        "",
+        "GERADO por scripts/generate_models.py a partir de docs/introspection_raw.json;",
+        "não edite à mão.",
+        '"""',
+        "",
+        "from __future__ import annotations",
+        "",
+        "from typing import Any, Dict, List, Tuple, Type",
+        "",
+        "from .model_base import LazyNumber, Model",
+    ]
+    for type_name, class_name in MODELS.items():
+        schema_fields = fields_by_type[type_name]
+        fields = list(schema_fields) + [
+            f for f in EXTRA_FIELDS.get(type_name, ()) if f not in schema_fields
+        ]
+        # Selecionáveis numa query: campos do schema, exceto objetos sem modelo
+        # (precisariam de sub-seleção desconhecida, ex.: bannerInfo).
+        selectable = [
+            f
+            for f, kind in schema_fields.items()
+            if kind != "OBJECT" or (type_name, f) in NESTED
+        ]
+        numeric = [
+            f for f in fields if NUMERIC_FIELD.search(f) and f not in NOT_NUMERIC
+        ]
+        slots = [f"_{f}" if f in numeric else f for f in fields]
+        nested = {
+            f: MODELS[NESTED[(type_name, f)]]
+            for f in fields
+            if (type_name, f) in NESTED
+        }
+        out += ["", "", f"class {class_name}(Model):", f'    """`{type_name}`."""', ""]
+        out.append("    __slots__ = (")
+        out += [f'        "{s}",' for s in slots]
+        out.append("    )")
+        out.append("    _fields = (")
+        out += [f'        "{f}",' for f in fields]
+        out.append("    )")
+        out.append("    _slots = __slots__")
+        if selectable == fields:
+            out.append("    _selectable = _fields")
+        else:
+            out.append("    _selectable = (")
+            out += [f'        "{f}",' for f in selectable]
+            out.append("    )")
+        if nested:
+            items = ", ".join(f'"{f}": {m}' for f, m in nested.items())
+            out.append(f"    _nested = {{{items}}}")
+        interned = [f for f in fields if INTERNED_FIELD.search(f)]
+        if len(interned) == 1:
+            out.append(f'    _interned = frozenset(("{interned[0]}",))')
+        elif interned:
+            out.append("    _interned = frozenset(")
+            out.append("        (")
+            out += [f'            "{f}",' for f in interned]
+            out.append("        )")
+            out.append("    )")
+        if numeric:
+            out.append("")
+            out += [f'    {f} = LazyNumber("_{f}")' for f in numeric]
+
+    out += [
+        "",
+        "",
+        "# enum do schema -> valores",
+        "ENUMS: Dict[str, Tuple[str, ...]] = {",
+    ]
+    for enum, values in _schema_enums(path).items():
+        if len(values) == 1:
+            out.append(f'    "{enum}": ("{values[0]}",),')
+            continue
+        out.append(f'    "{enum}": (')
+        out += [f'        "{v}",' for v in values]
+        out.append("    ),")
+    out += [
+        "}",
+        "",
+        "",
+        "# query raiz -> modelo dos nodes",
+        "QUERY_MODELS: Dict[str, Type[Model]] = {",
+    ]
+    out += [f'    "{q}": {MODELS[t]},' for q, t in QUERY_MODELS.items()]
+    out += [
+        "}",
+        "",
+        "",
+        "def parse_nodes(resp: Dict[str, Any], field: str) -> List[Any]:",
+        '    """Converte `resp["data"][field]["nodes"]` nos modelos de `QUERY_MODELS`."""',
+        '    data = (resp.get("data") or {}).get(field) or {}',
+        '    return QUERY_MODELS[field].from_list(data.get("nodes") or [])',
+        "",
+    ]
+    return "\n".join(out)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--check", action="store_true", help="Só verifica se está atualizado"
+    )
+    args = p.parse_args()
+
+    code = render()
+    if args.check:
+        if OUTPUT.read_text(encoding="utf-8") != code:
+            print(f"{OUTPUT} desatualizado; rode scripts/generate_models.py")
+            return 1
+        print("OK: models.py atualizado")
+        return 0
+    OUTPUT.write_text(code, encoding="utf-8")
+    print(f"OK: {OUTPUT}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,7 @@ Import recomendado para uso externo:
 (o módulo `shopee_affiliate_client` é um wrapper de compatibilidade.)
 """
 
-from .client import ShopeeAffiliateClient
+from .client import AsyncShopeeAffiliateClient, ShopeeAffiliateClient
 
 __version__ = "1.0.0"
-__all__ = ["ShopeeAffiliateClient"]
+__all__ = ["AsyncShopeeAffiliateClient", "ShopeeAffiliateClient"]
@@ -0,0 +1,182 @@
+"""Análises de comissão vetorizadas (NumPy) sobre itens do conversionReport.
+
+`CommissionFrame.from_orders` percorre os orders uma única vez (via
+`export.iter_item_rows`, que já converte as strings numéricas) e guarda cada
+coluna num array NumPy; loja (por `shopId`) e categoria viram códigos
+inteiros (categóricos). A partir daí totais, group-by, percentis e top-N são operações
+vetorizadas (`np.bincount`, `np.percentile`, `np.argpartition`), sem loops
+Python por item.
+
+`numpy` é opcional (extra "analytics").
+
+Uso:
+
+    frame = CommissionFrame.from_orders(client.iter_conversion_report_orders(s, e))
+    frame.totals()
+    frame.sum_by("category")
+    frame.top("shop", n=10)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .export import iter_item_rows
+
+try:  # dependência opcional (extra "analytics")
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None  # type: ignore[assignment]
+
+# Métricas disponíveis para group-by/percentis/top-N.
+VALUES = ("total_commission", "seller_commission", "shopee_commission", "gmv", "qty")
+# Chaves categóricas: (coluna que identifica o grupo, coluna de rótulo).
+# Loja agrupa por shopId: nomes repetidos entre lojas não se misturam e uma
+# loja renomeada continua um grupo só (rótulo = nome mais recente).
+KEYS = {
+    "shop": ("shopId", "shopName"),
+    "category": ("globalCategoryLv1Name", "globalCategoryLv1Name"),
+}
+
+
+def _text(values: Sequence[Any]) -> "np.ndarray":
+    return np.array(["" if v is None else str(v) for v in values], dtype=object)
+
+
+def _encode(
+    keys: Sequence[Any], labels: Sequence[Any]
+) -> Tuple["np.ndarray", List[str], List[str]]:
+    """Chaves -> (códigos int32, categorias, rótulos). `None` vira "".
+
+    O rótulo de cada categoria é o do último item (na ordem de entrada).
+    """
+    values = _text(keys)
+    if not len(values):
+        return np.zeros(0, dtype=np.int32), [], []
+    categories, codes = np.unique(values, return_inverse=True)
+    last = np.zeros(len(categories), dtype=np.int64)
+    np.maximum.at(last, codes, np.arange(len(codes)))
+    names = _text(labels)[last]
+    return codes.astype(np.int32), [str(c) for c in categories], [str(n) for n in names]
+
+
+class CommissionFrame:
+    """Colunas de itens do conversionReport em arrays NumPy.
+
+    Atributos (todos com um elemento por item):
+        price, qty, total_commission, seller_commission, shopee_commission,
+        gmv (price * qty), purchase_time; e, para cada chave de `KEYS`,
+        códigos em `codes[key]`, chaves dos grupos em `categories[key]` e
+        rótulos em `labels[key]`.
+    """
+
+    def __init__(self, columns: Dict[str, Sequence[Any]]):
+        if np is None:
+            raise ImportError(
+                "CommissionFrame requer numpy "
+                '(pip install "shopee-afiliados-docs[analytics]")'
+            )
+
+        def numeric(name: str) -> "np.ndarray":
+            # None -> NaN; nansum/nanpercentile ignoram ausentes.
+            return np.array(columns[name], dtype=np.float64)
+
+        self.price = numeric("itemPrice")
+        self.qty = np.nan_to_num(numeric("qty"))
+        self.total_commission = numeric("itemTotalCommission")
+        self.seller_commission = numeric("itemSellerCommission")
+        self.shopee_commission = self.total_commission - np.nan_to_num(
+            self.seller_commission
+        )
+        self.gmv = self.price * self.qty
+        self.purchase_time = numeric("purchaseTime")
+        self.codes: Dict[str, "np.ndarray"] = {}
+        self.categories: Dict[str, List[str]] = {}
+        self.labels: Dict[str, List[str]] = {}
+        for key, (column, label) in KEYS.items():
+            self.codes[key], self.categories[key], self.labels[key] = _encode(
+                columns[column], columns[label]
+            )
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Dict[str, Any]]) -> "CommissionFrame":
+        columns: Dict[str, List[Any]] = {
+            name: []
+            for name in (
+                "itemPrice",
+                "qty",
+                "itemTotalCommission",
+                "itemSellerCommission",
+                "purchaseTime",
+                *{column for pair in KEYS.values() for column in pair},
+            )
+        }
+        for row in iter_item_rows(orders):
+            for name, values in columns.items():
+                values.append(row[name])
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def _values(self, value: str) -> "np.ndarray":
+        if value not in VALUES:
+            raise ValueError(f"value deve ser um de {VALUES}")
+        return getattr(self, value)
+
+    def _codes(self, key: str) -> "np.ndarray":
+        if key not in KEYS:
+            raise ValueError(f"key deve ser um de {tuple(KEYS)}")
+        return self.codes[key]
+
+    def totals(self) -> Dict[str, float]:
+        """Somas gerais (inclui a divisão comissão vendedor x Shopee)."""
+        out = {value: float(np.nansum(getattr(self, value))) for value in VALUES}
+        out["items"] = float(len(self))
+        return out
+
+    def sum_by(
+        self, key: str, value: str = "total_commission"
+    ) -> List[Tuple[str, str, float]]:
+        """Soma de `value` por `key` ("shop" ou "category"), maior primeiro.
+
+        Retorna (chave do grupo, rótulo, soma): para "shop", (shopId,
+        shopName, soma); para "category", o nome nas duas posições.
+        """
+        sums = self._grouped_sums(key, value)
+        return self._groups(key, sums, np.argsort(-sums, kind="stable"))
+
+    def top(
+        self, key: str, n: int = 10, value: str = "total_commission"
+    ) -> List[Tuple[str, str, float]]:
+        """Os `n` grupos com maior soma de `value` (argpartition + sort de n)."""
+        sums = self._grouped_sums(key, value)
+        if n <= 0 or not len(sums):
+            return []
+        if n < len(sums):
+            idx = np.argpartition(-sums, n - 1)[:n]
+        else:
+            idx = np.arange(len(sums))
+        idx = idx[np.argsort(-sums[idx], kind="stable")]
+        return self._groups(key, sums, idx)
+
+    def _groups(
+        self, key: str, sums: "np.ndarray", idx: Iterable[int]
+    ) -> List[Tuple[str, str, float]]:
+        categories, labels = self.categories[key], self.labels[key]
+        return [(categories[i], labels[i], float(sums[i])) for i in idx]
+
+    def percentiles(
+        self, value: str = "total_commission", q: Sequence[float] = (50, 90, 99)
+    ) -> Dict[float, float]:
+        """Percentis de `value` por item (ignora ausentes)."""
+        values = self._values(value)
+        if not np.any(~np.isnan(values)):
+            return {float(p): float("nan") for p in q}
+        result = np.nanpercentile(values, list(q))
+        return {float(p): float(r) for p, r in zip(q, result)}
+
+    def _grouped_sums(self, key: str, value: str) -> "np.ndarray":
+        codes = self._codes(key)
+        values = np.nan_to_num(self._values(value))
+        return np.bincount(codes, weights=values, minlength=len(self.categories[key]))
@@ -5,16 +5,49 @@ import time
 
 
 def generate_signature(
-    app_id: str, app_secret: str, payload: str, timestamp: int
+    app_id: str, app_secret: str, payload: str | bytes, timestamp: int
 ) -> str:
-    """SHA256(AppId + Timestamp + Payload + Secret)."""
-    sign_factor = f"{app_id}{timestamp}{payload}{app_secret}"
-    return hashlib.sha256(sign_factor.encode()).hexdigest()
+    """SHA256(AppId + Timestamp + Payload + Secret).
+
+    `payload` pode vir já em bytes UTF-8 (como o transport envia).
+    """
+    return Signer(app_id, app_secret).signature(payload, timestamp)
 
 
 def build_authorization_header(
-    app_id: str, app_secret: str, payload: str, *, timestamp: int | None = None
+    app_id: str, app_secret: str, payload: str | bytes, *, timestamp: int | None = None
 ) -> str:
-    ts = int(time.time()) if timestamp is None else int(timestamp)
-    signature = generate_signature(app_id, app_secret, payload, ts)
-    return f"SHA256 Credential={app_id}, Timestamp={ts}, Signature={signature}"
+    return Signer(app_id, app_secret).authorization_header(payload, timestamp=timestamp)
+
+
+class Signer:
+    """Assinador reutilizável de um par AppId/Secret.
+
+    Guarda um estado `sha256` já alimentado com o AppId; cada assinatura copia
+    esse estado e acrescenta timestamp, payload e secret com `update()`, sem
+    montar a string concatenada (nem copiar payloads grandes). O transport cria
+    um por instância e assina os mesmos bytes em todas as tentativas.
+    """
+
+    __slots__ = ("app_id", "_prefix", "_secret")
+
+    def __init__(self, app_id: str, app_secret: str):
+        self.app_id = app_id
+        self._prefix = hashlib.sha256(app_id.encode())
+        self._secret = app_secret.encode()
+
+    def signature(self, payload: str | bytes, timestamp: int) -> str:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        h = self._prefix.copy()
+        h.update(b"%d" % timestamp)
+        h.update(payload)
+        h.update(self._secret)
+        return h.hexdigest()
+
+    def authorization_header(
+        self, payload: str | bytes, *, timestamp: int | None = None
+    ) -> str:
+        ts = int(time.time()) if timestamp is None else int(timestamp)
+        signature = self.signature(payload, ts)
+        return f"SHA256 Credential={self.app_id}, Timestamp={ts}, Signature={signature}"
@@ -0,0 +1,192 @@
+"""Cache de links curtos gerados (`generateShortLink` / `generateBatchShortLink`).
+
+A maior parte do tráfego re-linka os mesmos produtos; o cache evita uma
+mutation por URL já convertida. Duas camadas:
+
+- LRU em memória (`maxsize` entradas), consultada primeiro;
+- store SQLite opcional em disco (`path`), que sobrevive a restarts e pode
+  ser compartilhado entre processos.
+
+Ambas respeitam TTL (`ttl_s`) e tamanho máximo (evicção por acesso mais antigo).
+
+A chave é normalizada (`normalize_link_key`): esquema/host em minúsculas, sem
+fragmento, query string ordenada, e os subIds na ordem dada (a posição define
+subId1..subId5 no relatório).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS short_links (
+        key TEXT PRIMARY KEY,
+        short_link TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_short_links_accessed ON short_links (accessed_at)",
+    "CREATE INDEX IF NOT EXISTS ix_short_links_expires ON short_links (expires_at)",
+)
+
+
+# A evicção em disco (COUNT + DELETE) é amortizada a cada N escritas.
+_EVICT_EVERY = 256
+
+# Um hit em disco só regrava `accessed_at` se o valor tiver mais que isso:
+# a evicção por acesso não precisa de precisão de segundos, e cada leitura
+# deixaria de ser uma escrita síncrona.
+_TOUCH_AFTER_S = 3600.0
+
+
+def normalize_link_key(origin_url: str, sub_ids: Optional[Sequence[str]]) -> str:
+    """Chave canônica para (origin_url, sub_ids)."""
+    parts = urlsplit(origin_url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    url = urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+    )
+    return "\x1f".join([url, *(sub_ids or ())])
+
+
+class ShortLinkCache:
+    """LRU em memória + store SQLite opcional, com TTL e contadores.
+
+    Args:
+        path: arquivo SQLite (None = somente memória).
+        maxsize: entradas na LRU em memória (0 = somente disco).
+        disk_maxsize: entradas no SQLite antes de evictar as menos acessadas.
+        ttl_s: validade de cada link (padrão 30 dias).
+        clock: relógio de parede (injetável em testes).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        *,
+        maxsize: int = 10_000,
+        disk_maxsize: int = 1_000_000,
+        ttl_s: float = 30 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._writes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._conn = sqlite3.connect(
+                str(path), timeout=30.0, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+
+    def get(self, origin_url: str, sub_ids: Optional[Sequence[str]]) -> Optional[str]:
+        key = normalize_link_key(origin_url, sub_ids)
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._memory[key]
+                entry = None
+
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT short_link, expires_at, accessed_at FROM short_links"
+                    " WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    if now - row[2] >= _TOUCH_AFTER_S:
+                        self._conn.execute(
+                            "UPDATE short_links SET accessed_at = ? WHERE key = ?",
+                            (now, key),
+                        )
+                        self._conn.commit()
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[0]
+
+    def set(
+        self, origin_url: str, sub_ids: Optional[Sequence[str]], short_link: str
+    ) -> None:
+        key = normalize_link_key(origin_url, sub_ids)
+        now = self._clock()
+        entry = (short_link, now + self.ttl_s)
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO short_links (key, short_link, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET short_link = excluded.short_link,"
+                    " expires_at = excluded.expires_at,"
+                    " accessed_at = excluded.accessed_at",
+                    (key, short_link, entry[1], now),
+                )
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict_disk(now)
+                self._conn.commit()
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        assert self._conn is not None
+        self._conn.execute("DELETE FROM short_links WHERE expires_at <= ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM short_links").fetchone()
+        if count > self.disk_maxsize:
+            self._conn.execute(
+                "DELETE FROM short_links WHERE key IN ("
+                " SELECT key FROM short_links ORDER BY accessed_at LIMIT ?)",
+                (count - self.disk_maxsize,),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM short_links")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
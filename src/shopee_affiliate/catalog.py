@@ -0,0 +1,371 @@
+"""Catálogo local (SQLite) mantido por item feeds FULL + DELTA.
+
+Baixar o feed FULL todo dia custa horas e boa parte da cota, mesmo quando
+só uma fração pequena dos itens mudou. `FeedCatalog` carrega um feed FULL
+uma vez e depois aplica apenas feeds DELTA: cada linha traz `updateType`
+(`NEW`/`UPDATE`/`DELETE`) e é inserida, atualizada ou removida pela chave do
+item.
+
+- `items`: um registro por chave de item, com as `columns` como vieram;
+- `applied_feeds`: feeds já aplicados (um DELTA nunca é aplicado duas vezes).
+
+As linhas chegam direto do download (que no FULL leva horas) e vão primeiro,
+em lotes, para uma tabela TEMP da conexão; só essa tabela é escrita enquanto
+o download corre, então `get`/`count` e outros processos seguem normalmente.
+No fim, a carga/aplicação roda numa única transação curta a partir da tabela
+temporária; uma falha no meio do download não deixa o catálogo pela metade.
+
+O schema só diz que `columns` é uma string (JSON com as colunas do feed); os
+nomes das colunas dependem do feed, então a chave do item (`key`) é sempre
+informada pelo chamador.
+
+Uso:
+
+    with FeedCatalog("catalogo.db", key="itemid") as catalog:
+        catalog.sync(client)           # FULL mais novo; depois só DELTAs novos
+        catalog.get("123456")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import feeds
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        item_key TEXT PRIMARY KEY,
+        columns TEXT NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS applied_feeds (
+        datafeed_id TEXT PRIMARY KEY,
+        feed_mode TEXT NOT NULL,
+        feed_date TEXT,
+        applied_at INTEGER NOT NULL,
+        rows INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_applied_feeds_mode_date"
+    " ON applied_feeds (feed_mode, feed_date)",
+)
+
+_UPSERT_ITEM = (
+    "INSERT INTO items (item_key, columns, updated_at) VALUES (?, ?, ?)"
+    " ON CONFLICT(item_key) DO UPDATE SET columns = excluded.columns,"
+    " updated_at = excluded.updated_at"
+)
+
+_RECORD_FEED = (
+    "INSERT OR REPLACE INTO applied_feeds"
+    " (datafeed_id, feed_mode, feed_date, applied_at, rows) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Tabela TEMP (por conexão) que recebe as linhas durante o download; `seq`
+# preserva a ordem do feed (mesma chave repetida: vale a última linha).
+_STAGING_SCHEMA = (
+    "CREATE TEMP TABLE {table} (seq INTEGER PRIMARY KEY, item_key TEXT NOT NULL,"
+    " columns TEXT NOT NULL, update_type TEXT)"
+)
+
+# `WHERE true` desfaz a ambiguidade do parser entre INSERT ... SELECT e ON CONFLICT.
+_UPSERT_STAGED = (
+    "INSERT INTO items (item_key, columns, updated_at)"
+    " SELECT item_key, columns, ? FROM {table} WHERE {where} ORDER BY seq"
+    " ON CONFLICT(item_key) DO UPDATE SET columns = excluded.columns,"
+    " updated_at = excluded.updated_at"
+)
+
+_LATEST_STAGED = "seq IN (SELECT MAX(seq) FROM {table} GROUP BY item_key)"
+
+_staging_ids = itertools.count()
+
+ItemKey = Union[str, Callable[[Dict[str, Any]], Any]]
+
+
+@dataclass
+class ApplyResult:
+    datafeed_id: Optional[str]
+    feed_mode: str
+    rows: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    skipped: bool = False
+
+
+def _columns_text(columns: Any) -> str:
+    if isinstance(columns, str):
+        return columns
+    return json.dumps(columns, ensure_ascii=False, separators=(",", ":"))
+
+
+class FeedCatalog:
+    """Snapshot local de um catálogo de item feeds.
+
+    Args:
+        path: arquivo SQLite (`":memory:"` para testes).
+        key: campo das `columns` (JSON) usado como chave do item (ex.:
+            `"itemid"`, conforme as colunas do feed), ou função que recebe a
+            linha do feed (`{"columns": ..., "updateType": ...}`) e devolve a
+            chave.
+        batch_size: linhas por `executemany` dentro da transação.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        key: ItemKey,
+        batch_size: int = 5_000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser >= 1")
+        self.key = key
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def item_key(self, row: Dict[str, Any]) -> str:
+        """Chave do item de uma linha do feed (ver `key`)."""
+        if callable(self.key):
+            value = self.key(row)
+        else:
+            columns = row.get("columns")
+            if isinstance(columns, str):
+                try:
+                    columns = json.loads(columns)
+                except ValueError:
+                    raise ValueError(
+                        "columns não é JSON; passe key=<função> para extrair a chave"
+                    ) from None
+            value = columns.get(self.key) if isinstance(columns, dict) else None
+        if value is None:
+            raise ValueError(f"linha do feed sem a chave do item: {row!r}")
+        return str(value)
+
+    def load_full(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        *,
+        datafeed_id: Optional[str] = None,
+        feed_date: Optional[str] = None,
+    ) -> ApplyResult:
+        """Substitui o catálogo inteiro pelas linhas de um feed FULL.
+
+        Com `datafeed_id`, a carga fica registrada e serve de base para os
+        DELTAs de `sync`.
+        """
+        result = ApplyResult(datafeed_id, "FULL")
+        with self._staged(rows) as (table, staged):
+            now = int(time.time())
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM items")
+                self._conn.execute(
+                    _UPSERT_STAGED.format(table=table, where="true"), (now,)
+                )
+                result.rows = result.upserted = staged
+                self._record(result, feed_date, now)
+        return result
+
+    def apply_delta(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        *,
+        datafeed_id: Optional[str] = None,
+        feed_date: Optional[str] = None,
+    ) -> ApplyResult:
+        """Aplica um feed DELTA: `NEW`/`UPDATE` gravam, `DELETE` remove.
+
+        `UNKNOWN` (ou ausente) é tratado como gravação. Se `datafeed_id` já
+        foi aplicado, nada é feito (`skipped=True`).
+        """
+        result = ApplyResult(datafeed_id, "DELTA")
+        if datafeed_id is not None and self.is_applied(datafeed_id):
+            result.skipped = True
+            return result
+        with self._staged(rows) as (table, staged):
+            latest = _LATEST_STAGED.format(table=table)
+            now = int(time.time())
+            with self._lock, self._conn:
+                result.upserted = self._conn.execute(
+                    _UPSERT_STAGED.format(
+                        table=table,
+                        where=f"{latest} AND update_type IS NOT 'DELETE'",
+                    ),
+                    (now,),
+                ).rowcount
+                result.deleted = self._conn.execute(
+                    "DELETE FROM items WHERE item_key IN ("
+                    f" SELECT item_key FROM {table}"
+                    f" WHERE {latest} AND update_type = 'DELETE')"
+                ).rowcount
+                result.rows = staged
+                self._record(result, feed_date, now)
+        return result
+
+    @contextlib.contextmanager
+    def _staged(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, int]]:
+        """Copia `rows` para uma tabela TEMP, lote a lote; rende (tabela, linhas).
+
+        Cada lote segura `_lock` só durante o `executemany`, e tabelas TEMP
+        ficam no banco temporário da conexão: o arquivo do catálogo não é
+        travado enquanto `rows` (o download) avança. A tabela é removida na
+        saída, com ou sem erro.
+        """
+        table = f"feed_staging_{next(_staging_ids)}"
+        insert = (
+            f"INSERT INTO {table} (item_key, columns, update_type) VALUES (?, ?, ?)"
+        )
+        with self._lock, self._conn:
+            self._conn.execute(_STAGING_SCHEMA.format(table=table))
+        try:
+            staged = 0
+            iterator = iter(rows)
+            while True:
+                chunk = list(islice(iterator, self.batch_size))
+                if not chunk:
+                    break
+                values = [
+                    (self.item_key(r), _columns_text(r["columns"]), r.get("updateType"))
+                    for r in chunk
+                ]
+                with self._lock, self._conn:
+                    self._conn.executemany(insert, values)
+                staged += len(chunk)
+            yield table, staged
+        finally:
+            with self._lock, self._conn:
+                self._conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+    def _record(self, result: ApplyResult, feed_date: Optional[str], now: int) -> None:
+        if result.datafeed_id is not None:
+            self._conn.execute(
+                _RECORD_FEED,
+                (result.datafeed_id, result.feed_mode, feed_date, now, result.rows),
+            )
+
+    def sync(
+        self,
+        client: Any,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> List[ApplyResult]:
+        """Atualiza o catálogo pela API com o mínimo de download.
+
+        Carrega o FULL mais recente de `listItemFeeds` quando não há FULL
+        aplicado ou quando há um FULL com data mais nova que a do último
+        aplicado (isso também recupera o catálogo de um DELTA perdido).
+        Depois aplica, em ordem de data, os DELTAs ainda não aplicados e não
+        mais antigos que o último FULL. `client` é um `ShopeeAffiliateClient`.
+        """
+        results: List[ApplyResult] = []
+
+        def rows(feed: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+            return client.iter_item_feed_rows(
+                feed["datafeedId"], limit=limit, max_workers=max_workers
+            )
+
+        base_date = self.last_full_date()
+        full = _list_feeds(client, "FULL")
+        if base_date is None and not full:
+            return results
+        if full and (base_date is None or full[-1]["date"] > base_date):
+            feed = full[-1]
+            results.append(
+                self.load_full(
+                    rows(feed), datafeed_id=feed["datafeedId"], feed_date=feed["date"]
+                )
+            )
+            base_date = feed["date"]
+
+        for feed in _list_feeds(client, "DELTA"):
+            # DELTA do mesmo dia do FULL é aplicado: reaplicar é inofensivo
+            # (upsert/delete idempotentes), pular poderia perder mudanças.
+            if base_date and feed["date"] and feed["date"] < base_date:
+                continue
+            if self.is_applied(feed["datafeedId"]):
+                continue
+            results.append(
+                self.apply_delta(
+                    rows(feed), datafeed_id=feed["datafeedId"], feed_date=feed["date"]
+                )
+            )
+        return results
+
+    def is_applied(self, datafeed_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM applied_feeds WHERE datafeed_id = ?", (datafeed_id,)
+            ).fetchone()
+        return row is not None
+
+    def last_full_date(self) -> Optional[str]:
+        """Data (`ItemFeed.date`) do último FULL aplicado, se houver."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT feed_date FROM applied_feeds WHERE feed_mode = 'FULL'"
+                " ORDER BY applied_at DESC, feed_date DESC LIMIT 1"
+            ).fetchone()
+        return None if row is None else (row[0] or "")
+
+    def get(self, item_key: Any) -> Optional[Any]:
+        """`columns` do item (decodificadas se forem JSON), ou None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT columns FROM items WHERE item_key = ?", (str(item_key),)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return row[0]
+
+    def count(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()
+        return int(n)
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Consulta SQL livre sobre as tabelas `items`/`applied_feeds`."""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql, tuple(params))]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "FeedCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _list_feeds(client: Any, feed_mode: str) -> List[Dict[str, Any]]:
+    """Feeds de `listItemFeeds(feedMode)`, do mais antigo para o mais novo."""
+    resp = client.list_item_feeds(feed_mode=feed_mode)
+    data = (resp.get("data") or {}).get("listItemFeeds") or {}
+    found = [
+        {"datafeedId": str(f["datafeedId"]), "date": str(f.get("date") or "")}
+        for f in data.get("feeds") or []
+        if f.get("datafeedId") is not None and (f.get("feedMode") in (None, feed_mode))
+    ]
+    return sorted(found, key=lambda f: f["date"])
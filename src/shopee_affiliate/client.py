@@ -1,10 +1,159 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterator, List, Optional
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from .transport import ShopeeAffiliateTransport
+from .cache import ShortLinkCache
+from .codec import JsonCodec
+from .projection import Fields
+from .ratelimit import RateLimiter
+from .transport import (
+    DEFAULT_BASE_URL,
+    AsyncShopeeAffiliateTransport,
+    ShopeeAffiliateTransport,
+)
 from .validators import validate_sub_ids
-from . import queries
+from . import feeds, projection, queries, reports, streaming
+
+
+logger = logging.getLogger(__name__)
+
+# scrollId do conversionReport vale 30s a partir da página que o retornou;
+# acima de SCROLL_ID_WARN_S sem pedir a próxima página, emite um aviso.
+SCROLL_ID_TTL_S = 30.0
+SCROLL_ID_WARN_S = 20.0
+
+# Tamanho de lote usado no generateBatchShortLink (limite do servidor não é
+# documentado; 50 URLs por chamada é conservador).
+BATCH_SHORT_LINK_SIZE = 50
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    if size < 1:
+        raise ValueError("tamanho do lote deve ser >= 1")
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _short_link_response(short_link: str) -> Dict[str, Any]:
+    """Resposta no formato de `generateShortLink` para um link vindo do cache."""
+    return {"data": {"generateShortLink": {"shortLink": short_link}}}
+
+
+def _extract_short_link(resp: Dict[str, Any]) -> Optional[str]:
+    if resp.get("errors"):
+        return None
+    data = (resp.get("data") or {}).get("generateShortLink") or {}
+    return data.get("shortLink")
+
+
+def _split_cached_links(
+    cache: Optional[ShortLinkCache],
+    urls: Sequence[str],
+    sub_ids: Optional[List[str]],
+) -> Tuple[Dict[int, Dict[str, Any]], List[Tuple[int, str]]]:
+    """Separa URLs já presentes no cache (por posição) das que faltam gerar."""
+    results: Dict[int, Dict[str, Any]] = {}
+    missing: List[Tuple[int, str]] = []
+    for i, url in enumerate(urls):
+        cached = cache.get(url, sub_ids) if cache is not None else None
+        if cached is None:
+            missing.append((i, url))
+        else:
+            results[i] = {
+                "originUrl": url,
+                "shortLink": cached,
+                "success": True,
+                "errorMessage": None,
+            }
+    return results, missing
+
+
+def _merge_batch_links(
+    cache: Optional[ShortLinkCache],
+    pending: Sequence[Tuple[int, str]],
+    mapped: Sequence[Dict[str, Any]],
+    sub_ids: Optional[List[str]],
+    results: Dict[int, Dict[str, Any]],
+) -> None:
+    for (i, url), item in zip(pending, mapped):
+        results[i] = item
+        if cache is not None and item.get("success") and item.get("shortLink"):
+            cache.set(url, sub_ids, item["shortLink"])
+
+
+def _map_batch_short_links(
+    origin_urls: Sequence[str], resp: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Alinha o resultado do generateBatchShortLink com as URLs de entrada.
+
+    Retorna um item por URL (mesma ordem), com `originUrl`, `shortLink`,
+    `success` e `errorMessage`. Se o lote inteiro falhar (`errors` sem
+    `data`), todas as URLs do lote recebem a mensagem do erro.
+    """
+    data = (resp.get("data") or {}).get("generateBatchShortLink") or {}
+    by_url: Dict[str, deque] = defaultdict(deque)
+    for item in data.get("links") or []:
+        by_url[item.get("originUrl")].append(item)
+
+    errors = resp.get("errors") or []
+    fallback = errors[0].get("message") if errors else "sem resultado para a URL"
+
+    out: List[Dict[str, Any]] = []
+    for url in origin_urls:
+        matches = by_url.get(url)
+        if matches:
+            out.append(matches.popleft())
+        else:
+            out.append(
+                {
+                    "originUrl": url,
+                    "shortLink": None,
+                    "success": False,
+                    "errorMessage": fallback,
+                }
+            )
+    return out
+
+
+def _conversion_report_params(
+    fields: Fields, filters: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Valida `filters`/`fields` e monta os kwargs repassados a cada página."""
+    queries.conversion_report_filters(**filters)
+    projection.normalize("conversionReport", fields)
+    if fields is None:
+        return filters
+    return dict(filters, fields=fields)
+
+
+def _warn_if_scroll_stale(received_at: float) -> None:
+    age = time.monotonic() - received_at
+    if age >= SCROLL_ID_WARN_S:
+        logger.warning(
+            "scrollId do conversionReport com %.1fs de idade (expira em %.0fs): "
+            "o consumidor está lento; considere prefetch=",
+            age,
+            SCROLL_ID_TTL_S,
+        )
 
 
 class ShopeeAffiliateClient:
@@ -18,14 +167,20 @@ class ShopeeAffiliateClient:
         app_id: str,
         app_secret: str,
         *,
-        base_url: str = "https://open-api.affiliate.shopee.com.br/graphql",
+        base_url: str = DEFAULT_BASE_URL,
         timeout_s: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        short_link_cache: Optional[ShortLinkCache] = None,
+        codec: Union[JsonCodec, str, None] = None,
     ):
+        self.short_link_cache = short_link_cache
         self.transport = ShopeeAffiliateTransport(
             app_id=app_id,
             app_secret=app_secret,
             base_url=base_url,
             timeout_s=timeout_s,
+            rate_limiter=rate_limiter,
+            codec=codec,
         )
 
     # ============== low-level ==============
@@ -43,14 +198,16 @@ class ShopeeAffiliateClient:
         sort_type: int = 1,
         page: int = 1,
         limit: int = 10,
+        fields: Fields = None,
     ) -> Dict[str, Any]:
-        query = queries.q_shopee_offer_v2(
+        op = queries.q_shopee_offer_v2(
             keyword=keyword,
             sort_type=sort_type,
             page=page,
             limit=limit,
+            fields=fields,
         )
-        return self._request(query)
+        return self._request(op.query, op.variables)
 
     def get_shop_offers(
         self,
@@ -61,8 +218,9 @@ class ShopeeAffiliateClient:
         sort_type: int = 1,
         page: int = 1,
         limit: int = 10,
+        fields: Fields = None,
     ) -> Dict[str, Any]:
-        query = queries.q_shop_offer_v2(
+        op = queries.q_shop_offer_v2(
             keyword=keyword,
             shop_id=shop_id,
             shop_type=shop_type,
@@ -70,8 +228,9 @@ class ShopeeAffiliateClient:
             sort_type=sort_type,
             page=page,
             limit=limit,
+            fields=fields,
         )
-        return self._request(query)
+        return self._request(op.query, op.variables)
 
     def get_product_offers(
         self,
@@ -84,8 +243,9 @@ class ShopeeAffiliateClient:
         sort_type: int = 1,
         page: int = 1,
         limit: int = 10,
+        fields: Fields = None,
     ) -> Dict[str, Any]:
-        query = queries.q_product_offer_v2(
+        op = queries.q_product_offer_v2(
             keyword=keyword,
             shop_id=shop_id,
             item_id=item_id,
@@ -95,8 +255,9 @@ class ShopeeAffiliateClient:
             sort_type=sort_type,
             page=page,
             limit=limit,
+            fields=fields,
         )
-        return self._request(query)
+        return self._request(op.query, op.variables)
 
     def get_conversion_report(
         self,
@@ -104,14 +265,26 @@ class ShopeeAffiliateClient:
         purchase_time_end: int,
         scroll_id: Optional[str] = None,
         limit: int = 10,
+        fields: Fields = None,
+        **filters: Any,
     ) -> Dict[str, Any]:
-        query = queries.q_conversion_report(
+        """Uma página do conversionReport.
+
+        `filters` são enviados como argumentos da query (filtragem no
+        servidor): `shop_id`, `order_status`, `conversion_status`,
+        `fraud_status`, `device`, `campaign_type`... (ver
+        `queries.CONVERSION_REPORT_FILTERS`). Enums são validados localmente.
+        `fields` escolhe os campos de cada node (ver `projection`).
+        """
+        op = queries.q_conversion_report(
             purchase_time_start=purchase_time_start,
             purchase_time_end=purchase_time_end,
             scroll_id=scroll_id,
             limit=limit,
+            fields=fields,
+            **filters,
         )
-        return self._request(query)
+        return self._request(op.query, op.variables)
 
     def iter_conversion_report_pages(
         self,
@@ -120,13 +293,49 @@ class ShopeeAffiliateClient:
         *,
         limit: int = 500,
         max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        fields: Fields = None,
+        **filters: Any,
     ) -> Iterator[Dict[str, Any]]:
         """Itera páginas do conversionReport sem acumular tudo em memória.
 
-        Útil para relatórios grandes.
+        Útil para relatórios grandes. Com `prefetch=N`, uma thread em segundo
+        plano busca as próximas páginas enquanto o chamador processa a atual
+        (até N páginas em fila; acima disso a busca pausa). Isso evita que um
+        consumidor lento deixe o `scrollId` (válido por 30s) expirar no meio
+        da exportação; um aviso é logado quando o cursor fica perto do prazo.
+
+        `filters`: filtros aplicados no servidor (ver `get_conversion_report`);
+        `fields`: campos de cada node (ver `projection`).
 
         Yields: resposta JSON (dict) por página.
         """
+        # Valida antes da 1ª página.
+        params = _conversion_report_params(fields, filters)
+        walk = functools.partial(
+            self._conversion_report_pages,
+            purchase_time_start,
+            purchase_time_end,
+            limit,
+            max_pages,
+            params,
+        )
+        if prefetch <= 0:
+            yield from walk()
+            return
+        with contextlib.closing(
+            reports.merge_threaded([walk], queue_size=prefetch)
+        ) as prefetched:
+            yield from prefetched
+
+    def _conversion_report_pages(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        limit: int,
+        max_pages: Optional[int],
+        params: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
         scroll_id: Optional[str] = None
         page = 0
         while True:
@@ -139,16 +348,17 @@ class ShopeeAffiliateClient:
                 purchase_time_end=purchase_time_end,
                 scroll_id=scroll_id,
                 limit=limit,
+                **params,
             )
+            received_at = time.monotonic()
             yield resp
 
-            data = resp.get("data", {}).get("conversionReport", {})
-            page_info = data.get("pageInfo", {}) if isinstance(data, dict) else {}
-            has_next = page_info.get("hasNextPage")
-            scroll_id = page_info.get("scrollId")
-
-            if not has_next or not scroll_id:
+            scroll_id = reports.conversion_next_cursor(
+                resp, scroll_id, len(reports.conversion_page_nodes(resp))
+            )
+            if not scroll_id:
                 return
+            _warn_if_scroll_stale(received_at)
 
     def iter_conversion_report_orders(
         self,
@@ -157,19 +367,416 @@ class ShopeeAffiliateClient:
         *,
         limit: int = 500,
         max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+        fields: Fields = None,
+        **filters: Any,
     ) -> Iterator[Dict[str, Any]]:
-        """Itera orders individuais (achatado) do conversionReport."""
+        """Itera orders individuais (achatado) do conversionReport.
+
+        Cada order é uma cópia do dict da API acrescida de `purchaseTime`,
+        `conversionId` e `conversionStatus` da conversão a que pertence
+        (`reports.ORDER_CONTEXT_FIELDS`; campos do próprio order prevalecem).
+
+        Com `stream=True`, cada página é decodificada incrementalmente
+        (`streaming.NodeStreamDecoder`) e os orders saem conforme chegam, em
+        vez de esperar a página inteira: o pico de memória acompanha um node,
+        não a página. A conexão fica aberta enquanto o chamador processa a
+        página; com consumidor lento, combine com `prefetch` (fila de até
+        `prefetch * limit` orders).
+        """
+        if stream:
+            params = _conversion_report_params(fields, filters)
+            walk = functools.partial(
+                self._conversion_report_streamed_orders,
+                purchase_time_start,
+                purchase_time_end,
+                limit,
+                max_pages,
+                params,
+            )
+            if prefetch <= 0:
+                yield from walk()
+                return
+            with contextlib.closing(
+                reports.merge_threaded([walk], queue_size=prefetch * limit)
+            ) as prefetched:
+                yield from prefetched
+            return
+
         for resp in self.iter_conversion_report_pages(
             purchase_time_start,
             purchase_time_end,
             limit=limit,
             max_pages=max_pages,
+            prefetch=prefetch,
+            fields=fields,
+            **filters,
         ):
-            data = resp.get("data", {}).get("conversionReport", {})
-            nodes = data.get("nodes", []) if isinstance(data, dict) else []
-            for node in nodes:
-                for order in node.get("orders") or []:
-                    yield order
+            yield from reports.conversion_page_orders(resp)
+
+    def _conversion_report_streamed_orders(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        limit: int,
+        max_pages: Optional[int],
+        params: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
+        operation = functools.partial(
+            queries.q_conversion_report,
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            limit=limit,
+            **params,
+        )
+        for node in self._streamed_nodes(
+            lambda scroll_id: operation(scroll_id=scroll_id),
+            reports.conversion_next_cursor,
+            max_pages,
+        ):
+            yield from reports.conversion_node_orders(node)
+
+    def _streamed_nodes(
+        self,
+        operation: Callable[[Optional[str]], queries.Operation],
+        next_cursor: Callable[[Dict[str, Any], Optional[str], int], Optional[str]],
+        max_pages: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Percorre uma cadeia de cursor decodificando cada página em streaming.
+
+        `operation(cursor)` monta a operação da página; `next_cursor` lê o
+        cursor seguinte da resposta sem os nodes (`NodeStreamDecoder.finish`),
+        com a mesma regra de parada do caminho sem streaming (ver
+        `reports.conversion_next_cursor`/`reports.partner_next_cursor`).
+        O cursor vem depois dos nodes, então já nasce "fresco".
+        """
+        cursor: Optional[str] = None
+        page = 0
+        while True:
+            page += 1
+            if max_pages is not None and page > max_pages:
+                return
+
+            op = operation(cursor)
+            decoder = streaming.NodeStreamDecoder()
+            received = 0
+            with contextlib.closing(
+                self.transport.request_stream(op.query, op.variables)
+            ) as chunks:
+                for chunk in chunks:
+                    for node in decoder.feed(chunk):
+                        received += 1
+                        yield node
+
+            cursor = next_cursor(decoder.finish(), cursor, received)
+            if not cursor:
+                return
+
+    def iter_conversion_report_orders_sharded(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        *,
+        shards: int = 4,
+        max_workers: Optional[int] = None,
+        limit: int = 500,
+        fields: Fields = None,
+        **filters: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """Exporta o conversionReport dividindo o período em sub-janelas paralelas.
+
+        Cada sub-janela (ver `reports.split_time_window`) percorre sua própria
+        cadeia de `scrollId` numa thread; as orders são intercaladas num único
+        fluxo (sem ordem garantida entre janelas) e deduplicadas por `orderId`.
+        Todas as threads usam o mesmo transport, logo o mesmo rate limiter.
+        """
+        windows = reports.split_time_window(
+            purchase_time_start, purchase_time_end, shards
+        )
+        producers = [
+            functools.partial(
+                self.iter_conversion_report_pages,
+                start,
+                end,
+                limit=limit,
+                fields=fields,
+                **filters,
+            )
+            for start, end in windows
+        ]
+        seen: set = set()
+        with contextlib.closing(
+            reports.merge_threaded(producers, max_workers=max_workers)
+        ) as pages:
+            for resp in pages:
+                yield from reports.dedupe_orders(
+                    reports.conversion_page_orders(resp), seen
+                )
+
+    # ============== PARTNER ORDER REPORT ==============
+
+    def get_partner_order_report(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        search_next_token: Optional[str] = None,
+        limit: int = 500,
+        fields: Fields = None,
+    ) -> Dict[str, Any]:
+        op = queries.q_partner_order_report(
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            complete_time_start=complete_time_start,
+            complete_time_end=complete_time_end,
+            search_next_token=search_next_token,
+            limit=limit,
+            fields=fields,
+        )
+        return self._request(op.query, op.variables)
+
+    def iter_partner_order_report_pages(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        fields: Fields = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera páginas do partnerOrderReport seguindo o `searchNextToken`.
+
+        Mesmo desenho de `iter_conversion_report_pages`: uma página em memória
+        por vez e, com `prefetch=N`, até N páginas buscadas em segundo plano.
+        A paginação termina quando o token vem vazio (ou repetido) ou a página
+        não traz nodes.
+        """
+        projection.normalize("partnerOrderReport", fields)
+        walk = functools.partial(
+            self._partner_order_report_pages,
+            functools.partial(
+                self.get_partner_order_report,
+                purchase_time_start,
+                purchase_time_end,
+                complete_time_start=complete_time_start,
+                complete_time_end=complete_time_end,
+                limit=limit,
+                fields=fields,
+            ),
+            max_pages,
+        )
+        if prefetch <= 0:
+            yield from walk()
+            return
+        with contextlib.closing(
+            reports.merge_threaded([walk], queue_size=prefetch)
+        ) as prefetched:
+            yield from prefetched
+
+    def _partner_order_report_pages(
+        self,
+        get_page: Callable[..., Dict[str, Any]],
+        max_pages: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        token: Optional[str] = None
+        page = 0
+        while True:
+            page += 1
+            if max_pages is not None and page > max_pages:
+                return
+
+            resp = get_page(search_next_token=token)
+            yield resp
+
+            token = reports.partner_next_cursor(
+                resp, token, len(reports.partner_page_orders(resp))
+            )
+            if not token:
+                return
+
+    def iter_partner_order_report_orders(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+        fields: Fields = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera orders individuais do partnerOrderReport.
+
+        `stream=True` decodifica cada página incrementalmente (como em
+        `iter_conversion_report_orders`): o pico de memória acompanha um
+        order, não a página; com `prefetch`, até `prefetch * limit` orders
+        ficam em fila.
+        """
+        if not stream:
+            for resp in self.iter_partner_order_report_pages(
+                purchase_time_start,
+                purchase_time_end,
+                complete_time_start=complete_time_start,
+                complete_time_end=complete_time_end,
+                limit=limit,
+                max_pages=max_pages,
+                prefetch=prefetch,
+                fields=fields,
+            ):
+                yield from reports.partner_page_orders(resp)
+            return
+
+        projection.normalize("partnerOrderReport", fields)
+        operation = functools.partial(
+            queries.q_partner_order_report,
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            complete_time_start=complete_time_start,
+            complete_time_end=complete_time_end,
+            limit=limit,
+            fields=fields,
+        )
+        walk = functools.partial(
+            self._streamed_nodes,
+            lambda token: operation(search_next_token=token),
+            reports.partner_next_cursor,
+            max_pages,
+        )
+        if prefetch <= 0:
+            yield from walk()
+            return
+        with contextlib.closing(
+            reports.merge_threaded([walk], queue_size=prefetch * limit)
+        ) as prefetched:
+            yield from prefetched
+
+    # ============== ITEM FEEDS ==============
+
+    def list_item_feeds(self, feed_mode: Optional[str] = None) -> Dict[str, Any]:
+        op = queries.q_list_item_feeds(feed_mode=feed_mode)
+        return self._request(op.query, op.variables)
+
+    def get_item_feed_data(
+        self,
+        datafeed_id: str,
+        offset: int = 0,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+    ) -> Dict[str, Any]:
+        op = queries.q_get_item_feed_data(
+            datafeed_id=datafeed_id, offset=offset, limit=limit
+        )
+        return self._request(op.query, op.variables)
+
+    def iter_item_feed_pages(
+        self,
+        datafeed_id: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera páginas do getItemFeedData em ordem, buscando em paralelo.
+
+        A primeira página traz o `totalCount`; os offsets restantes são
+        buscados por até `max_workers` threads (mesmo transport, logo o mesmo
+        rate limiter) e entregues na ordem. Se o feed crescer durante o
+        download (`hasMore` na última página), o restante segue em série.
+        """
+        first = self.get_item_feed_data(datafeed_id, 0, limit)
+        yield first
+        step, total, has_more = feeds.feed_plan(first, limit)
+        if not has_more:
+            return
+
+        offsets = feeds.feed_offsets(total, step, step)
+        fetch = functools.partial(self.get_item_feed_data, datafeed_id, limit=step)
+        last = first
+        with contextlib.closing(
+            feeds.map_ordered_threaded(fetch, offsets, max_workers=max_workers)
+        ) as pages:
+            for last in pages:
+                yield last
+
+        offset = offsets[-1] + step if offsets else step
+        while feeds.feed_page_info(last).get("hasMore"):
+            last = fetch(offset)
+            if not feeds.feed_page_rows(last):
+                return
+            yield last
+            offset += step
+
+    def iter_item_feed_rows(
+        self,
+        datafeed_id: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera as linhas (`columns`, `updateType`) de um feed, em ordem."""
+        for resp in self.iter_item_feed_pages(
+            datafeed_id, limit=limit, max_workers=max_workers
+        ):
+            yield from feeds.feed_page_rows(resp)
+
+    def download_item_feed(
+        self,
+        datafeed_id: str,
+        path: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> feeds.FeedDownloadSummary:
+        """Baixa um feed inteiro para `path` (ver `feeds.write_feed_rows`)."""
+        with contextlib.closing(
+            self.iter_item_feed_pages(datafeed_id, limit=limit, max_workers=max_workers)
+        ) as pages:
+            return feeds.write_feed_rows(pages, path)
+
+    # ============== BATCH (aliases GraphQL) ==============
+
+    def _request_batch(
+        self, operations: Sequence[queries.Operation], field: str, per_request: int
+    ) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for chunk in _chunks(operations, per_request):
+            op, aliases = queries.batch_operations(chunk)
+            resp = self._request(op.query, op.variables)
+            out.extend(queries.split_batch_response(resp, aliases, field))
+        return out
+
+    def get_shopee_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Várias consultas de shopeeOfferV2 por requisição HTTP (aliases).
+
+        Cada item de `requests` aceita os kwargs de `get_shopee_offers`
+        (ex.: `{"keyword": "tenis", "page": 2}`). Até `per_request` consultas
+        vão num único documento; o retorno tem uma resposta por item, na mesma
+        ordem e no mesmo formato de `get_shopee_offers`.
+        """
+        operations = [queries.q_shopee_offer_v2(**r) for r in requests]
+        return self._request_batch(operations, "shopeeOfferV2", per_request)
+
+    def get_shop_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Como `get_shopee_offers_batch`, para shopOfferV2."""
+        operations = [queries.q_shop_offer_v2(**r) for r in requests]
+        return self._request_batch(operations, "shopOfferV2", per_request)
+
+    def get_product_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Como `get_shopee_offers_batch`, para productOfferV2."""
+        operations = [queries.q_product_offer_v2(**r) for r in requests]
+        return self._request_batch(operations, "productOfferV2", per_request)
 
     # ============== MUTATIONS ==============
 
@@ -178,5 +785,707 @@ class ShopeeAffiliateClient:
     ) -> Dict[str, Any]:
         validate_sub_ids(sub_ids)
 
-        query = queries.m_generate_short_link(origin_url=origin_url, sub_ids=sub_ids)
-        return self._request(query)
+        cache = self.short_link_cache
+        if cache is not None:
+            cached = cache.get(origin_url, sub_ids)
+            if cached is not None:
+                return _short_link_response(cached)
+
+        op = queries.m_generate_short_link(origin_url=origin_url, sub_ids=sub_ids)
+        resp = self._request(op.query, op.variables)
+
+        short_link = _extract_short_link(resp)
+        if cache is not None and short_link:
+            cache.set(origin_url, sub_ids, short_link)
+        return resp
+
+    def generate_short_links(
+        self,
+        origin_urls: Iterable[str],
+        sub_ids: Optional[List[str]] = None,
+        *,
+        chunk_size: int = BATCH_SHORT_LINK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Gera links em lote via `generateBatchShortLink`.
+
+        As URLs são enviadas em lotes de `chunk_size` (uma requisição por lote).
+        Com `short_link_cache`, só as URLs ausentes do cache vão para a API.
+
+        Returns:
+            Um dict por URL, na ordem de entrada:
+            `{"originUrl", "shortLink", "success", "errorMessage"}`.
+        """
+        validate_sub_ids(sub_ids)
+
+        urls = list(origin_urls)
+        results, missing = _split_cached_links(self.short_link_cache, urls, sub_ids)
+        for chunk in _chunks(missing, chunk_size):
+            chunk_urls = [url for _, url in chunk]
+            op = queries.m_generate_batch_short_link(
+                origin_urls=chunk_urls, sub_ids=sub_ids
+            )
+            resp = self._request(op.query, op.variables)
+            mapped = _map_batch_short_links(chunk_urls, resp)
+            _merge_batch_links(self.short_link_cache, chunk, mapped, sub_ids, results)
+        return [results[i] for i in range(len(urls))]
+
+
+class AsyncShopeeAffiliateClient:
+    """Versão asyncio do `ShopeeAffiliateClient`.
+
+    Expõe os mesmos métodos como corrotinas (e os iteradores como async
+    generators), usando `AsyncShopeeAffiliateTransport`. Requer o extra `async`.
+
+    Exemplo:
+
+        async with AsyncShopeeAffiliateClient(app_id, secret) as client:
+            links = await asyncio.gather(
+                *(client.generate_short_link(url) for url in urls)
+            )
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout_s: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        short_link_cache: Optional[ShortLinkCache] = None,
+        codec: Union[JsonCodec, str, None] = None,
+    ):
+        self.short_link_cache = short_link_cache
+        self.transport = AsyncShopeeAffiliateTransport(
+            app_id=app_id,
+            app_secret=app_secret,
+            base_url=base_url,
+            timeout_s=timeout_s,
+            rate_limiter=rate_limiter,
+            codec=codec,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncShopeeAffiliateClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    # ============== low-level ==============
+
+    async def _request(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return await self.transport.request(query, variables=variables)
+
+    # ============== QUERIES ==============
+
+    async def get_shopee_offers(
+        self,
+        keyword: Optional[str] = None,
+        sort_type: int = 1,
+        page: int = 1,
+        limit: int = 10,
+        fields: Fields = None,
+    ) -> Dict[str, Any]:
+        op = queries.q_shopee_offer_v2(
+            keyword=keyword,
+            sort_type=sort_type,
+            page=page,
+            limit=limit,
+            fields=fields,
+        )
+        return await self._request(op.query, op.variables)
+
+    async def get_shop_offers(
+        self,
+        keyword: Optional[str] = None,
+        shop_id: Optional[int] = None,
+        shop_type: Optional[List[int]] = None,
+        is_key_seller: bool = False,
+        sort_type: int = 1,
+        page: int = 1,
+        limit: int = 10,
+        fields: Fields = None,
+    ) -> Dict[str, Any]:
+        op = queries.q_shop_offer_v2(
+            keyword=keyword,
+            shop_id=shop_id,
+            shop_type=shop_type,
+            is_key_seller=is_key_seller,
+            sort_type=sort_type,
+            page=page,
+            limit=limit,
+            fields=fields,
+        )
+        return await self._request(op.query, op.variables)
+
+    async def get_product_offers(
+        self,
+        keyword: Optional[str] = None,
+        shop_id: Optional[int] = None,
+        item_id: Optional[int] = None,
+        product_cat_id: Optional[int] = None,
+        list_type: int = 0,
+        match_id: Optional[int] = None,
+        sort_type: int = 1,
+        page: int = 1,
+        limit: int = 10,
+        fields: Fields = None,
+    ) -> Dict[str, Any]:
+        op = queries.q_product_offer_v2(
+            keyword=keyword,
+            shop_id=shop_id,
+            item_id=item_id,
+            product_cat_id=product_cat_id,
+            list_type=list_type,
+            match_id=match_id,
+            sort_type=sort_type,
+            page=page,
+            limit=limit,
+            fields=fields,
+        )
+        return await self._request(op.query, op.variables)
+
+    async def get_conversion_report(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        scroll_id: Optional[str] = None,
+        limit: int = 10,
+        fields: Fields = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """Uma página do conversionReport.
+
+        `filters` são enviados como argumentos da query (filtragem no
+        servidor): `shop_id`, `order_status`, `conversion_status`,
+        `fraud_status`, `device`, `campaign_type`... (ver
+        `queries.CONVERSION_REPORT_FILTERS`). Enums são validados localmente.
+        `fields` escolhe os campos de cada node (ver `projection`).
+        """
+        op = queries.q_conversion_report(
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            scroll_id=scroll_id,
+            limit=limit,
+            fields=fields,
+            **filters,
+        )
+        return await self._request(op.query, op.variables)
+
+    async def iter_conversion_report_pages(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        *,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        fields: Fields = None,
+        **filters: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Itera páginas do conversionReport (async generator).
+
+        `prefetch=N` busca as próximas páginas numa task em segundo plano
+        (fila de até N páginas), como no client síncrono.
+        """
+        params = _conversion_report_params(fields, filters)
+        walk = functools.partial(
+            self._conversion_report_pages,
+            purchase_time_start,
+            purchase_time_end,
+            limit,
+            max_pages,
+            params,
+        )
+        if prefetch > 0:
+            pages = reports.merge_async([walk], queue_size=prefetch)
+        else:
+            pages = walk()
+        try:
+            async for resp in pages:
+                yield resp
+        finally:
+            await pages.aclose()
+
+    async def _conversion_report_pages(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        limit: int,
+        max_pages: Optional[int],
+        params: Dict[str, Any],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        scroll_id: Optional[str] = None
+        page = 0
+        while True:
+            page += 1
+            if max_pages is not None and page > max_pages:
+                return
+
+            resp = await self.get_conversion_report(
+                purchase_time_start=purchase_time_start,
+                purchase_time_end=purchase_time_end,
+                scroll_id=scroll_id,
+                limit=limit,
+                **params,
+            )
+            received_at = time.monotonic()
+            yield resp
+
+            scroll_id = reports.conversion_next_cursor(
+                resp, scroll_id, len(reports.conversion_page_nodes(resp))
+            )
+            if not scroll_id:
+                return
+            _warn_if_scroll_stale(received_at)
+
+    async def iter_conversion_report_orders(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        *,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+        fields: Fields = None,
+        **filters: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator de orders individuais (achatado) do conversionReport.
+
+        Orders com o contexto da conversão, como no client síncrono.
+
+        `stream=True` decodifica cada página incrementalmente, como no client
+        síncrono.
+        """
+        if stream:
+            params = _conversion_report_params(fields, filters)
+            walk = functools.partial(
+                self._conversion_report_streamed_orders,
+                purchase_time_start,
+                purchase_time_end,
+                limit,
+                max_pages,
+                params,
+            )
+            if prefetch > 0:
+                orders = reports.merge_async([walk], queue_size=prefetch * limit)
+            else:
+                orders = walk()
+            try:
+                async for order in orders:
+                    yield order
+            finally:
+                await orders.aclose()
+            return
+
+        async for resp in self.iter_conversion_report_pages(
+            purchase_time_start,
+            purchase_time_end,
+            limit=limit,
+            max_pages=max_pages,
+            prefetch=prefetch,
+            fields=fields,
+            **filters,
+        ):
+            for order in reports.conversion_page_orders(resp):
+                yield order
+
+    async def _conversion_report_streamed_orders(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        limit: int,
+        max_pages: Optional[int],
+        params: Dict[str, Any],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        operation = functools.partial(
+            queries.q_conversion_report,
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            limit=limit,
+            **params,
+        )
+        nodes = self._streamed_nodes(
+            lambda scroll_id: operation(scroll_id=scroll_id),
+            reports.conversion_next_cursor,
+            max_pages,
+        )
+        try:
+            async for node in nodes:
+                for order in reports.conversion_node_orders(node):
+                    yield order
+        finally:
+            await nodes.aclose()
+
+    async def _streamed_nodes(
+        self,
+        operation: Callable[[Optional[str]], queries.Operation],
+        next_cursor: Callable[[Dict[str, Any], Optional[str], int], Optional[str]],
+        max_pages: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Versão async de `ShopeeAffiliateClient._streamed_nodes`."""
+        cursor: Optional[str] = None
+        page = 0
+        while True:
+            page += 1
+            if max_pages is not None and page > max_pages:
+                return
+
+            op = operation(cursor)
+            decoder = streaming.NodeStreamDecoder()
+            received = 0
+            chunks = self.transport.request_stream(op.query, op.variables)
+            try:
+                async for chunk in chunks:
+                    for node in decoder.feed(chunk):
+                        received += 1
+                        yield node
+            finally:
+                await chunks.aclose()
+
+            cursor = next_cursor(decoder.finish(), cursor, received)
+            if not cursor:
+                return
+
+    async def iter_conversion_report_orders_sharded(
+        self,
+        purchase_time_start: int,
+        purchase_time_end: int,
+        *,
+        shards: int = 4,
+        max_workers: Optional[int] = None,
+        limit: int = 500,
+        fields: Fields = None,
+        **filters: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator equivalente a `ShopeeAffiliateClient.iter_conversion_report_orders_sharded`."""
+        windows = reports.split_time_window(
+            purchase_time_start, purchase_time_end, shards
+        )
+        producers = [
+            functools.partial(
+                self.iter_conversion_report_pages,
+                start,
+                end,
+                limit=limit,
+                fields=fields,
+                **filters,
+            )
+            for start, end in windows
+        ]
+        seen: set = set()
+        pages = reports.merge_async(producers, max_workers=max_workers)
+        try:
+            async for resp in pages:
+                for order in reports.dedupe_orders(
+                    reports.conversion_page_orders(resp), seen
+                ):
+                    yield order
+        finally:
+            await pages.aclose()
+
+    # ============== PARTNER ORDER REPORT ==============
+
+    async def get_partner_order_report(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        search_next_token: Optional[str] = None,
+        limit: int = 500,
+        fields: Fields = None,
+    ) -> Dict[str, Any]:
+        op = queries.q_partner_order_report(
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            complete_time_start=complete_time_start,
+            complete_time_end=complete_time_end,
+            search_next_token=search_next_token,
+            limit=limit,
+            fields=fields,
+        )
+        return await self._request(op.query, op.variables)
+
+    async def iter_partner_order_report_pages(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        fields: Fields = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Itera páginas do partnerOrderReport (async generator)."""
+        projection.normalize("partnerOrderReport", fields)
+        walk = functools.partial(
+            self._partner_order_report_pages,
+            functools.partial(
+                self.get_partner_order_report,
+                purchase_time_start,
+                purchase_time_end,
+                complete_time_start=complete_time_start,
+                complete_time_end=complete_time_end,
+                limit=limit,
+                fields=fields,
+            ),
+            max_pages,
+        )
+        if prefetch > 0:
+            pages = reports.merge_async([walk], queue_size=prefetch)
+        else:
+            pages = walk()
+        try:
+            async for resp in pages:
+                yield resp
+        finally:
+            await pages.aclose()
+
+    async def _partner_order_report_pages(
+        self,
+        get_page: Callable[..., Awaitable[Dict[str, Any]]],
+        max_pages: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        token: Optional[str] = None
+        page = 0
+        while True:
+            page += 1
+            if max_pages is not None and page > max_pages:
+                return
+
+            resp = await get_page(search_next_token=token)
+            yield resp
+
+            token = reports.partner_next_cursor(
+                resp, token, len(reports.partner_page_orders(resp))
+            )
+            if not token:
+                return
+
+    async def iter_partner_order_report_orders(
+        self,
+        purchase_time_start: Optional[int] = None,
+        purchase_time_end: Optional[int] = None,
+        *,
+        complete_time_start: Optional[int] = None,
+        complete_time_end: Optional[int] = None,
+        limit: int = 500,
+        max_pages: Optional[int] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+        fields: Fields = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator de orders do partnerOrderReport (ver client síncrono)."""
+        if not stream:
+            async for resp in self.iter_partner_order_report_pages(
+                purchase_time_start,
+                purchase_time_end,
+                complete_time_start=complete_time_start,
+                complete_time_end=complete_time_end,
+                limit=limit,
+                max_pages=max_pages,
+                prefetch=prefetch,
+                fields=fields,
+            ):
+                for order in reports.partner_page_orders(resp):
+                    yield order
+            return
+
+        projection.normalize("partnerOrderReport", fields)
+        operation = functools.partial(
+            queries.q_partner_order_report,
+            purchase_time_start=purchase_time_start,
+            purchase_time_end=purchase_time_end,
+            complete_time_start=complete_time_start,
+            complete_time_end=complete_time_end,
+            limit=limit,
+            fields=fields,
+        )
+        walk = functools.partial(
+            self._streamed_nodes,
+            lambda token: operation(search_next_token=token),
+            reports.partner_next_cursor,
+            max_pages,
+        )
+        if prefetch > 0:
+            orders = reports.merge_async([walk], queue_size=prefetch * limit)
+        else:
+            orders = walk()
+        try:
+            async for order in orders:
+                yield order
+        finally:
+            await orders.aclose()
+
+    # ============== ITEM FEEDS ==============
+
+    async def list_item_feeds(self, feed_mode: Optional[str] = None) -> Dict[str, Any]:
+        op = queries.q_list_item_feeds(feed_mode=feed_mode)
+        return await self._request(op.query, op.variables)
+
+    async def get_item_feed_data(
+        self,
+        datafeed_id: str,
+        offset: int = 0,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+    ) -> Dict[str, Any]:
+        op = queries.q_get_item_feed_data(
+            datafeed_id=datafeed_id, offset=offset, limit=limit
+        )
+        return await self._request(op.query, op.variables)
+
+    async def iter_item_feed_pages(
+        self,
+        datafeed_id: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator de páginas do getItemFeedData, em ordem.
+
+        Até `max_workers` páginas em andamento ao mesmo tempo.
+        """
+        first = await self.get_item_feed_data(datafeed_id, 0, limit)
+        yield first
+        step, total, has_more = feeds.feed_plan(first, limit)
+        if not has_more:
+            return
+
+        offsets = feeds.feed_offsets(total, step, step)
+        fetch = functools.partial(self.get_item_feed_data, datafeed_id, limit=step)
+        last = first
+        pages = feeds.map_ordered_async(fetch, offsets, max_workers=max_workers)
+        try:
+            async for last in pages:
+                yield last
+        finally:
+            await pages.aclose()
+
+        offset = offsets[-1] + step if offsets else step
+        while feeds.feed_page_info(last).get("hasMore"):
+            last = await fetch(offset)
+            if not feeds.feed_page_rows(last):
+                return
+            yield last
+            offset += step
+
+    async def iter_item_feed_rows(
+        self,
+        datafeed_id: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async generator das linhas de um feed, em ordem."""
+        async for resp in self.iter_item_feed_pages(
+            datafeed_id, limit=limit, max_workers=max_workers
+        ):
+            for row in feeds.feed_page_rows(resp):
+                yield row
+
+    async def download_item_feed(
+        self,
+        datafeed_id: str,
+        path: str,
+        *,
+        limit: int = feeds.DEFAULT_FEED_PAGE_LIMIT,
+        max_workers: int = feeds.DEFAULT_FEED_WORKERS,
+    ) -> feeds.FeedDownloadSummary:
+        """Baixa um feed inteiro para `path` (mesmo formato do client síncrono)."""
+        pages = self.iter_item_feed_pages(
+            datafeed_id, limit=limit, max_workers=max_workers
+        )
+        try:
+            with feeds.feed_writer(path) as writer:
+                async for resp in pages:
+                    writer.write_page(resp)
+        finally:
+            await pages.aclose()
+        return writer.summary()
+
+    # ============== BATCH (aliases GraphQL) ==============
+
+    async def _request_batch(
+        self, operations: Sequence[queries.Operation], field: str, per_request: int
+    ) -> List[Dict[str, Any]]:
+        async def run(chunk: Sequence[queries.Operation]) -> List[Dict[str, Any]]:
+            op, aliases = queries.batch_operations(chunk)
+            resp = await self._request(op.query, op.variables)
+            return queries.split_batch_response(resp, aliases, field)
+
+        parts = await asyncio.gather(
+            *(run(chunk) for chunk in _chunks(operations, per_request))
+        )
+        return [item for part in parts for item in part]
+
+    async def get_shopee_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        operations = [queries.q_shopee_offer_v2(**r) for r in requests]
+        return await self._request_batch(operations, "shopeeOfferV2", per_request)
+
+    async def get_shop_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        operations = [queries.q_shop_offer_v2(**r) for r in requests]
+        return await self._request_batch(operations, "shopOfferV2", per_request)
+
+    async def get_product_offers_batch(
+        self, requests: Iterable[Dict[str, Any]], *, per_request: int = 10
+    ) -> List[Dict[str, Any]]:
+        operations = [queries.q_product_offer_v2(**r) for r in requests]
+        return await self._request_batch(operations, "productOfferV2", per_request)
+
+    # ============== MUTATIONS ==============
+
+    async def generate_short_link(
+        self, origin_url: str, sub_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        validate_sub_ids(sub_ids)
+
+        cache = self.short_link_cache
+        if cache is not None:
+            cached = cache.get(origin_url, sub_ids)
+            if cached is not None:
+                return _short_link_response(cached)
+
+        op = queries.m_generate_short_link(origin_url=origin_url, sub_ids=sub_ids)
+        resp = await self._request(op.query, op.variables)
+
+        short_link = _extract_short_link(resp)
+        if cache is not None and short_link:
+            cache.set(origin_url, sub_ids, short_link)
+        return resp
+
+    async def generate_short_links(
+        self,
+        origin_urls: Iterable[str],
+        sub_ids: Optional[List[str]] = None,
+        *,
+        chunk_size: int = BATCH_SHORT_LINK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        validate_sub_ids(sub_ids)
+
+        async def run(chunk: Sequence[Tuple[int, str]]) -> None:
+            chunk_urls = [url for _, url in chunk]
+            op = queries.m_generate_batch_short_link(
+                origin_urls=chunk_urls, sub_ids=sub_ids
+            )
+            resp = await self._request(op.query, op.variables)
+            mapped = _map_batch_short_links(chunk_urls, resp)
+            _merge_batch_links(self.short_link_cache, chunk, mapped, sub_ids, results)
+
+        urls = list(origin_urls)
+        results, missing = _split_cached_links(self.short_link_cache, urls, sub_ids)
+        await asyncio.gather(*(run(c) for c in _chunks(missing, chunk_size)))
+        return [results[i] for i in range(len(urls))]
@@ -0,0 +1,95 @@
+"""Codecs JSON do transport (payload canônico e decodificação das respostas).
+
+A assinatura cobre os bytes exatos do payload, e o formato canônico do
+projeto é o de `json.dumps(obj, separators=(",", ":"))` (ASCII, não-ASCII
+escapado como `\\uXXXX`). Todo codec deve produzir exatamente esses bytes.
+
+`OrjsonCodec` usa `orjson` (extra "fast") quando instalado: decodificar
+páginas de 500 itens fica várias vezes mais rápido. Para manter o payload
+idêntico ao da stdlib, `dumps` volta para `json.dumps` quando o orjson
+formataria diferente: strings com caracteres fora de ASCII imprimível
+(orjson grava UTF-8 cru), floats (expoente `1e16` vs `1e+16`, NaN) e tipos que
+ele não serializa (chaves não-string, inteiros > 64 bits).
+
+Uso:
+
+    transport = ShopeeAffiliateTransport(app_id, secret, codec="stdlib")
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Union
+
+try:  # dependência opcional (extra "fast")
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None  # type: ignore[assignment]
+
+
+class JsonCodec:
+    """Interface: `dumps(obj) -> bytes` canônico e `loads(bytes | str)`."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("ascii")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+def _has_float(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return True
+    if isinstance(obj, dict):
+        return any(_has_float(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_float(v) for v in obj)
+    return False
+
+
+class OrjsonCodec(JsonCodec):
+    """`orjson` com fallback para a stdlib onde a saída seria diferente."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                'OrjsonCodec requer orjson (pip install "shopee-afiliados-docs[fast]")'
+            )
+
+    def dumps(self, obj: Any) -> bytes:
+        if _has_float(obj):
+            return super().dumps(obj)
+        try:
+            out = orjson.dumps(obj)
+        except TypeError:  # orjson.JSONEncodeError
+            return super().dumps(obj)
+        # A stdlib escapa tudo fora de ' '..'~' (inclusive DEL e UTF-8).
+        if not out.isascii() or b"\x7f" in out:
+            return super().dumps(obj)
+        return out
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+CODECS: Dict[str, type] = {"stdlib": JsonCodec, "orjson": OrjsonCodec}
+
+
+def default_codec() -> JsonCodec:
+    """`OrjsonCodec` se o orjson estiver instalado; senão a stdlib."""
+    return OrjsonCodec() if orjson is not None else JsonCodec()
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """Resolve `codec`: instância, nome ("stdlib"/"orjson") ou `None` (auto)."""
+    if codec is None:
+        return default_codec()
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f"codec deve ser um de {tuple(CODECS)}")
+    return CODECS[codec]()
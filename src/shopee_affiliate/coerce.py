@@ -0,0 +1,26 @@
+"""Conversão dos valores do JSON da API para colunas tipadas.
+
+Usado por `store` (SQLite) e `export` (Parquet/Arrow): campos ausentes ou
+vazios viram `None`, e números que a API devolve como string são convertidos.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+def to_int(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def to_float(value: Any) -> Optional[float]:
+    # Valores monetários chegam como string decimal ("12.34").
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def to_text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
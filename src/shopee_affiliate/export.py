@@ -0,0 +1,177 @@
+"""Exportação colunar (Parquet / Arrow IPC) de orders do conversionReport.
+
+Uma linha por item (mesmo layout do exemplo CSV), com tipos numéricos de
+verdade em vez de strings. As linhas são acumuladas em colunas e gravadas em
+lotes de `batch_rows` (um row group / record batch por lote), então a memória
+fica limitada ao lote atual mesmo em exportações mensais.
+
+`pyarrow` é opcional (extra "parquet"). Sem ele, `format="auto"` cai para
+JSONL compacto (um objeto por linha, gzip se o arquivo terminar em `.gz`).
+
+Uso:
+
+    from shopee_affiliate.export import write_conversion_report
+
+    orders = client.iter_conversion_report_orders(start, end)
+    summary = write_conversion_report(orders, "conversions.parquet")
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+try:  # dependência opcional (extra "parquet")
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401 - registra pa.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende do ambiente
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+from .coerce import to_float, to_int, to_text
+
+DEFAULT_BATCH_ROWS = 50_000
+FORMATS = ("auto", "parquet", "arrow", "jsonl")
+
+
+# (coluna, origem, tipo arrow, conversor); origem "order" ou "item".
+COLUMNS: Tuple[Tuple[str, str, str, Callable[[Any], Any]], ...] = (
+    ("orderId", "order", "string", to_text),
+    ("purchaseTime", "order", "int64", to_int),
+    ("conversionStatus", "order", "string", to_text),
+    ("orderStatus", "order", "string", to_text),
+    ("shopType", "order", "string", to_text),
+    ("itemId", "item", "int64", to_int),
+    ("itemName", "item", "string", to_text),
+    ("qty", "item", "int64", to_int),
+    ("itemPrice", "item", "float64", to_float),
+    ("itemTotalCommission", "item", "float64", to_float),
+    ("itemSellerCommission", "item", "float64", to_float),
+    ("shopId", "item", "int64", to_int),
+    ("shopName", "item", "string", to_text),
+    ("globalCategoryLv1Name", "item", "string", to_text),
+    ("globalCategoryLv2Name", "item", "string", to_text),
+    ("globalCategoryLv3Name", "item", "string", to_text),
+    ("imageUrl", "item", "string", to_text),
+)
+
+
+@dataclass
+class ExportSummary:
+    path: str
+    format: str
+    rows: int
+
+
+def iter_item_rows(orders: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Achata orders em linhas por item, já com os tipos de `COLUMNS`."""
+    for order in orders:
+        for item in order.get("items") or []:
+            yield {
+                name: convert((order if source == "order" else item).get(name))
+                for name, source, _, convert in COLUMNS
+            }
+
+
+def _resolve_format(path: str, format: str) -> Tuple[str, str]:
+    if format not in FORMATS:
+        raise ValueError(f"format deve ser um de {FORMATS}")
+    if format == "auto":
+        suffix = Path(path).suffix.lower()
+        if suffix in (".jsonl", ".gz"):
+            return path, "jsonl"
+        if pa is None:
+            return str(Path(path).with_suffix(".jsonl")), "jsonl"
+        return path, "arrow" if suffix in (".arrow", ".feather", ".ipc") else "parquet"
+    if format in ("parquet", "arrow") and pa is None:
+        raise ImportError(
+            f"format={format!r} requer pyarrow "
+            '(pip install "shopee-afiliados-docs[parquet]")'
+        )
+    return path, format
+
+
+def _arrow_schema() -> "pa.Schema":
+    return pa.schema([(name, getattr(pa, type_)()) for name, _, type_, _ in COLUMNS])
+
+
+def _columnar_batches(
+    rows: Iterable[Dict[str, Any]], batch_rows: int
+) -> Iterator[Dict[str, List[Any]]]:
+    columns: Dict[str, List[Any]] = {name: [] for name, *_ in COLUMNS}
+    size = 0
+    for row in rows:
+        for name, values in columns.items():
+            values.append(row[name])
+        size += 1
+        if size >= batch_rows:
+            yield columns
+            columns = {name: [] for name, *_ in COLUMNS}
+            size = 0
+    if size:
+        yield columns
+
+
+def write_conversion_report(
+    orders: Iterable[Dict[str, Any]],
+    path: Union[str, Path],
+    *,
+    format: str = "auto",
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    compression: str = "zstd",
+) -> ExportSummary:
+    """Grava os itens de `orders` em Parquet, Arrow IPC ou JSONL.
+
+    Args:
+        orders: saída de `iter_conversion_report_orders` (ou similares).
+        path: arquivo de saída. Em `format="auto"`, `.jsonl`/`.gz` gera JSONL,
+            `.arrow`/`.feather`/`.ipc` gera Arrow IPC e o resto Parquet; sem
+            pyarrow, grava JSONL no mesmo caminho com sufixo `.jsonl`.
+        batch_rows: linhas por row group / record batch.
+        compression: codec do Parquet/Arrow (ignorado no JSONL).
+
+    Returns:
+        `ExportSummary` com o caminho e o formato efetivamente usados.
+    """
+    if batch_rows < 1:
+        raise ValueError("batch_rows deve ser >= 1")
+    out_path, fmt = _resolve_format(str(path), format)
+    rows = iter_item_rows(orders)
+
+    if fmt == "jsonl":
+        return ExportSummary(out_path, fmt, _write_jsonl(rows, out_path))
+
+    schema = _arrow_schema()
+    total = 0
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(out_path, schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(
+            out_path, schema, options=pa.ipc.IpcWriteOptions(compression=compression)
+        )
+    with writer:
+        for columns in _columnar_batches(rows, batch_rows):
+            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+            if fmt == "parquet":
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            total += batch.num_rows
+    return ExportSummary(out_path, fmt, total)
+
+
+def _write_jsonl(rows: Iterable[Dict[str, Any]], path: str) -> int:
+    opener = gzip.open if path.endswith(".gz") else open
+    total = 0
+    with opener(path, "wt", encoding="utf-8") as fh:
+        for row in rows:
+            # Só colunas com valor: linhas menores e nulos implícitos.
+            compact = {k: v for k, v in row.items() if v is not None}
+            fh.write(json.dumps(compact, ensure_ascii=False, separators=(",", ":")))
+            fh.write("\n")
+            total += 1
+    return total
@@ -0,0 +1,230 @@
+"""Download de item feeds (`listItemFeeds` / `getItemFeedData`).
+
+Diferente do conversionReport (cadeia serial de `scrollId`), o
+`getItemFeedData` é paginado por `offset` e a primeira página já traz o
+`totalCount`: as páginas seguintes não dependem umas das outras. O client
+lê a primeira página, calcula os offsets restantes (`feed_offsets`) e os
+busca em paralelo num pool limitado (`map_ordered_threaded`/`map_ordered_async`),
+entregando as páginas na ordem dos offsets. O rate limit continua valendo
+porque todas as chamadas usam o mesmo transport.
+
+`write_feed_rows` grava as `columns` de cada linha em disco conforme as
+páginas chegam (uma linha por registro, gzip se o arquivo terminar em `.gz`),
+sem acumular o feed em memória.
+
+Uso:
+
+    feeds = client.list_item_feeds(feed_mode="FULL")
+    client.download_item_feed(datafeed_id, "catalogo.jsonl.gz", max_workers=4)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import gzip
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Linhas por página do getItemFeedData (limite máximo do servidor não é
+# documentado; se ele devolver menos, o passo acompanha o `pageInfo.limit`).
+DEFAULT_FEED_PAGE_LIMIT = 500
+DEFAULT_FEED_WORKERS = 4
+
+
+@dataclass
+class FeedDownloadSummary:
+    path: str
+    rows: int
+    total_count: int
+
+
+def _feed_data(resp: Dict[str, Any]) -> Dict[str, Any]:
+    data = (resp.get("data") or {}).get("getItemFeedData")
+    if resp.get("errors") and not data:
+        # Página faltando = arquivo incompleto: falha em vez de pular.
+        message = resp["errors"][0].get("message", "erro desconhecido")
+        raise RuntimeError(f"getItemFeedData falhou: {message}")
+    return data or {}
+
+
+def feed_page_rows(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """`rows` de uma resposta do getItemFeedData (`columns`, `updateType`)."""
+    return _feed_data(resp).get("rows") or []
+
+
+def feed_page_info(resp: Dict[str, Any]) -> Dict[str, Any]:
+    """`pageInfo` (`offset`, `limit`, `totalCount`, `hasMore`) de uma página."""
+    return _feed_data(resp).get("pageInfo") or {}
+
+
+def feed_plan(first: Dict[str, Any], limit: int) -> Tuple[int, int, bool]:
+    """A partir da 1ª página (offset 0): (passo, totalCount, hasMore).
+
+    O passo é o menor entre `limit`, o `pageInfo.limit` devolvido e o número
+    de linhas recebidas, para não pular registros se o servidor limitar o
+    tamanho da página.
+    """
+    info = feed_page_info(first)
+    rows = len(feed_page_rows(first))
+    step = min(limit, info.get("limit") or limit)
+    if rows and info.get("hasMore"):
+        step = min(step, rows)
+    return step, int(info.get("totalCount") or 0), bool(info.get("hasMore"))
+
+
+def feed_offsets(total_count: int, step: int, start: int) -> range:
+    """Offsets das páginas restantes, de `start` até cobrir `total_count`."""
+    if step < 1:
+        raise ValueError("step deve ser >= 1")
+    return range(start, total_count, step)
+
+
+def map_ordered_threaded(
+    fn: Callable[[int], T], args: Iterable[int], *, max_workers: int
+) -> Iterator[T]:
+    """`map` paralelo que entrega os resultados na ordem de `args`.
+
+    No máximo `max_workers` chamadas ficam em andamento; o resultado seguinte
+    só é buscado quando o chamador consome o atual, então memória e cota
+    acompanham o ritmo do consumidor. Exceções são relançadas na ordem.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers deve ser >= 1")
+    pending: Deque["Future[T]"] = collections.deque()
+    args = iter(args)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shopee-feed")
+    try:
+        for arg in args:
+            pending.append(pool.submit(fn, arg))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for arg in args:
+                pending.append(pool.submit(fn, arg))
+                break
+            yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def map_ordered_async(
+    fn: Callable[[int], Awaitable[T]], args: Iterable[int], *, max_workers: int
+) -> AsyncIterator[T]:
+    """Versão asyncio de `map_ordered_threaded` (uma task por chamada)."""
+    if max_workers < 1:
+        raise ValueError("max_workers deve ser >= 1")
+    pending: Deque["asyncio.Future[T]"] = collections.deque()
+    args = iter(args)
+    try:
+        for arg in args:
+            pending.append(asyncio.ensure_future(fn(arg)))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            result = await pending.popleft()
+            for arg in args:
+                pending.append(asyncio.ensure_future(fn(arg)))
+                break
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def row_line(row: Dict[str, Any]) -> str:
+    """Linha gravada para um registro: `columns` como veio, ou em JSON.
+
+    `columns` chega como string; é gravada sem alteração (salvo se tiver
+    quebra de linha). Outros tipos são serializados em JSON compacto.
+    """
+    columns = row.get("columns")
+    if isinstance(columns, str) and "\n" not in columns:
+        return columns + "\n"
+    return json.dumps(columns, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+@contextlib.contextmanager
+def feed_output(path: str) -> Iterator[TextIO]:
+    """Abre `path` para gravação via `<path>.part`, renomeado só no sucesso.
+
+    Um download interrompido nunca deixa um feed incompleto no caminho final.
+    """
+    tmp_path = f"{path}.part"
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(tmp_path, "wt", encoding="utf-8") as fh:
+            yield fh
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class FeedWriter:
+    """Grava páginas do getItemFeedData num arquivo aberto, contando linhas.
+
+    Compartilhado pelos downloads síncrono (`write_feed_rows`) e async, que
+    só diferem em como as páginas chegam. O `totalCount` vem da primeira
+    página que o informar, salvo se `total_count` já foi passado.
+    """
+
+    def __init__(self, fh: TextIO, path: str, total_count: Optional[int] = None):
+        self.fh = fh
+        self.path = path
+        self.rows = 0
+        self.total_count = total_count or 0
+
+    def write_page(self, resp: Dict[str, Any]) -> int:
+        """Grava as linhas de uma página; retorna quantas foram gravadas."""
+        if not self.total_count:
+            self.total_count = int(feed_page_info(resp).get("totalCount") or 0)
+        page_rows = feed_page_rows(resp)
+        self.fh.writelines(row_line(row) for row in page_rows)
+        self.rows += len(page_rows)
+        return len(page_rows)
+
+    def summary(self) -> FeedDownloadSummary:
+        return FeedDownloadSummary(self.path, self.rows, self.total_count)
+
+
+@contextlib.contextmanager
+def feed_writer(
+    path: str, *, total_count: Optional[int] = None
+) -> Iterator[FeedWriter]:
+    """`FeedWriter` sobre `feed_output(path)` (`.part` renomeado no sucesso)."""
+    with feed_output(path) as fh:
+        yield FeedWriter(fh, path, total_count)
+
+
+def write_feed_rows(
+    pages: Iterable[Dict[str, Any]], path: str, *, total_count: Optional[int] = None
+) -> FeedDownloadSummary:
+    """Grava as linhas de `pages` (respostas do getItemFeedData) em `path`."""
+    with feed_writer(path, total_count=total_count) as writer:
+        for resp in pages:
+            writer.write_page(resp)
+    return writer.summary()
@@ -1 +1,58 @@
-# Package de recursos (.graphql) usados por shopee_affiliate.queries
+"""Documentos GraphQL (.graphql) usados por shopee_affiliate.queries.
+
+Os arquivos são mantidos indentados para leitura, mas `load_document` os
+entrega minificados: só os tokens GraphQL, com um espaço apenas entre dois
+nomes/números consecutivos. O documento vai em todo payload e é coberto pela
+assinatura SHA256, então cada byte de indentação removido é rede e hash a
+menos em toda chamada.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from importlib import resources
+
+_TOKEN = re.compile(
+    r"""
+      (?P<ignored>[\s,﻿]+|\#[^\n\r]*)
+    | (?P<block_string>\"\"\"(?:\\\"\"\"|[^"]|"(?!""))*\"\"\")
+    | (?P<string>"(?:\\.|[^"\\\n\r])*")
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    | (?P<punctuator>\.\.\.|[!$&()\:=@\[\]{|}])
+    """,
+    re.VERBOSE,
+)
+
+
+def minify(source: str) -> str:
+    """Reduz um documento GraphQL aos tokens mínimos.
+
+    Remove espaços, quebras de linha, vírgulas (insignificantes em GraphQL) e
+    comentários; strings são preservadas como estão.
+    """
+    out: list[str] = []
+    prev_word = False
+    pos = 0
+    while pos < len(source):
+        m = _TOKEN.match(source, pos)
+        if m is None:
+            raise ValueError(f"caractere inesperado na posição {pos}: {source[pos]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "ignored":
+            continue
+        word = kind in ("name", "number")
+        if word and prev_word:
+            out.append(" ")
+        out.append(m.group())
+        prev_word = word
+    return "".join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def load_document(name: str) -> str:
+    """Lê `name` deste pacote e devolve o documento minificado (com cache)."""
+    source = resources.files(__name__).joinpath(name).read_text(encoding="utf-8")
+    return minify(source)
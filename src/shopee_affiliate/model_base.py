@@ -0,0 +1,142 @@
+"""Base dos modelos de resposta (`shopee_affiliate.models`).
+
+Os modelos são classes com `__slots__` (sem `__dict__` por instância) e
+guardam só os campos do schema; chaves desconhecidas do JSON são descartadas.
+Campos numéricos que a API devolve como string decimal (`commissionRate`,
+`price`, `itemTotalCommission`...) ficam como string até o primeiro acesso,
+quando são convertidos uma vez e o resultado substitui a string no slot.
+Strings de baixa cardinalidade (status, tipos, categorias, loja) são
+internadas, então milhões de itens compartilham o mesmo objeto.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+M = TypeVar("M", bound="Model")
+
+
+def to_number(value: str) -> Optional[float | int | str]:
+    """Converte string numérica: "12.5" -> 12.5, "3" -> 3, "" -> None.
+
+    Uma string que não é número volta sem alteração: um campo malformado não
+    impede a leitura do resto do modelo.
+    """
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return value
+
+
+class LazyNumber:
+    """Descriptor: lê o slot `slot` e converte string numérica no 1º acesso."""
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            value = to_number(value)
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.slot, value)
+
+
+class Model:
+    """Base dos modelos gerados.
+
+    Subclasses declaram:
+        _fields: nomes dos campos na API (ordem do schema);
+        _slots: slot de cada campo (`_<campo>` para os `LazyNumber`);
+        _nested: campo -> modelo para objetos/listas aninhados;
+        _interned: campos string internados com `sys.intern`;
+        _selectable: campos que podem ir na seleção GraphQL (ver projection).
+    """
+
+    __slots__ = ()
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _slots: ClassVar[Tuple[str, ...]] = ()
+    _nested: ClassVar[Dict[str, Type["Model"]]] = {}
+    _interned: ClassVar[FrozenSet[str]] = frozenset()
+    _selectable: ClassVar[Tuple[str, ...]] = ()
+
+    def __init__(self, **values: Any):
+        for field, slot in zip(self._fields, self._slots):
+            setattr(self, slot, values.get(field))
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        obj = cls.__new__(cls)
+        get = data.get
+        nested = cls._nested
+        interned = cls._interned
+        for field, slot in zip(cls._fields, cls._slots):
+            value = get(field)
+            if value is not None:
+                if field in interned and type(value) is str:
+                    value = sys.intern(value)
+                elif field in nested:
+                    model = nested[field]
+                    if isinstance(value, list):
+                        value = [model.from_dict(v) for v in value]
+                    else:
+                        value = model.from_dict(value)
+            setattr(obj, slot, value)
+        return obj
+
+    @classmethod
+    def from_list(cls: Type[M], items: Iterable[Dict[str, Any]]) -> List[M]:
+        return [cls.from_dict(item) for item in items]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Campos preenchidos (números já decodificados), recursivo."""
+        out: Dict[str, Any] = {}
+        for field in self._fields:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], Model):
+                value = [v.to_dict() for v in value]
+            out[field] = value
+        return out
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    def __repr__(self) -> str:
+        filled = ", ".join(
+            f"{f}={getattr(self, s)!r}"
+            for f, s in zip(self._fields, self._slots)
+            if getattr(self, s) is not None
+        )
+        return f"{type(self).__name__}({filled})"
@@ -0,0 +1,639 @@
+"""Modelos de resposta com __slots__ e decodificação numérica preguiçosa.
+
+GERADO por scripts/generate_models.py a partir de docs/introspection_raw.json;
+não edite à mão.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple, Type
+
+from .model_base import LazyNumber, Model
+
+
+class ConversionItem(Model):
+    """`ConversionReportOrderItem`."""
+
+    __slots__ = (
+        "shopId",
+        "shopName",
+        "completeTime",
+        "promotionId",
+        "modelId",
+        "itemId",
+        "itemName",
+        "_itemPrice",
+        "displayItemStatus",
+        "_actualAmount",
+        "_refundAmount",
+        "qty",
+        "imageUrl",
+        "_itemCommission",
+        "_grossBrandCommission",
+        "_itemTotalCommission",
+        "_itemSellerCommission",
+        "_itemSellerCommissionRate",
+        "_itemShopeeCommissionCapped",
+        "_itemShopeeCommissionRate",
+        "itemNotes",
+        "categoryLv1Name",
+        "categoryLv2Name",
+        "categoryLv3Name",
+        "globalCategoryLv1Name",
+        "globalCategoryLv2Name",
+        "globalCategoryLv3Name",
+        "fraudStatus",
+        "fraudReason",
+        "attributionType",
+        "channelType",
+        "campaignPartnerName",
+        "campaignType",
+    )
+    _fields = (
+        "shopId",
+        "shopName",
+        "completeTime",
+        "promotionId",
+        "modelId",
+        "itemId",
+        "itemName",
+        "itemPrice",
+        "displayItemStatus",
+        "actualAmount",
+        "refundAmount",
+        "qty",
+        "imageUrl",
+        "itemCommission",
+        "grossBrandCommission",
+        "itemTotalCommission",
+        "itemSellerCommission",
+        "itemSellerCommissionRate",
+        "itemShopeeCommissionCapped",
+        "itemShopeeCommissionRate",
+        "itemNotes",
+        "categoryLv1Name",
+        "categoryLv2Name",
+        "categoryLv3Name",
+        "globalCategoryLv1Name",
+        "globalCategoryLv2Name",
+        "globalCategoryLv3Name",
+        "fraudStatus",
+        "fraudReason",
+        "attributionType",
+        "channelType",
+        "campaignPartnerName",
+        "campaignType",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _interned = frozenset(
+        (
+            "shopName",
+            "displayItemStatus",
+            "categoryLv1Name",
+            "categoryLv2Name",
+            "categoryLv3Name",
+            "globalCategoryLv1Name",
+            "globalCategoryLv2Name",
+            "globalCategoryLv3Name",
+            "fraudStatus",
+            "fraudReason",
+            "attributionType",
+            "channelType",
+            "campaignType",
+        )
+    )
+
+    itemPrice = LazyNumber("_itemPrice")
+    actualAmount = LazyNumber("_actualAmount")
+    refundAmount = LazyNumber("_refundAmount")
+    itemCommission = LazyNumber("_itemCommission")
+    grossBrandCommission = LazyNumber("_grossBrandCommission")
+    itemTotalCommission = LazyNumber("_itemTotalCommission")
+    itemSellerCommission = LazyNumber("_itemSellerCommission")
+    itemSellerCommissionRate = LazyNumber("_itemSellerCommissionRate")
+    itemShopeeCommissionCapped = LazyNumber("_itemShopeeCommissionCapped")
+    itemShopeeCommissionRate = LazyNumber("_itemShopeeCommissionRate")
+
+
+class ConversionOrder(Model):
+    """`ConversionReportOrder`."""
+
+    __slots__ = (
+        "orderId",
+        "shopType",
+        "orderStatus",
+        "items",
+        "purchaseTime",
+        "conversionId",
+        "conversionStatus",
+    )
+    _fields = (
+        "orderId",
+        "shopType",
+        "orderStatus",
+        "items",
+        "purchaseTime",
+        "conversionId",
+        "conversionStatus",
+    )
+    _slots = __slots__
+    _selectable = (
+        "orderId",
+        "shopType",
+        "orderStatus",
+        "items",
+    )
+    _nested = {"items": ConversionItem}
+    _interned = frozenset(
+        (
+            "shopType",
+            "orderStatus",
+            "conversionStatus",
+        )
+    )
+
+
+class Conversion(Model):
+    """`ConversionReport`."""
+
+    __slots__ = (
+        "clickTime",
+        "purchaseTime",
+        "checkoutId",
+        "conversionId",
+        "conversionStatus",
+        "_grossCommission",
+        "_cappedCommission",
+        "_totalBrandCommission",
+        "_estimatedTotalCommission",
+        "_shopeeCommissionCapped",
+        "_sellerCommission",
+        "_totalCommission",
+        "_netCommission",
+        "_mcnManagementFeeRate",
+        "_mcnManagementFee",
+        "mcnContractId",
+        "linkedMcnName",
+        "buyerType",
+        "utmContent",
+        "device",
+        "productType",
+        "referrer",
+        "orders",
+    )
+    _fields = (
+        "clickTime",
+        "purchaseTime",
+        "checkoutId",
+        "conversionId",
+        "conversionStatus",
+        "grossCommission",
+        "cappedCommission",
+        "totalBrandCommission",
+        "estimatedTotalCommission",
+        "shopeeCommissionCapped",
+        "sellerCommission",
+        "totalCommission",
+        "netCommission",
+        "mcnManagementFeeRate",
+        "mcnManagementFee",
+        "mcnContractId",
+        "linkedMcnName",
+        "buyerType",
+        "utmContent",
+        "device",
+        "productType",
+        "referrer",
+        "orders",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _nested = {"orders": ConversionOrder}
+    _interned = frozenset(
+        (
+            "conversionStatus",
+            "buyerType",
+            "device",
+            "productType",
+            "referrer",
+        )
+    )
+
+    grossCommission = LazyNumber("_grossCommission")
+    cappedCommission = LazyNumber("_cappedCommission")
+    totalBrandCommission = LazyNumber("_totalBrandCommission")
+    estimatedTotalCommission = LazyNumber("_estimatedTotalCommission")
+    shopeeCommissionCapped = LazyNumber("_shopeeCommissionCapped")
+    sellerCommission = LazyNumber("_sellerCommission")
+    totalCommission = LazyNumber("_totalCommission")
+    netCommission = LazyNumber("_netCommission")
+    mcnManagementFeeRate = LazyNumber("_mcnManagementFeeRate")
+    mcnManagementFee = LazyNumber("_mcnManagementFee")
+
+
+class ProductOffer(Model):
+    """`ProductOfferV2`."""
+
+    __slots__ = (
+        "itemId",
+        "_commissionRate",
+        "_appExistRate",
+        "_appNewRate",
+        "_webExistRate",
+        "_webNewRate",
+        "_commission",
+        "_price",
+        "_sales",
+        "imageUrl",
+        "productName",
+        "shopName",
+        "productLink",
+        "offerLink",
+        "periodEndTime",
+        "periodStartTime",
+        "_priceMin",
+        "_priceMax",
+        "productCatIds",
+        "_ratingStar",
+        "_priceDiscountRate",
+        "shopId",
+        "shopType",
+        "_sellerCommissionRate",
+        "_shopeeCommissionRate",
+    )
+    _fields = (
+        "itemId",
+        "commissionRate",
+        "appExistRate",
+        "appNewRate",
+        "webExistRate",
+        "webNewRate",
+        "commission",
+        "price",
+        "sales",
+        "imageUrl",
+        "productName",
+        "shopName",
+        "productLink",
+        "offerLink",
+        "periodEndTime",
+        "periodStartTime",
+        "priceMin",
+        "priceMax",
+        "productCatIds",
+        "ratingStar",
+        "priceDiscountRate",
+        "shopId",
+        "shopType",
+        "sellerCommissionRate",
+        "shopeeCommissionRate",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _interned = frozenset(
+        (
+            "shopName",
+            "shopType",
+        )
+    )
+
+    commissionRate = LazyNumber("_commissionRate")
+    appExistRate = LazyNumber("_appExistRate")
+    appNewRate = LazyNumber("_appNewRate")
+    webExistRate = LazyNumber("_webExistRate")
+    webNewRate = LazyNumber("_webNewRate")
+    commission = LazyNumber("_commission")
+    price = LazyNumber("_price")
+    sales = LazyNumber("_sales")
+    priceMin = LazyNumber("_priceMin")
+    priceMax = LazyNumber("_priceMax")
+    ratingStar = LazyNumber("_ratingStar")
+    priceDiscountRate = LazyNumber("_priceDiscountRate")
+    sellerCommissionRate = LazyNumber("_sellerCommissionRate")
+    shopeeCommissionRate = LazyNumber("_shopeeCommissionRate")
+
+
+class ShopOffer(Model):
+    """`ShopOfferV2`."""
+
+    __slots__ = (
+        "_commissionRate",
+        "imageUrl",
+        "offerLink",
+        "originalLink",
+        "shopId",
+        "shopName",
+        "periodStartTime",
+        "periodEndTime",
+        "bannerInfo",
+        "_ratingStar",
+        "shopType",
+        "_remainingBudget",
+        "_sellerCommCoveRatio",
+    )
+    _fields = (
+        "commissionRate",
+        "imageUrl",
+        "offerLink",
+        "originalLink",
+        "shopId",
+        "shopName",
+        "periodStartTime",
+        "periodEndTime",
+        "bannerInfo",
+        "ratingStar",
+        "shopType",
+        "remainingBudget",
+        "sellerCommCoveRatio",
+    )
+    _slots = __slots__
+    _selectable = (
+        "commissionRate",
+        "imageUrl",
+        "offerLink",
+        "originalLink",
+        "shopId",
+        "shopName",
+        "periodStartTime",
+        "periodEndTime",
+        "ratingStar",
+        "shopType",
+        "remainingBudget",
+        "sellerCommCoveRatio",
+    )
+    _interned = frozenset(
+        (
+            "shopName",
+            "shopType",
+        )
+    )
+
+    commissionRate = LazyNumber("_commissionRate")
+    ratingStar = LazyNumber("_ratingStar")
+    remainingBudget = LazyNumber("_remainingBudget")
+    sellerCommCoveRatio = LazyNumber("_sellerCommCoveRatio")
+
+
+class ShopeeOffer(Model):
+    """`ShopeeOfferV2`."""
+
+    __slots__ = (
+        "_commissionRate",
+        "imageUrl",
+        "offerLink",
+        "originalLink",
+        "offerName",
+        "offerType",
+        "categoryId",
+        "collectionId",
+        "periodStartTime",
+        "periodEndTime",
+    )
+    _fields = (
+        "commissionRate",
+        "imageUrl",
+        "offerLink",
+        "originalLink",
+        "offerName",
+        "offerType",
+        "categoryId",
+        "collectionId",
+        "periodStartTime",
+        "periodEndTime",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _interned = frozenset(("offerType",))
+
+    commissionRate = LazyNumber("_commissionRate")
+
+
+class PartnerOrderItem(Model):
+    """`PartnerReportOrderItem`."""
+
+    __slots__ = (
+        "itemId",
+        "itemName",
+        "categoryLv1Name",
+        "categoryLv2Name",
+        "categoryLv3Name",
+        "_itemPrice",
+        "qty",
+        "_actualAmount",
+        "_refundAmount",
+    )
+    _fields = (
+        "itemId",
+        "itemName",
+        "categoryLv1Name",
+        "categoryLv2Name",
+        "categoryLv3Name",
+        "itemPrice",
+        "qty",
+        "actualAmount",
+        "refundAmount",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _interned = frozenset(
+        (
+            "categoryLv1Name",
+            "categoryLv2Name",
+            "categoryLv3Name",
+        )
+    )
+
+    itemPrice = LazyNumber("_itemPrice")
+    actualAmount = LazyNumber("_actualAmount")
+    refundAmount = LazyNumber("_refundAmount")
+
+
+class PartnerExtInfo(Model):
+    """`ExtInfo`."""
+
+    __slots__ = (
+        "clickId",
+        "videoId",
+        "userType",
+    )
+    _fields = (
+        "clickId",
+        "videoId",
+        "userType",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _interned = frozenset(("userType",))
+
+
+class PartnerOrder(Model):
+    """`PartnerOrder`."""
+
+    __slots__ = (
+        "orderId",
+        "purchaseTime",
+        "completeTime",
+        "orderStatus",
+        "buyerType",
+        "shopId",
+        "shopName",
+        "productType",
+        "items",
+        "extInfo",
+    )
+    _fields = (
+        "orderId",
+        "purchaseTime",
+        "completeTime",
+        "orderStatus",
+        "buyerType",
+        "shopId",
+        "shopName",
+        "productType",
+        "items",
+        "extInfo",
+    )
+    _slots = __slots__
+    _selectable = _fields
+    _nested = {"items": PartnerOrderItem, "extInfo": PartnerExtInfo}
+    _interned = frozenset(
+        (
+            "orderStatus",
+            "buyerType",
+            "shopName",
+            "productType",
+        )
+    )
+
+
+# enum do schema -> valores
+ENUMS: Dict[str, Tuple[str, ...]] = {
+    "AttributionType": (
+        "ORDERED_IN_SAME_SHOP",
+        "ORDERED_IN_DIFFERENT_SHOP",
+    ),
+    "BrandOfferOrder": (
+        "NEWEST",
+        "HIGEST_COMMISSION_RATE",
+        "ENDING_SOON",
+    ),
+    "BuyerType": (
+        "ALL",
+        "NEW",
+        "EXISTING",
+    ),
+    "CampaignType": (
+        "ALL",
+        "SELLER_OPEN_CAMPAIGN",
+        "SELLER_TARGET_CAMPAIGN",
+        "MCN_CAMPAIGN",
+        "NON_SELLER_CAMPAIGN",
+    ),
+    "CategoryType": (
+        "ALL",
+        "MP",
+        "DP",
+    ),
+    "ConversionStatus": (
+        "ALL",
+        "PENDING",
+        "COMPLETED",
+        "CANCELLED",
+    ),
+    "DeltaDataUpdateType": (
+        "UNKNOWN",
+        "NEW",
+        "UPDATE",
+        "DELETE",
+    ),
+    "DeviceType": (
+        "ALL",
+        "APP",
+        "WEB",
+    ),
+    "DisplayItemStatus": (
+        "ALL",
+        "TO_BE_COMPLETED",
+        "COMPLETED",
+        "CANCEL",
+        "COMPLETED_PARTIAL_REFUNDED",
+    ),
+    "DisplayOrderStatus": (
+        "ALL",
+        "UNPAID",
+        "PENDING",
+        "COMPLETED",
+        "CANCELLED",
+    ),
+    "FeedMode": (
+        "FULL",
+        "DELTA",
+    ),
+    "FraudStatus": (
+        "ALL",
+        "UNVERIFIED",
+        "VERIFIED",
+        "FRAUD",
+    ),
+    "OfferStatus": (
+        "ONGOING",
+        "UPCOMING",
+        "ENDED",
+        "TERMINATED",
+        "PAUSED",
+    ),
+    "OfferType": (
+        "SHOPEE",
+        "PRODUCT",
+        "BRAND",
+    ),
+    "ProductOfferOrder": ("HIGHEST_COMMISSION_RATE",),
+    "ProductType": (
+        "ALL",
+        "MP",
+        "DP",
+    ),
+    "RateUnit": (
+        "PERCENT",
+        "DECIMAL",
+    ),
+    "ShopType": (
+        "None",
+        "ALL",
+        "SHOPEE_MALL_CB",
+        "SHOPEE_MALL_NON_CB",
+        "C2C_CB",
+        "C2C_NON_CB",
+        "PREFERRED_CB",
+        "PREFERRED_NON_CB",
+    ),
+    "ShopeeOfferOrder": (
+        "NEWEST",
+        "HIGEST_COMMISSION_RATE",
+        "ENDING_SOON",
+    ),
+    "ShopeeOfferType": (
+        "ALL",
+        "HOMEPAGE",
+        "CAMPAIGN",
+        "SHOP",
+        "CATEGORY",
+    ),
+}
+
+
+# query raiz -> modelo dos nodes
+QUERY_MODELS: Dict[str, Type[Model]] = {
+    "conversionReport": Conversion,
+    "productOfferV2": ProductOffer,
+    "shopOfferV2": ShopOffer,
+    "shopeeOfferV2": ShopeeOffer,
+    "partnerOrderReport": PartnerOrder,
+}
+
+
+def parse_nodes(resp: Dict[str, Any], field: str) -> List[Any]:
+    """Converte `resp["data"][field]["nodes"]` nos modelos de `QUERY_MODELS`."""
+    data = (resp.get("data") or {}).get(field) or {}
+    return QUERY_MODELS[field].from_list(data.get("nodes") or [])
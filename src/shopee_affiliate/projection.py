@@ -0,0 +1,194 @@
+"""Projeção de campos: escolher o que cada query seleciona em `nodes`.
+
+Os documentos em `graphql/*.graphql` trazem uma seleção fixa; o
+conversionReport, por exemplo, sempre pede `imageUrl` e três nomes de
+categoria por item. Muitos jobs só precisam de `orderId` e comissão, e cada
+campo a menos encolhe a resposta (e o parse) em todas as páginas.
+
+`fields` aceita:
+
+- `None`: documento padrão, sem alteração;
+- um preset (`"minimal"` ou `"full"`, ver `PRESETS`);
+- uma lista de caminhos relativos ao node, com `.` para descer em objetos
+  aninhados (`"orders.items.itemTotalCommission"`); um objeto sem sub-campo
+  (`"orders.items"`) seleciona todos os seus campos.
+
+Os campos válidos vêm do schema (`docs/introspection_raw.json`), via
+`_selectable`/`_nested` dos modelos gerados (scripts/generate_models.py);
+caminhos desconhecidos levantam `ValueError` antes de qualquer requisição.
+As chaves que paginação, dedupe e checkpoints usam (`KEY_FIELDS`) entram
+sempre. O documento projetado é montado uma vez por projeção (cache).
+
+Uso:
+
+    client.iter_conversion_report_orders(
+        start, end, fields=["orders.items.itemTotalCommission"]
+    )
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from .graphql import minify
+from .model_base import Model
+from .models import QUERY_MODELS
+
+Fields = Union[str, Sequence[str], None]
+
+# Campos sempre selecionados quando há projeção (dedupe por `orderId`,
+# watermark/checkpoint por `purchaseTime`, contexto copiado para o order).
+KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "conversionReport": ("purchaseTime", "conversionId", "orders.orderId"),
+    "partnerOrderReport": ("orderId", "purchaseTime"),
+}
+
+# "full" (tudo o que o schema permite selecionar) é calculado do modelo.
+PRESETS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "minimal": {
+        "conversionReport": (
+            "purchaseTime",
+            "conversionId",
+            "conversionStatus",
+            "orders.orderId",
+            "orders.orderStatus",
+            "orders.items.itemId",
+            "orders.items.qty",
+            "orders.items.itemPrice",
+            "orders.items.itemTotalCommission",
+        ),
+        "partnerOrderReport": (
+            "orderId",
+            "purchaseTime",
+            "orderStatus",
+            "items.itemId",
+            "items.qty",
+            "items.actualAmount",
+        ),
+        "productOfferV2": (
+            "itemId",
+            "productName",
+            "price",
+            "commissionRate",
+            "offerLink",
+        ),
+        "shopOfferV2": ("shopId", "shopName", "commissionRate", "offerLink"),
+        "shopeeOfferV2": ("offerName", "commissionRate", "offerLink"),
+    },
+}
+PRESET_NAMES = ("minimal", "full")
+
+
+def _model(field: str) -> Type[Model]:
+    if field not in QUERY_MODELS:
+        raise ValueError(
+            f"query sem projeção: {field!r}; use uma de {tuple(QUERY_MODELS)}"
+        )
+    return QUERY_MODELS[field]
+
+
+def _check_path(model: Type[Model], path: str, field: str) -> None:
+    current = model
+    parts = path.split(".")
+    for i, name in enumerate(parts):
+        if name not in current._selectable:
+            raise ValueError(
+                f"campo desconhecido {path!r} em {field}; campos de "
+                f"{current.__name__}: {current._selectable}"
+            )
+        if i < len(parts) - 1:
+            if name not in current._nested:
+                raise ValueError(f"{'.'.join(parts[: i + 1])!r} não é um objeto")
+            current = current._nested[name]
+
+
+def normalize(field: str, fields: Fields) -> Optional[Tuple[str, ...]]:
+    """Valida `fields` para a query `field` e devolve os caminhos canônicos.
+
+    `None` continua `None` (documento padrão). O resultado é ordenado e sem
+    repetições, para que listas equivalentes compartilhem o mesmo documento.
+    """
+    if fields is None:
+        return None
+    model = _model(field)
+    if isinstance(fields, str):
+        if fields == "full":
+            paths: Sequence[str] = model._selectable
+        elif fields in PRESETS:
+            paths = PRESETS[fields][field]
+        else:
+            raise ValueError(
+                f"preset desconhecido {fields!r}; use um de {PRESET_NAMES} "
+                "ou uma lista de campos"
+            )
+    else:
+        paths = list(fields)
+        if not paths:
+            raise ValueError("fields não pode ser vazio")
+    out = set(KEY_FIELDS.get(field, ()))
+    for path in paths:
+        if not isinstance(path, str) or not path:
+            raise ValueError(f"campo inválido: {path!r}")
+        _check_path(model, path, field)
+        out.add(path)
+    return tuple(sorted(out))
+
+
+def _tree(paths: Sequence[str]) -> Dict[str, Optional[dict]]:
+    """Caminhos -> árvore; `None` = campo folha ou objeto inteiro."""
+    tree: Dict[str, Optional[dict]] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for name in parts[:-1]:
+            child = node.get(name, {})
+            if child is None:  # objeto já selecionado inteiro
+                break
+            node = node.setdefault(name, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def _render(model: Type[Model], tree: Optional[Dict[str, Optional[dict]]]) -> str:
+    # Ordem do schema, não a do chamador: o texto só depende da seleção.
+    out: List[str] = []
+    for name in model._selectable:
+        if tree is not None and name not in tree:
+            continue
+        sub = None if tree is None else tree[name]
+        nested = model._nested.get(name)
+        out.append(name if nested is None else f"{name}{{{_render(nested, sub)}}}")
+    return " ".join(out)
+
+
+def selection(field: str, paths: Sequence[str]) -> str:
+    """Seleção GraphQL (minificada) dos `paths` já validados de `field`."""
+    return minify(_render(_model(field), _tree(paths)))
+
+
+@functools.lru_cache(maxsize=256)
+def _projected(document: str, field: str, paths: Tuple[str, ...]) -> str:
+    start = document.index("nodes{", document.index(field + "(")) + len("nodes{")
+    depth = 1
+    end = start
+    while depth:
+        char = document[end]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        end += 1
+    return document[:start] + selection(field, paths) + document[end - 1 :]
+
+
+def project(document: str, field: str, fields: Fields) -> str:
+    """`document` (minificado) com a seleção de `nodes` trocada por `fields`.
+
+    Sem projeção (`fields=None`) devolve o próprio `document`.
+    """
+    paths = normalize(field, fields)
+    if paths is None:
+        return document
+    return _projected(document, field, paths)
@@ -5,147 +5,397 @@ Motivação:
 - facilitar manutenção quando o schema mudar
 
 As queries/mutations base ficam em `src/shopee_affiliate/graphql/*.graphql`.
-As funções aqui carregam e injetam parâmetros de forma segura.
+Os documentos são constantes e declaram variáveis GraphQL (`$page: Int`...):
+as funções aqui só montam o dict `variables`, enviado pelo transport junto do
+documento. Assim o texto da query não muda entre páginas/keywords (pode ser
+pré-serializado e o servidor reaproveita o parse) e nenhum valor do usuário é
+interpolado no documento. `_load` devolve os documentos já minificados.
+
+As queries com `nodes` aceitam `fields` (ver `projection`): a seleção padrão
+do documento é trocada pelos campos pedidos, com um documento por projeção.
 """
 
 from __future__ import annotations
 
-import json
 import re
-from importlib import resources
-from typing import List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
+from .graphql import load_document as _load
+from .models import ENUMS
+from .projection import Fields, project
 
-def _load(name: str) -> str:
-    return (
-        resources.files("shopee_affiliate.graphql")
-        .joinpath(name)
-        .read_text(encoding="utf-8")
-    )
 
+class Operation(NamedTuple):
+    """Documento GraphQL constante + variáveis de uma chamada."""
 
-def _render(template: str, mapping: dict[str, str]) -> str:
-    """
-    Render template by replacing {{key}} placeholders with mapping values.
+    query: str
+    variables: Dict[str, Any]
 
-    Uses re.sub() for 2-3x performance improvement over string replacement.
-    Correctly handles GraphQL templates containing literal { and } braces.
 
-    Args:
-        template: String containing {{placeholder}} patterns
-        mapping: Dictionary mapping placeholder names to values
+def _variables(**values: Any) -> Dict[str, Any]:
+    """Variáveis sem os `None` (argumento ausente => default do servidor)."""
+    return {k: v for k, v in values.items() if v is not None}
 
-    Returns:
-        Rendered string with placeholders substituted
+
+_OPERATION_HEADER = re.compile(
+    r"^\s*(query|mutation)\s*(?:[A-Za-z_]\w*)?\s*(?:\((.*)\))?\s*$", re.DOTALL
+)
+_VARIABLE_DEFINITION = re.compile(r"\$([A-Za-z_]\w*)\s*:\s*([\w!\[\]]+)")
+_VARIABLE_REFERENCE = re.compile(r"\$([A-Za-z_]\w*)")
+
+
+def _document(name: str, *variables: str) -> str:
+    """Carrega `name` conferindo suas variáveis contra as do builder.
+
+    O cabeçalho deve declarar exatamente `variables` (os nomes que o builder
+    envia) e todo `$x` do corpo precisa estar declarado. Qualquer diferença
+    falha já no import, em vez de virar erro do servidor (ou argumento
+    ignorado em silêncio) na primeira chamada.
     """
-    return re.sub(
-        r"{{([a-zA-Z_][a-zA-Z0-9_]*)}}",
-        lambda m: mapping.get(m.group(1), m.group(0)),
-        template,
-    )
+    document = _load(name)
+    start = document.index("{")
+    header = _OPERATION_HEADER.match(document[:start])
+    if header is None:
+        raise ValueError(f"{name}: cabeçalho de operação inválido")
+    declared = [v for v, _ in _VARIABLE_DEFINITION.findall(header.group(2) or "")]
+    referenced = set(_VARIABLE_REFERENCE.findall(document[start:]))
+    unknown = sorted(set(declared) - set(variables))
+    missing = sorted(set(variables) - set(declared))
+    undeclared = sorted(referenced - set(declared))
+    if unknown or missing or undeclared:
+        raise ValueError(
+            f"{name}: variáveis desconhecidas {unknown}, ausentes {missing}, "
+            f"usadas sem declaração {undeclared}"
+        )
+    return document
 
 
-_SHOPEE_OFFER_V2 = _load("shopeeOfferV2.graphql")
-_SHOP_OFFER_V2 = _load("shopOfferV2.graphql")
-_PRODUCT_OFFER_V2 = _load("productOfferV2.graphql")
-_CONVERSION_REPORT = _load("conversionReport.graphql")
-_GENERATE_SHORT_LINK = _load("generateShortLink.graphql")
+_SHOPEE_OFFER_V2 = _document(
+    "shopeeOfferV2.graphql", "keyword", "sortType", "page", "limit"
+)
+_SHOP_OFFER_V2 = _document(
+    "shopOfferV2.graphql",
+    "keyword",
+    "shopId",
+    "shopType",
+    "isKeySeller",
+    "sortType",
+    "page",
+    "limit",
+)
+_PRODUCT_OFFER_V2 = _document(
+    "productOfferV2.graphql",
+    "keyword",
+    "shopId",
+    "itemId",
+    "productCatId",
+    "listType",
+    "matchId",
+    "sortType",
+    "page",
+    "limit",
+)
+_PARTNER_ORDER_REPORT = _document(
+    "partnerOrderReport.graphql",
+    "purchaseTimeStart",
+    "purchaseTimeEnd",
+    "completeTimeStart",
+    "completeTimeEnd",
+    "searchNextToken",
+    "limit",
+)
+_GENERATE_SHORT_LINK = _document("generateShortLink.graphql", "input")
+_GENERATE_BATCH_SHORT_LINK = _document("generateBatchShortLink.graphql", "input")
+_LIST_ITEM_FEEDS = _document("listItemFeeds.graphql", "feedMode")
+_GET_ITEM_FEED_DATA = _document(
+    "getItemFeedData.graphql", "datafeedId", "offset", "limit"
+)
+
+FEED_MODES = ("FULL", "DELTA")
 
 
 def q_shopee_offer_v2(
-    *, keyword: Optional[str], sort_type: int, page: int, limit: int
-) -> str:
-    return _render(
-        _SHOPEE_OFFER_V2,
-        {
-            "keyword": json.dumps(keyword) if keyword else "null",
-            "sortType": str(sort_type),
-            "page": str(page),
-            "limit": str(limit),
-        },
+    *,
+    keyword: Optional[str] = None,
+    sort_type: int = 1,
+    page: int = 1,
+    limit: int = 10,
+    fields: Fields = None,
+) -> Operation:
+    return Operation(
+        project(_SHOPEE_OFFER_V2, "shopeeOfferV2", fields),
+        _variables(keyword=keyword or None, sortType=sort_type, page=page, limit=limit),
     )
 
 
 def q_shop_offer_v2(
     *,
-    keyword: Optional[str],
-    shop_id: Optional[int],
-    shop_type: Optional[List[int]],
-    is_key_seller: bool,
-    sort_type: int,
-    page: int,
-    limit: int,
-) -> str:
-    return _render(
-        _SHOP_OFFER_V2,
-        {
-            "keyword": json.dumps(keyword) if keyword else "null",
-            "shopId": str(shop_id) if shop_id else "null",
-            "shopType": str(shop_type) if shop_type else "[]",
-            "isKeySeller": str(is_key_seller).lower(),
-            "sortType": str(sort_type),
-            "page": str(page),
-            "limit": str(limit),
-        },
+    keyword: Optional[str] = None,
+    shop_id: Optional[int] = None,
+    shop_type: Optional[List[int]] = None,
+    is_key_seller: bool = False,
+    sort_type: int = 1,
+    page: int = 1,
+    limit: int = 10,
+    fields: Fields = None,
+) -> Operation:
+    return Operation(
+        project(_SHOP_OFFER_V2, "shopOfferV2", fields),
+        _variables(
+            keyword=keyword or None,
+            shopId=shop_id or None,
+            shopType=list(shop_type) if shop_type else None,
+            isKeySeller=is_key_seller,
+            sortType=sort_type,
+            page=page,
+            limit=limit,
+        ),
     )
 
 
 def q_product_offer_v2(
     *,
-    keyword: Optional[str],
-    shop_id: Optional[int],
-    item_id: Optional[int],
-    product_cat_id: Optional[int],
-    list_type: int,
-    match_id: Optional[int],
-    sort_type: int,
-    page: int,
-    limit: int,
-) -> str:
-    return _render(
-        _PRODUCT_OFFER_V2,
-        {
-            "keyword": json.dumps(keyword) if keyword else "null",
-            "shopId": str(shop_id) if shop_id else "null",
-            "itemId": str(item_id) if item_id else "null",
-            "productCatId": str(product_cat_id) if product_cat_id else "null",
-            "listType": str(list_type),
-            "matchId": str(match_id) if match_id else "null",
-            "sortType": str(sort_type),
-            "page": str(page),
-            "limit": str(limit),
-        },
+    keyword: Optional[str] = None,
+    shop_id: Optional[int] = None,
+    item_id: Optional[int] = None,
+    product_cat_id: Optional[int] = None,
+    list_type: int = 0,
+    match_id: Optional[int] = None,
+    sort_type: int = 1,
+    page: int = 1,
+    limit: int = 10,
+    fields: Fields = None,
+) -> Operation:
+    return Operation(
+        project(_PRODUCT_OFFER_V2, "productOfferV2", fields),
+        _variables(
+            keyword=keyword or None,
+            shopId=shop_id or None,
+            itemId=item_id or None,
+            productCatId=product_cat_id or None,
+            listType=list_type,
+            matchId=match_id or None,
+            sortType=sort_type,
+            page=page,
+            limit=limit,
+        ),
     )
 
 
+# Filtros opcionais do conversionReport: argumento Python -> (variável
+# GraphQL, enum). Todos são declarados no documento, então filtrar não muda o
+# texto da query; o servidor devolve só as linhas que casam.
+# `conversion_status` e `checkout_id` constam como deprecated no schema.
+CONVERSION_REPORT_FILTERS: Dict[str, Tuple[str, Optional[str]]] = {
+    "complete_time_start": ("completeTimeStart", None),
+    "complete_time_end": ("completeTimeEnd", None),
+    "shop_name": ("shopName", None),
+    "shop_id": ("shopId", None),
+    "shop_type": ("shopType", "ShopType"),
+    "conversion_id": ("conversionId", None),
+    "conversion_status": ("conversionStatus", "ConversionStatus"),
+    "checkout_id": ("checkoutId", None),
+    "order_id": ("orderId", None),
+    "product_name": ("productName", None),
+    "product_id": ("productId", None),
+    "category_lv1_id": ("categoryLv1Id", None),
+    "category_lv2_id": ("categoryLv2Id", None),
+    "category_lv3_id": ("categoryLv3Id", None),
+    "category_type": ("categoryType", "CategoryType"),
+    "order_status": ("orderStatus", "DisplayOrderStatus"),
+    "buyer_type": ("buyerType", "BuyerType"),
+    "product_type": ("productType", "ProductType"),
+    "fraud_status": ("fraudStatus", "FraudStatus"),
+    "device": ("device", "DeviceType"),
+    "attribution_type": ("attributionType", "AttributionType"),
+    "campaign_partner_name": ("campaignPartnerName", None),
+    "campaign_type": ("campaignType", "CampaignType"),
+}
+
+
+_CONVERSION_REPORT = _document(
+    "conversionReport.graphql",
+    "purchaseTimeStart",
+    "purchaseTimeEnd",
+    "scrollId",
+    "limit",
+    *(variable for variable, _ in CONVERSION_REPORT_FILTERS.values()),
+)
+
+
+def conversion_report_filters(**filters: Any) -> Dict[str, Any]:
+    """Valida filtros do conversionReport e converte para variáveis GraphQL.
+
+    Nomes desconhecidos e valores fora do enum levantam `ValueError` antes de
+    qualquer requisição. `shop_type` aceita um valor ou uma lista.
+    """
+    variables: Dict[str, Any] = {}
+    for name, value in filters.items():
+        if name not in CONVERSION_REPORT_FILTERS:
+            raise ValueError(
+                f"filtro desconhecido {name!r}; use um de "
+                f"{tuple(CONVERSION_REPORT_FILTERS)}"
+            )
+        if value is None:
+            continue
+        variable, enum = CONVERSION_REPORT_FILTERS[name]
+        if name == "shop_type":
+            value = [value] if isinstance(value, str) else list(value)
+        if enum is not None:
+            allowed = ENUMS[enum]
+            for v in value if isinstance(value, list) else [value]:
+                if v not in allowed:
+                    raise ValueError(f"{name} deve ser um de {allowed}, não {v!r}")
+        variables[variable] = value
+    return variables
+
+
 def q_conversion_report(
     *,
     purchase_time_start: int,
     purchase_time_end: int,
     scroll_id: Optional[str],
     limit: int,
-) -> str:
-    # Como o `scrollId` é um argumento opcional, injetamos uma linha inteira ou vazio.
-    scroll_id_line = (
-        f"scrollId: {json.dumps(scroll_id)}" if scroll_id is not None else ""
+    fields: Fields = None,
+    **filters: Any,
+) -> Operation:
+    """conversionReport com filtros opcionais (ver `CONVERSION_REPORT_FILTERS`)."""
+    return Operation(
+        project(_CONVERSION_REPORT, "conversionReport", fields),
+        _variables(
+            purchaseTimeStart=purchase_time_start,
+            purchaseTimeEnd=purchase_time_end,
+            scrollId=scroll_id,
+            limit=limit,
+            **conversion_report_filters(**filters),
+        ),
+    )
+
+
+def q_partner_order_report(
+    *,
+    purchase_time_start: Optional[int] = None,
+    purchase_time_end: Optional[int] = None,
+    complete_time_start: Optional[int] = None,
+    complete_time_end: Optional[int] = None,
+    search_next_token: Optional[str] = None,
+    limit: int,
+    fields: Fields = None,
+) -> Operation:
+    return Operation(
+        project(_PARTNER_ORDER_REPORT, "partnerOrderReport", fields),
+        _variables(
+            purchaseTimeStart=purchase_time_start,
+            purchaseTimeEnd=purchase_time_end,
+            completeTimeStart=complete_time_start,
+            completeTimeEnd=complete_time_end,
+            searchNextToken=search_next_token or None,
+            limit=limit,
+        ),
     )
 
-    return _render(
-        _CONVERSION_REPORT,
-        {
-            "purchaseTimeStart": str(purchase_time_start),
-            "purchaseTimeEnd": str(purchase_time_end),
-            "scrollIdLine": scroll_id_line,
-            "limit": str(limit),
-        },
+
+def q_list_item_feeds(*, feed_mode: Optional[str] = None) -> Operation:
+    if feed_mode is not None and feed_mode not in FEED_MODES:
+        raise ValueError(f"feed_mode deve ser um de {FEED_MODES}")
+    return Operation(_LIST_ITEM_FEEDS, _variables(feedMode=feed_mode))
+
+
+def q_get_item_feed_data(*, datafeed_id: str, offset: int, limit: int) -> Operation:
+    return Operation(
+        _GET_ITEM_FEED_DATA,
+        _variables(datafeedId=datafeed_id, offset=offset, limit=limit),
     )
 
 
-def m_generate_short_link(*, origin_url: str, sub_ids: Optional[List[str]]) -> str:
-    return _render(
+def m_generate_short_link(
+    *, origin_url: str, sub_ids: Optional[List[str]]
+) -> Operation:
+    return Operation(
         _GENERATE_SHORT_LINK,
-        {
-            "originUrl": json.dumps(origin_url),
-            "subIds": json.dumps(sub_ids) if sub_ids else "[]",
-        },
+        {"input": {"originUrl": origin_url, "subIds": list(sub_ids or [])}},
+    )
+
+
+def m_generate_batch_short_link(
+    *, origin_urls: List[str], sub_ids: Optional[List[str]]
+) -> Operation:
+    # `input.links` conforme docs/API_DOCUMENTACAO_COMPLETA.md (BatchShortLinkInput
+    # não aparece detalhado na introspecção).
+    return Operation(
+        _GENERATE_BATCH_SHORT_LINK,
+        {"input": {"links": list(origin_urls), "subIds": list(sub_ids or [])}},
     )
+
+
+# ============== batching (aliases) ==============
+
+
+def batch_operations(operations: Sequence[Operation]) -> Tuple[Operation, List[str]]:
+    """Combina N operações de seleção única numa única operação com aliases.
+
+    Cada operação (ex.: saída de `q_product_offer_v2`) vira uma seleção
+    `qN: productOfferV2(...)` dentro de um só documento, de modo que N páginas
+    ou keywords custam uma única requisição HTTP (e uma unidade de cota).
+    As variáveis de cada operação ganham o prefixo do alias (`$q0_page`...).
+
+    Returns:
+        (operação combinada, aliases na mesma ordem de `operations`)
+    """
+    if not operations:
+        raise ValueError("operations não pode ser vazio")
+
+    kind: Optional[str] = None
+    definitions: List[str] = []
+    selections: List[str] = []
+    variables: Dict[str, Any] = {}
+    aliases: List[str] = []
+    for i, (document, op_variables) in enumerate(operations):
+        start = document.index("{")
+        end = document.rindex("}")
+        header = _OPERATION_HEADER.match(document[:start])
+        if header is None:
+            raise ValueError(f"cabeçalho de operação inválido: {document[:start]!r}")
+        if kind is None:
+            kind = header.group(1)
+        elif header.group(1) != kind:
+            raise ValueError("todas as operações devem ter o mesmo tipo")
+
+        alias = f"q{i}"
+        aliases.append(alias)
+        definitions.extend(
+            f"${alias}_{name}:{type_}"
+            for name, type_ in _VARIABLE_DEFINITION.findall(header.group(2) or "")
+        )
+        body = _VARIABLE_REFERENCE.sub(
+            rf"${alias}_\1", document[start + 1 : end].strip()
+        )
+        selections.append(f"{alias}:{body}")
+        variables.update({f"{alias}_{k}": v for k, v in op_variables.items()})
+
+    # Mesmo formato minificado dos documentos base (ver graphql.minify).
+    header_defs = f"({''.join(definitions)})" if definitions else ""
+    body = "".join(selections)
+    return Operation(f"{kind}{header_defs}{{{body}}}", variables), aliases
+
+
+def split_batch_response(
+    resp: Dict[str, Any], aliases: Sequence[str], field: str
+) -> List[Dict[str, Any]]:
+    """Separa a resposta de `batch_operations` em respostas individuais.
+
+    Cada item tem o mesmo formato de uma chamada simples
+    (`{"data": {field: ...}}`, com `errors` quando houver). Erros com `path`
+    vão só para o alias correspondente; erros sem `path` vão para todos.
+    """
+    data = resp.get("data") or {}
+    errors = resp.get("errors") or []
+
+    out: List[Dict[str, Any]] = []
+    for alias in aliases:
+        item: Dict[str, Any] = {"data": {field: data.get(alias)}}
+        item_errors = [e for e in errors if not e.get("path") or e["path"][0] == alias]
+        if item_errors:
+            item["errors"] = item_errors
+        out.append(item)
+    return out
@@ -0,0 +1,129 @@
+"""Cota compartilhada entre processos (vários workers com o mesmo AppId).
+
+`SQLiteQuotaLedger` implementa o mesmo token bucket de `ratelimit.TokenBucket`,
+mas guarda o estado (tokens + último refill) num arquivo SQLite em modo WAL.
+Cada aquisição roda numa transação `BEGIN IMMEDIATE`, que serializa os
+processos do host via lock do próprio SQLite; assim todos os workers consomem
+um único orçamento de 2000/h em vez de cada um achar que tem a cota inteira.
+
+Como a transação pode esperar até 30 s pelo lock de outro processo, o ledger
+é `blocking`: no client assíncrono cada aquisição roda fora do event loop.
+
+Uso:
+
+    ledger = SQLiteQuotaLedger("/var/tmp/shopee_quota.db", key=app_id)
+    client = ShopeeAffiliateClient(app_id, secret, rate_limiter=ledger)
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from .ratelimit import DEFAULT_BURST, DEFAULT_REQUESTS_PER_HOUR, RateLimiter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteQuotaLedger(RateLimiter):
+    """Token bucket persistido em SQLite, seguro entre threads e processos.
+
+    Args:
+        path: arquivo SQLite compartilhado pelos workers.
+        key: identificador do orçamento (normalmente o AppId).
+        requests_per_hour: cota da API (padrão 2000/h).
+        burst: capacidade do bucket; a reposição desconta o burst para que
+            nenhuma janela de 1h passe de `requests_per_hour`.
+        clock: relógio de parede (precisa ser comum a todos os processos).
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        key: str = "default",
+        requests_per_hour: int = DEFAULT_REQUESTS_PER_HOUR,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.time,
+    ):
+        if not 1 <= burst < requests_per_hour:
+            raise ValueError("burst deve estar entre 1 e requests_per_hour - 1")
+        self.path = str(path)
+        self.key = key
+        self.burst = burst
+        self.rate_per_s = (requests_per_hour - burst) / 3600.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Conexões SQLite não sobrevivem a fork(): reabre no processo filho.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=30.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _try_acquire(self, tokens: int) -> float:
+        if tokens > self.burst:
+            raise ValueError("tokens maior que a capacidade do bucket")
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM quota_buckets WHERE key = ?",
+                    (self.key,),
+                ).fetchone()
+                if row is None:
+                    available = float(self.burst)
+                else:
+                    elapsed = max(0.0, now - row[1])
+                    available = min(self.burst, row[0] + elapsed * self.rate_per_s)
+
+                wait_s = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait_s = (tokens - available) / self.rate_per_s
+
+                conn.execute(
+                    "INSERT INTO quota_buckets (key, tokens, updated_at)"
+                    " VALUES (?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET"
+                    " tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (self.key, available, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return wait_s
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,138 @@
+"""Rate limiting do lado do cliente.
+
+A API documenta um limite de 2000 requisições/hora (erro 10030 quando
+excedido). Em vez de reagir depois do 429/10030, o transport consome um token
+antes de cada tentativa HTTP e espera quando o orçamento acabou.
+
+- `TokenBucket`: bucket em memória, thread-safe, com `acquire()` bloqueante e
+  `acquire_async()` para asyncio.
+- `shared_limiter(app_id)`: bucket único por AppId no processo (padrão dos
+  transports), para que vários clients com a mesma credencial dividam a cota.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import threading
+import time
+from typing import Callable, ClassVar, Dict
+
+DEFAULT_REQUESTS_PER_HOUR = 2000
+DEFAULT_BURST = 20
+
+
+class RateLimiter(abc.ABC):
+    """Interface comum dos limitadores.
+
+    Subclasses implementam `_try_acquire(tokens)`, que retorna `0.0` quando os
+    tokens foram concedidos ou quantos segundos esperar antes de tentar de novo.
+    Uma subclasse sem `_try_acquire` falha já ao ser instanciada.
+
+    Backends cujo `_try_acquire` pode bloquear (I/O, locks entre processos)
+    declaram `blocking = True`; `acquire_async` então roda a tentativa numa
+    thread (`asyncio.to_thread`) em vez de travar o event loop.
+    """
+
+    blocking: ClassVar[bool] = False
+
+    @abc.abstractmethod
+    def _try_acquire(self, tokens: int) -> float:
+        """Concede `tokens` (retorna 0.0) ou diz quantos segundos esperar."""
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Bloqueia a thread atual até haver `tokens` disponíveis."""
+        while True:
+            wait_s = self._try_acquire(tokens)
+            if wait_s <= 0:
+                return
+            time.sleep(wait_s)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Como `acquire`, mas cede o event loop enquanto espera."""
+        while True:
+            if self.blocking:
+                wait_s = await asyncio.to_thread(self._try_acquire, tokens)
+            else:
+                wait_s = self._try_acquire(tokens)
+            if wait_s <= 0:
+                return
+            await asyncio.sleep(wait_s)
+
+
+class NullRateLimiter(RateLimiter):
+    """Desativa o rate limiting (ex.: testes ou cota controlada externamente)."""
+
+    def _try_acquire(self, tokens: int) -> float:
+        return 0.0
+
+
+class TokenBucket(RateLimiter):
+    """Token bucket clássico: até `burst` chamadas imediatas, depois `rate_per_s`.
+
+    Args:
+        rate_per_s: tokens repostos por segundo.
+        burst: capacidade do bucket (começa cheio).
+        clock: relógio monotônico (injetável em testes).
+    """
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s deve ser > 0")
+        if burst < 1:
+            raise ValueError("burst deve ser >= 1")
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_hour(
+        cls,
+        requests_per_hour: int = DEFAULT_REQUESTS_PER_HOUR,
+        *,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> "TokenBucket":
+        """Bucket que nunca excede `requests_per_hour` em qualquer janela de 1h.
+
+        O burst inicial conta contra a cota, então a reposição usa
+        `(requests_per_hour - burst) / 3600` tokens/s.
+        """
+        if not 1 <= burst < requests_per_hour:
+            raise ValueError("burst deve estar entre 1 e requests_per_hour - 1")
+        return cls((requests_per_hour - burst) / 3600.0, burst, clock=clock)
+
+    def _try_acquire(self, tokens: int) -> float:
+        if tokens > self.burst:
+            raise ValueError("tokens maior que a capacidade do bucket")
+        with self._lock:
+            now = self._clock()
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_s)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_s
+
+
+_shared: Dict[str, TokenBucket] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(app_id: str) -> TokenBucket:
+    """Retorna o bucket do processo para `app_id` (criado sob demanda, 2000/h)."""
+    with _shared_lock:
+        bucket = _shared.get(app_id)
+        if bucket is None:
+            bucket = _shared[app_id] = TokenBucket.per_hour()
+        return bucket
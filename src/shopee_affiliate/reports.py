@@ -0,0 +1,543 @@
+"""Utilitários para exportações grandes do conversionReport.
+
+O conversionReport é paginado por `scrollId` (válido por 30 segundos), então
+uma cadeia de scroll é necessariamente serial. Para exportar períodos longos
+mais rápido, o intervalo [start, end] é dividido em sub-janelas
+(`split_time_window`) e cada uma percorre sua própria cadeia em paralelo; os
+resultados são intercalados num único fluxo (`merge_threaded`/`merge_async`).
+O rate limit continua sendo respeitado porque todas as cadeias usam o mesmo
+transport (e portanto o mesmo `RateLimiter`).
+
+`sync_conversion_report` guarda um watermark (maior purchaseTime visto) e a
+cada execução lê só o delta desde ele, menos uma margem de sobreposição.
+
+`export_conversion_report` percorre janelas fixas em série e grava um
+checkpoint após cada página, para que uma exportação interrompida continue de
+onde parou em vez de recomeçar (scrollIds não podem ser reaproveitados).
+
+O partnerOrderReport (contas MCN) é paginado por `searchNextToken`; os helpers
+`partner_*` extraem cursor e orders das suas páginas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Marca de fim de um produtor na fila compartilhada.
+_DONE = object()
+
+# Janela padrão do export com checkpoint: uma falha custa no máximo
+# re-consultar um dia.
+DEFAULT_EXPORT_WINDOW_S = 24 * 60 * 60
+
+# Sync incremental: histórico lido na primeira execução e margem re-lida a
+# cada execução para capturar mudanças de status tardias.
+DEFAULT_SYNC_LOOKBACK_S = 90 * 24 * 60 * 60
+DEFAULT_SYNC_OVERLAP_S = 3 * 24 * 60 * 60
+
+
+def conversion_page_cursor(resp: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """Extrai (hasNextPage, scrollId) de uma página do conversionReport."""
+    data = resp.get("data", {}).get("conversionReport", {})
+    page_info = data.get("pageInfo", {}) if isinstance(data, dict) else {}
+    return bool(page_info.get("hasNextPage")), page_info.get("scrollId")
+
+
+def conversion_next_scroll_id(resp: Dict[str, Any]) -> Optional[str]:
+    """scrollId da próxima página, ou None se esta for a última."""
+    has_next, scroll_id = conversion_page_cursor(resp)
+    return scroll_id if has_next else None
+
+
+def partner_next_token(resp: Dict[str, Any]) -> Optional[str]:
+    """`searchNextToken` de uma página do partnerOrderReport (None/"" = fim)."""
+    data = (resp.get("data") or {}).get("partnerOrderReport") or {}
+    page_info = data.get("searchNextPageInfo") or {}
+    return page_info.get("searchNextToken") or None
+
+
+def partner_page_orders(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Orders (nodes) de uma página do partnerOrderReport."""
+    data = (resp.get("data") or {}).get("partnerOrderReport") or {}
+    return data.get("nodes") or []
+
+
+# Regras de parada: `next_cursor(resp, cursor, nodes)` devolve o cursor da
+# próxima página ou None para parar. Os caminhos com e sem streaming usam a
+# mesma função, então devolvem as mesmas páginas para a mesma janela.
+
+
+def conversion_next_cursor(
+    resp: Dict[str, Any], cursor: Optional[str], nodes: int
+) -> Optional[str]:
+    """Segue o scrollId enquanto `hasNextPage`, mesmo após uma página vazia."""
+    return conversion_next_scroll_id(resp)
+
+
+def partner_next_cursor(
+    resp: Dict[str, Any], token: Optional[str], nodes: int
+) -> Optional[str]:
+    """Para com token vazio ou repetido, ou numa página sem nodes."""
+    next_token = partner_next_token(resp)
+    if not next_token or next_token == token or not nodes:
+        return None
+    return next_token
+
+
+# Campos da conversão (node) copiados para cada order achatado.
+ORDER_CONTEXT_FIELDS = ("purchaseTime", "conversionId", "conversionStatus")
+
+
+def conversion_page_orders(resp: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Orders de uma página do conversionReport, achatados.
+
+    Cada order recebe `purchaseTime`, `conversionId` e `conversionStatus` da
+    conversão (node) a que pertence, já que o achatamento perderia esse
+    contexto.
+    """
+    for node in conversion_page_nodes(resp):
+        yield from conversion_node_orders(node)
+
+
+def conversion_page_nodes(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Nodes (conversões) de uma página do conversionReport."""
+    data = (resp.get("data") or {}).get("conversionReport") or {}
+    return (data.get("nodes") or []) if isinstance(data, dict) else []
+
+
+def conversion_node_orders(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Orders de um único node (conversão), com o contexto copiado.
+
+    Cada order é uma cópia rasa: o dict da resposta não é alterado e campos
+    que o próprio order já traz têm precedência sobre os da conversão.
+    """
+    context = {key: node[key] for key in ORDER_CONTEXT_FIELDS if key in node}
+    for order in node.get("orders") or []:
+        flat = dict(order)
+        for key, value in context.items():
+            flat.setdefault(key, value)
+        yield flat
+
+
+def split_time_window(start: int, end: int, shards: int) -> List[Tuple[int, int]]:
+    """Divide [start, end] (timestamps em segundos) em até `shards` janelas.
+
+    Janelas vizinhas compartilham o limite (o `end` de uma é o `start` da
+    próxima), então nenhuma conversão fica de fora independentemente de a API
+    tratar o fim como inclusivo; a duplicata eventual na fronteira é removida
+    por `dedupe_orders`.
+    """
+    if shards < 1:
+        raise ValueError("shards deve ser >= 1")
+    if end < start:
+        raise ValueError("purchase_time_end deve ser >= purchase_time_start")
+
+    shards = min(shards, max(end - start, 1))
+    step = (end - start) / shards
+    bounds = [start + round(step * i) for i in range(shards)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+
+def dedupe_orders(
+    orders: Iterable[Dict[str, Any]], seen: Optional[set] = None
+) -> Iterator[Dict[str, Any]]:
+    """Remove orders repetidos (mesmo `orderId`), mantendo a primeira ocorrência.
+
+    `seen` permite compartilhar os ids já emitidos entre várias chamadas.
+    """
+    seen = set() if seen is None else seen
+    for order in orders:
+        order_id = order.get("orderId")
+        if order_id is not None:
+            if order_id in seen:
+                continue
+            seen.add(order_id)
+        yield order
+
+
+def merge_threaded(
+    producers: Sequence[Callable[[], Iterable[T]]],
+    *,
+    max_workers: Optional[int] = None,
+    queue_size: int = 8,
+) -> Iterator[T]:
+    """Consome vários iteráveis em threads e intercala os itens num só fluxo.
+
+    A fila é limitada (`queue_size`): produtores rápidos esperam o consumidor,
+    então a memória não cresce com o tamanho da exportação. A primeira exceção
+    de um produtor é relançada no consumidor; fechar o gerador interrompe os
+    produtores.
+    """
+    if not producers:
+        return
+    items: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(producer: Callable[[], Iterable[T]]) -> None:
+        try:
+            for item in producer():
+                if not put(item):
+                    return
+        except Exception as exc:  # noqa: BLE001 - relançado no consumidor
+            put(_Failure(exc))
+        finally:
+            put(_DONE)
+
+    workers = max_workers or len(producers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shopee-shard")
+    try:
+        for producer in producers:
+            pool.submit(run, producer)
+        pending = len(producers)
+        while pending:
+            item = items.get()
+            if item is _DONE:
+                pending -= 1
+            elif isinstance(item, _Failure):
+                raise item.exc
+            else:
+                yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def merge_async(
+    producers: Sequence[Callable[[], AsyncIterable[T]]],
+    *,
+    max_workers: Optional[int] = None,
+    queue_size: int = 8,
+) -> AsyncIterator[T]:
+    """Versão asyncio de `merge_threaded` (uma task por produtor)."""
+    if not producers:
+        return
+    items: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+    semaphore = asyncio.Semaphore(max_workers or len(producers))
+
+    async def run(producer: Callable[[], AsyncIterable[T]]) -> None:
+        try:
+            async with semaphore:
+                async for item in producer():
+                    await items.put(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - relançado no consumidor
+            await items.put(_Failure(exc))
+        await items.put(_DONE)
+
+    tasks = [asyncio.ensure_future(run(producer)) for producer in producers]
+    try:
+        pending = len(tasks)
+        while pending:
+            item = await items.get()
+            if item is _DONE:
+                pending -= 1
+            elif isinstance(item, _Failure):
+                raise item.exc
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _write_json_atomic(path: str, obj: Any) -> None:
+    """Grava JSON de forma atômica (arquivo temporário + `os.replace`)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".state-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(obj, fh, separators=(",", ":"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+@dataclass
+class ExportCheckpoint:
+    """Estado persistido de `export_conversion_report`.
+
+    - `completed_until`: fim da última janela concluída (None = nenhuma)
+    - `emitted_order_ids`: orderIds da fronteira com a janela anterior, que
+      podem reaparecer na atual
+
+    Os orderIds entregues na janela em andamento ficam no diário
+    `<state_path>.ids` (ver `_append_journal`): cada página acrescenta só os
+    ids novos, em vez de regravar a lista inteira.
+    """
+
+    purchase_time_start: int
+    purchase_time_end: int
+    window_s: int
+    completed_until: Optional[int] = None
+    emitted_order_ids: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ExportCheckpoint"]:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls(**json.load(fh))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: str) -> None:
+        _write_json_atomic(path, asdict(self))
+
+
+def _journal_path(state_path: str) -> str:
+    return f"{state_path}.ids"
+
+
+def _append_journal(path: str, entries: List[Tuple[int, Any, bool]]) -> None:
+    """Acrescenta `[fim da janela, orderId, fronteira]` ao diário (com fsync)."""
+    if not entries:
+        return
+    lines = "".join(json.dumps(list(e), separators=(",", ":")) + "\n" for e in entries)
+    with open(path, "ab+") as fh:
+        # Uma queda no meio da escrita deixa a última linha sem "\n": fecha-a
+        # antes de acrescentar, para não colar o primeiro registro nela.
+        if fh.seek(0, os.SEEK_END) > 0:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                lines = "\n" + lines
+        fh.write(lines.encode("utf-8"))
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _read_journal(path: str, window_end: int) -> Tuple[set, set]:
+    """(ids entregues, ids de fronteira) da janela `window_end` no diário.
+
+    Linhas de outras janelas (diário não truncado após uma janela concluída)
+    e uma última linha incompleta (queda no meio da escrita) são ignoradas.
+    """
+    emitted: set = set()
+    boundary: set = set()
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    end, order_id, is_boundary = json.loads(line)
+                except ValueError:  # linha incompleta
+                    continue
+                if end != window_end:
+                    continue
+                emitted.add(order_id)
+                if is_boundary:
+                    boundary.add(order_id)
+    except FileNotFoundError:
+        pass
+    return emitted, boundary
+
+
+def export_conversion_report(
+    client: Any,
+    purchase_time_start: int,
+    purchase_time_end: int,
+    state_path: str,
+    *,
+    window_s: int = DEFAULT_EXPORT_WINDOW_S,
+    limit: int = 500,
+    prefetch: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Exporta orders do conversionReport com checkpoint em `state_path`.
+
+    O período é percorrido em janelas de `window_s` segundos. Os orderIds de
+    cada página vão para o diário após o chamador consumi-la, e o checkpoint
+    é gravado ao fim de cada janela; ao rodar de novo com o mesmo
+    `state_path`, janelas concluídas são puladas e a janela interrompida é
+    re-consultada sem reemitir os orderIds já entregues. A janela interrompida
+    recomeça do início porque a API não documenta a ordem dos resultados.
+    A garantia é "pelo menos uma vez" apenas para a página que estava sendo
+    processada no momento da falha.
+
+    `client` é um `ShopeeAffiliateClient` (usa `iter_conversion_report_pages`).
+    """
+    if window_s < 1:
+        raise ValueError("window_s deve ser >= 1")
+    state = ExportCheckpoint.load(state_path)
+    journal = _journal_path(state_path)
+    params = (purchase_time_start, purchase_time_end, window_s)
+    if state is None:
+        state = ExportCheckpoint(*params)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(journal)  # diário órfão de outra exportação
+        state.save(state_path)
+    elif (state.purchase_time_start, state.purchase_time_end, state.window_s) != params:
+        raise ValueError(
+            f"checkpoint {state_path!r} pertence a outra exportação "
+            f"({state.purchase_time_start}-{state.purchase_time_end}, "
+            f"window_s={state.window_s})"
+        )
+
+    shards = -(-(purchase_time_end - purchase_time_start) // window_s)
+    for start, end in split_time_window(
+        purchase_time_start, purchase_time_end, max(shards, 1)
+    ):
+        if state.completed_until is not None and end <= state.completed_until:
+            continue
+
+        emitted, boundary = _read_journal(journal, end)
+        emitted.update(state.emitted_order_ids)
+        for resp in client.iter_conversion_report_pages(
+            start, end, limit=limit, prefetch=prefetch
+        ):
+            entries: List[Tuple[int, Any, bool]] = []
+            for order in conversion_page_orders(resp):
+                order_id = order.get("orderId")
+                purchase_time = order.get("purchaseTime")
+                # Fronteira antes do pulo: um id já entregue (antes de uma
+                # queda) ainda precisa seguir para a próxima janela.
+                on_boundary = (
+                    order_id is not None
+                    and purchase_time is not None
+                    and purchase_time >= end
+                )
+                if order_id is not None and order_id in emitted:
+                    if on_boundary and order_id not in boundary:
+                        boundary.add(order_id)
+                        entries.append((end, order_id, True))
+                    continue
+                if order_id is not None:
+                    emitted.add(order_id)
+                    if on_boundary:
+                        boundary.add(order_id)
+                    entries.append((end, order_id, on_boundary))
+                yield order
+
+            _append_journal(journal, entries)
+
+        # Janela concluída: só os ids da fronteira podem reaparecer na próxima.
+        state.completed_until = end
+        state.emitted_order_ids = sorted(boundary, key=str)
+        state.save(state_path)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(journal)
+
+
+@dataclass
+class SyncState:
+    """Estado persistido de `sync_conversion_report`.
+
+    `watermark` é o maior purchaseTime já sincronizado (None = nunca rodou).
+    """
+
+    watermark: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: str) -> "SyncState":
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls(**json.load(fh))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path: str) -> None:
+        _write_json_atomic(path, asdict(self))
+
+
+@dataclass
+class SyncResult:
+    purchase_time_start: int
+    purchase_time_end: int
+    orders: int
+    watermark: int
+
+
+def sync_conversion_report(
+    client: Any,
+    state_path: str,
+    sink: Callable[[List[Dict[str, Any]]], Any],
+    *,
+    initial_lookback_s: int = DEFAULT_SYNC_LOOKBACK_S,
+    overlap_s: int = DEFAULT_SYNC_OVERLAP_S,
+    now: Optional[int] = None,
+    limit: int = 500,
+    prefetch: int = 0,
+) -> SyncResult:
+    """Sincronização incremental do conversionReport.
+
+    Consulta só [watermark - overlap_s, now] (na primeira execução,
+    [now - initial_lookback_s, now]) e entrega os orders de cada página a
+    `sink`, que deve fazer upsert (ex.: `store.OrderStore.upsert_orders`):
+    a margem de sobreposição re-lê conversões recentes para capturar mudanças
+    de status tardias, então o mesmo order pode chegar de novo.
+
+    O watermark (maior purchaseTime visto) só é gravado em `state_path` depois
+    que o período inteiro foi entregue ao sink; se a execução falhar, a
+    próxima repete o mesmo delta.
+    """
+    end = int(time.time()) if now is None else int(now)
+    state = SyncState.load(state_path)
+    if state.watermark is None:
+        start = end - initial_lookback_s
+    else:
+        start = min(state.watermark - overlap_s, end)
+
+    count = 0
+    max_seen = state.watermark
+    for resp in client.iter_conversion_report_pages(
+        start, end, limit=limit, prefetch=prefetch
+    ):
+        orders = list(conversion_page_orders(resp))
+        if not orders:
+            continue
+        sink(orders)
+        count += len(orders)
+        for order in orders:
+            purchase_time = order.get("purchaseTime")
+            if purchase_time is not None and (
+                max_seen is None or purchase_time > max_seen
+            ):
+                max_seen = purchase_time
+
+    # Sem nenhum order, o período até `end` já foi coberto.
+    state.watermark = min(max_seen if max_seen is not None else end, end)
+    state.save(state_path)
+    return SyncResult(start, end, count, state.watermark)
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
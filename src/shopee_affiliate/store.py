@@ -0,0 +1,235 @@
+"""Store SQLite local para orders do conversionReport.
+
+Guarda a saída de `iter_conversion_report_orders` (ou de
+`reports.sync_conversion_report`) em duas tabelas normalizadas, para que
+análises rodem em SQL local em vez de baixar tudo de novo da API:
+
+- `orders`: um registro por orderId (conversão, status, purchaseTime);
+- `order_items`: os itens de cada order, na ordem em que a API os devolve.
+
+A gravação é upsert: reingerir um order (ex.: status mudou) substitui o
+registro e todos os seus itens. Cada chamada de `upsert_orders` roda numa
+única transação, com `executemany` em lotes.
+
+Uso:
+
+    store = OrderStore("conversions.db")
+    store.upsert_orders(client.iter_conversion_report_orders(start, end))
+    store.commission_by_shop(since=now - 7 * 86400)
+
+    # incremental: o store como sink do sync
+    sync_conversion_report(client, "sync.json", store.upsert_orders)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .coerce import to_float, to_int, to_text
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS orders (
+        order_id TEXT PRIMARY KEY,
+        conversion_id TEXT,
+        purchase_time INTEGER,
+        conversion_status TEXT,
+        order_status TEXT,
+        shop_type TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_items (
+        order_id TEXT NOT NULL REFERENCES orders (order_id) ON DELETE CASCADE,
+        line_no INTEGER NOT NULL,
+        item_id INTEGER,
+        item_name TEXT,
+        shop_id INTEGER,
+        shop_name TEXT,
+        qty INTEGER,
+        item_price REAL,
+        item_total_commission REAL,
+        item_seller_commission REAL,
+        item_seller_commission_rate REAL,
+        global_category_lv1_name TEXT,
+        global_category_lv2_name TEXT,
+        global_category_lv3_name TEXT,
+        image_url TEXT,
+        PRIMARY KEY (order_id, line_no)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_orders_purchase_time ON orders (purchase_time)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_conversion_status"
+    " ON orders (conversion_status)",
+    "CREATE INDEX IF NOT EXISTS ix_order_items_item_id ON order_items (item_id)",
+    "CREATE INDEX IF NOT EXISTS ix_order_items_shop_id ON order_items (shop_id)",
+)
+
+_UPSERT_ORDER = (
+    "INSERT INTO orders (order_id, conversion_id, purchase_time,"
+    " conversion_status, order_status, shop_type) VALUES (?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(order_id) DO UPDATE SET conversion_id = excluded.conversion_id,"
+    " purchase_time = excluded.purchase_time,"
+    " conversion_status = excluded.conversion_status,"
+    " order_status = excluded.order_status, shop_type = excluded.shop_type"
+)
+
+_INSERT_ITEM = (
+    "INSERT INTO order_items (order_id, line_no, item_id, item_name, shop_id,"
+    " shop_name, qty, item_price, item_total_commission, item_seller_commission,"
+    " item_seller_commission_rate, global_category_lv1_name,"
+    " global_category_lv2_name, global_category_lv3_name, image_url)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _order_row(order: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        str(order["orderId"]),
+        to_text(order.get("conversionId")),
+        to_int(order.get("purchaseTime")),
+        to_text(order.get("conversionStatus")),
+        to_text(order.get("orderStatus")),
+        to_text(order.get("shopType")),
+    )
+
+
+def _item_rows(order_id: str, items: Iterable[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    return [
+        (
+            order_id,
+            line_no,
+            to_int(item.get("itemId")),
+            item.get("itemName"),
+            to_int(item.get("shopId")),
+            item.get("shopName"),
+            to_int(item.get("qty")),
+            to_float(item.get("itemPrice")),
+            to_float(item.get("itemTotalCommission")),
+            to_float(item.get("itemSellerCommission")),
+            to_float(item.get("itemSellerCommissionRate")),
+            item.get("globalCategoryLv1Name"),
+            item.get("globalCategoryLv2Name"),
+            item.get("globalCategoryLv3Name"),
+            item.get("imageUrl"),
+        )
+        for line_no, item in enumerate(items)
+    ]
+
+
+class OrderStore:
+    """Orders/itens do conversionReport num arquivo SQLite.
+
+    Args:
+        path: arquivo SQLite (`":memory:"` para testes).
+        batch_size: orders por `executemany` dentro da transação de
+            `upsert_orders` (limita a memória com iteráveis grandes).
+    """
+
+    def __init__(self, path: Union[str, Path], *, batch_size: int = 5_000):
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser >= 1")
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def upsert_orders(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """Insere/atualiza orders (e substitui seus itens) numa única transação.
+
+        Orders sem `orderId` são ignorados. Retorna quantos foram gravados.
+
+        Também serve de `sink` para `reports.sync_conversion_report`.
+        """
+        total = 0
+        iterator = iter(orders)
+        with self._lock, self._conn:
+            while True:
+                chunk = list(islice(iterator, self.batch_size))
+                if not chunk:
+                    break
+                # Mesmo orderId repetido no lote: vale a última versão.
+                batch = list(
+                    {
+                        str(o["orderId"]): o
+                        for o in chunk
+                        if o.get("orderId") is not None
+                    }.values()
+                )
+                order_rows = [_order_row(o) for o in batch]
+                order_ids = [(row[0],) for row in order_rows]
+                self._conn.executemany(_UPSERT_ORDER, order_rows)
+                self._conn.executemany(
+                    "DELETE FROM order_items WHERE order_id = ?", order_ids
+                )
+                self._conn.executemany(
+                    _INSERT_ITEM,
+                    [
+                        row
+                        for (order_id,), order in zip(order_ids, batch)
+                        for row in _item_rows(order_id, order.get("items") or [])
+                    ],
+                )
+                total += len(batch)
+        return total
+
+    def count(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()
+        return int(n)
+
+    def commission_by_shop(
+        self,
+        *,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        conversion_status: Optional[str] = None,
+    ) -> List[Tuple[Optional[int], Optional[str], float]]:
+        """Soma de `itemTotalCommission` por loja, da maior para a menor.
+
+        Filtra por purchaseTime em [since, until] e, opcionalmente, por
+        conversionStatus. Retorna (shop_id, shop_name, comissão).
+        """
+        clauses = []
+        params: List[Any] = []
+        if since is not None:
+            clauses.append("o.purchase_time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("o.purchase_time <= ?")
+            params.append(until)
+        if conversion_status is not None:
+            clauses.append("o.conversion_status = ?")
+            params.append(conversion_status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT i.shop_id, MAX(i.shop_name),"
+            " COALESCE(SUM(i.item_total_commission), 0)"
+            " FROM order_items i JOIN orders o ON o.order_id = i.order_id"
+            f"{where} GROUP BY i.shop_id ORDER BY 3 DESC"
+        )
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql, params)]
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Consulta SQL livre sobre as tabelas `orders`/`order_items`."""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql, tuple(params))]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "OrderStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
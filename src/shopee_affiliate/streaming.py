@@ -0,0 +1,94 @@
+"""Decodificação incremental de respostas paginadas (`data.<campo>.nodes`).
+
+`resp.json()` só devolve algo depois de ler o corpo inteiro e montar a árvore
+completa: com `limit=500` e listas de `items`, o pico de memória é a página
+toda. `NodeStreamDecoder` recebe o corpo em pedaços (ver
+`transport.request_stream`) e devolve cada node assim que ele termina de
+chegar, com `json.JSONDecoder.raw_decode`; o pico passa a ser um pedaço +
+um node.
+
+O que vem fora do array `nodes` (pageInfo, errors...) é montado em `finish()`
+como uma resposta normal com `nodes: []`, para reaproveitar os mesmos helpers
+das respostas não-streaming (ex.: `reports.conversion_page_cursor`).
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List
+
+_NODES_START = re.compile(r'"nodes"\s*:\s*\[')
+_SEPARATORS = " \t\r\n,"
+
+
+class NodeStreamDecoder:
+    """Extrai nodes de `{"data": {<campo>: {"nodes": [...], ...}}}` em streaming.
+
+    Uso:
+
+        decoder = NodeStreamDecoder()
+        for chunk in transport.request_stream(query, variables):
+            for node in decoder.feed(chunk):
+                ...
+        envelope = decoder.finish()  # resposta sem os nodes (pageInfo, errors)
+    """
+
+    def __init__(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._prefix = ""
+        # "prefix" (antes de `"nodes":[`), "nodes" (dentro do array), "rest"
+        self._state = "prefix"
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Acrescenta bytes do corpo; retorna os nodes completados por eles."""
+        self._buf += self._utf8.decode(data)
+        return self._drain()
+
+    def finish(self) -> Dict[str, Any]:
+        """Fecha o stream e retorna a resposta com `nodes: []`.
+
+        Se o corpo não tinha array `nodes` (ex.: `data: null` com `errors`),
+        retorna o JSON inteiro. Corpo truncado no meio dos nodes levanta
+        `ValueError`.
+        """
+        self._buf += self._utf8.decode(b"", final=True)
+        leftover = self._drain()
+        if self._state == "prefix":
+            return json.loads(self._buf)
+        if self._state == "nodes" or leftover:
+            raise ValueError("resposta truncada no meio do array nodes")
+        return json.loads(self._prefix + "]" + self._buf)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        if self._state == "prefix":
+            match = _NODES_START.search(self._buf)
+            if match is None:
+                return out
+            self._prefix = self._buf[: match.end()]
+            self._buf = self._buf[match.end() :]
+            self._state = "nodes"
+
+        if self._state == "nodes":
+            buf = self._buf
+            pos = 0
+            while True:
+                while pos < len(buf) and buf[pos] in _SEPARATORS:
+                    pos += 1
+                if pos >= len(buf):
+                    break
+                if buf[pos] == "]":
+                    pos += 1
+                    self._state = "rest"
+                    break
+                try:
+                    node, pos = self._json.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break  # node incompleto: espera o próximo pedaço
+                out.append(node)
+            self._buf = buf[pos:]
+        return out
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import time
 import random
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional
 
 import requests
 
-from .auth import build_authorization_header
+from .auth import Signer
+from .codec import JsonCodec, get_codec
+from .ratelimit import RateLimiter, shared_limiter
+
+try:  # dependência opcional (extra "async")
+    import httpx
+except ImportError:  # pragma: no cover - depende do ambiente
+    httpx = None  # type: ignore[assignment]
+
+
+DEFAULT_BASE_URL = "https://open-api.affiliate.shopee.com.br/graphql"
+
+# Tamanho dos pedaços lidos do corpo em `request_stream`.
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 @dataclass
@@ -18,49 +33,118 @@ class RetryConfig:
     retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
 
 
+@functools.lru_cache(maxsize=256)
+def _encode_query(query: str) -> bytes:
+    # Documentos são constantes (ver queries.py): serializa e codifica em
+    # UTF-8 cada um uma vez; o prefixo `{"query":...` vira bytes prontos.
+    return b'{"query":' + json.dumps(query).encode("utf-8")
+
+
+_STDLIB_CODEC = JsonCodec()
+
+
+def _encode_payload(
+    query: str,
+    variables: Optional[Dict[str, Any]],
+    codec: JsonCodec = _STDLIB_CODEC,
+) -> bytes:
+    """Payload canônico (UTF-8), idêntico a `json.dumps(payload, separators=(",", ":"))`.
+
+    Só o dict `variables` é serializado a cada chamada (por `codec`); os mesmos
+    bytes são assinados e enviados.
+    """
+    encoded = _encode_query(query)
+    if variables:
+        encoded += b',"variables":' + codec.dumps(variables)
+    return encoded + b"}"
+
+
+def _backoff_s(retry: RetryConfig, attempt: int) -> float:
+    """Backoff exponencial + jitter leve (±15%)."""
+    base = retry.backoff_base_s * (2 ** (attempt - 1))
+    jitter = (0.15 * base) * (0.5 - random.random()) * 2
+    return max(0.0, base + jitter)
+
+
+def _retry_after_s(headers: Mapping[str, str]) -> float | None:
+    ra = headers.get("Retry-After")
+    if not ra:
+        return None
+    try:
+        return float(ra)
+    except ValueError:
+        return None
+
+
 class ShopeeAffiliateTransport:
     """Camada HTTP + autenticação.
 
     Responsabilidades:
-    - montar payload JSON canônico (separators=(',', ':'))
+    - montar payload JSON canônico (separators=(',', ':')) e decodificar a
+      resposta com o codec JSON (`codec`; padrão: orjson se instalado)
     - gerar header Authorization
     - executar POST com timeout
     - retry simples com backoff
+    - rate limiting preventivo (token bucket; padrão: compartilhado por AppId)
     """
 
     def __init__(
         self,
         app_id: str,
         app_secret: str,
-        base_url: str = "https://open-api.affiliate.shopee.com.br/graphql",
+        base_url: str = DEFAULT_BASE_URL,
         *,
         timeout_s: float = 30.0,
         retry: RetryConfig | None = None,
         session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
+        codec: JsonCodec | str | None = None,
     ):
         self.app_id = app_id
         self.app_secret = app_secret
+        self.signer = Signer(app_id, app_secret)
         self.base_url = base_url
         self.timeout_s = timeout_s
         self.retry = retry or RetryConfig()
         self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter or shared_limiter(app_id)
+        self.codec = get_codec(codec)
 
     def request(
         self, query: str, variables: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {"query": query}
-        if variables:
-            payload["variables"] = variables
+        resp = self._send(_encode_payload(query, variables, self.codec))
+        return self.codec.loads(resp.content)
 
-        payload_str = json.dumps(payload, separators=(",", ":"))
+    def request_stream(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Como `request`, mas entrega o corpo em pedaços de bytes sem decodificar.
+
+        Retry/backoff valem até o status HTTP chegar; falhas no meio do corpo
+        são propagadas. Use com `streaming.NodeStreamDecoder`.
+        """
+        resp = self._send(_encode_payload(query, variables, self.codec), stream=True)
+        try:
+            yield from resp.iter_content(chunk_size=chunk_size)
+        finally:
+            resp.close()
+
+    def _send(self, payload: bytes, *, stream: bool = False) -> requests.Response:
+        extra: Dict[str, Any] = {"stream": True} if stream else {}
 
         last_exc: Exception | None = None
         for attempt in range(1, self.retry.max_attempts + 1):
+            # Cada tentativa conta na cota da API
+            self.rate_limiter.acquire()
+
             # Recalcula Authorization a cada tentativa (timestamp novo)
             headers = {
-                "Authorization": build_authorization_header(
-                    self.app_id, self.app_secret, payload_str
-                ),
+                "Authorization": self.signer.authorization_header(payload),
                 "Content-Type": "application/json",
             }
 
@@ -68,8 +152,9 @@ class ShopeeAffiliateTransport:
                 resp = self.session.post(
                     self.base_url,
                     headers=headers,
-                    data=payload_str,
+                    data=payload,
                     timeout=self.timeout_s,
+                    **extra,
                 )
 
                 # Rate limit / transient errors
@@ -77,36 +162,145 @@ class ShopeeAffiliateTransport:
                     resp.status_code in self.retry.retry_statuses
                     and attempt < self.retry.max_attempts
                 ):
-                    sleep_s: float | None = None
-
                     # Respeita Retry-After quando presente
-                    ra = resp.headers.get("Retry-After")
-                    if ra:
-                        try:
-                            sleep_s = float(ra)
-                        except ValueError:
-                            sleep_s = None
-
+                    sleep_s = _retry_after_s(resp.headers)
                     if sleep_s is None:
-                        # backoff exponencial + jitter leve
-                        base = self.retry.backoff_base_s * (2 ** (attempt - 1))
-                        jitter = (0.15 * base) * (0.5 - random.random()) * 2
-                        sleep_s = max(0.0, base + jitter)
+                        sleep_s = _backoff_s(self.retry, attempt)
 
+                    if stream:
+                        resp.close()
                     time.sleep(sleep_s)
                     continue
 
+                if stream and resp.status_code >= 400:
+                    resp.close()
                 resp.raise_for_status()
-                return resp.json()
+                return resp
 
             except requests.RequestException as e:
                 last_exc = e
                 if attempt < self.retry.max_attempts:
-                    base = self.retry.backoff_base_s * (2 ** (attempt - 1))
-                    jitter = (0.15 * base) * (0.5 - random.random()) * 2
-                    time.sleep(max(0.0, base + jitter))
+                    time.sleep(_backoff_s(self.retry, attempt))
                     continue
                 raise
 
         # Não deveria chegar aqui
         raise RuntimeError("Falha inesperada no transport") from last_exc
+
+
+class AsyncShopeeAffiliateTransport:
+    """Versão asyncio do `ShopeeAffiliateTransport` (baseada em `httpx`).
+
+    Mesma assinatura, payload canônico, retry e respeito a `Retry-After`,
+    mas sem bloquear o event loop: um único processo pode manter centenas de
+    chamadas em andamento.
+
+    Requer o extra opcional `async` (`pip install "shopee-afiliados-docs[async]"`),
+    a menos que um `httpx.AsyncClient` já configurado seja passado em `client`.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        timeout_s: float = 30.0,
+        retry: RetryConfig | None = None,
+        client: "httpx.AsyncClient | None" = None,
+        rate_limiter: RateLimiter | None = None,
+        codec: JsonCodec | str | None = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncShopeeAffiliateTransport requer httpx "
+                '(pip install "shopee-afiliados-docs[async]")'
+            )
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.signer = Signer(app_id, app_secret)
+        self.base_url = base_url
+        self.timeout_s = timeout_s
+        self.retry = retry or RetryConfig()
+        self.client = client or httpx.AsyncClient()
+        self.rate_limiter = rate_limiter or shared_limiter(app_id)
+        self.codec = get_codec(codec)
+
+    async def request(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        resp = await self._send(_encode_payload(query, variables, self.codec))
+        return self.codec.loads(resp.content)
+
+    async def request_stream(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Async generator equivalente a `ShopeeAffiliateTransport.request_stream`."""
+        resp = await self._send(
+            _encode_payload(query, variables, self.codec), stream=True
+        )
+        try:
+            async for chunk in resp.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    async def _send(self, payload: bytes, *, stream: bool = False) -> "httpx.Response":
+        last_exc: Exception | None = None
+        for attempt in range(1, self.retry.max_attempts + 1):
+            await self.rate_limiter.acquire_async()
+
+            headers = {
+                "Authorization": self.signer.authorization_header(payload),
+                "Content-Type": "application/json",
+            }
+
+            try:
+                request = self.client.build_request(
+                    "POST",
+                    self.base_url,
+                    headers=headers,
+                    content=payload,
+                    timeout=self.timeout_s,
+                )
+                resp = await self.client.send(request, stream=stream)
+
+                if (
+                    resp.status_code in self.retry.retry_statuses
+                    and attempt < self.retry.max_attempts
+                ):
+                    sleep_s = _retry_after_s(resp.headers)
+                    if sleep_s is None:
+                        sleep_s = _backoff_s(self.retry, attempt)
+
+                    if stream:
+                        await resp.aclose()
+                    await asyncio.sleep(sleep_s)
+                    continue
+
+                if stream and resp.status_code >= 400:
+                    await resp.aclose()
+                resp.raise_for_status()
+                return resp
+
+            except httpx.HTTPError as e:
+                last_exc = e
+                if attempt < self.retry.max_attempts:
+                    await asyncio.sleep(_backoff_s(self.retry, attempt))
+                    continue
+                raise
+
+        raise RuntimeError("Falha inesperada no transport") from last_exc
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncShopeeAffiliateTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from shopee_affiliate import analytics  # noqa: E402
+
+
+def _orders():
+    def item(shop, category, price, qty, total, seller):
+        return {
+            "shopId": {"A": 1, "B": 2, "C": 3}[shop],
+            "shopName": shop,
+            "globalCategoryLv1Name": category,
+            "itemPrice": price,
+            "qty": qty,
+            "itemTotalCommission": total,
+            "itemSellerCommission": seller,
+        }
+
+    return [
+        {
+            "orderId": "1",
+            "purchaseTime": 10,
+            "items": [
+                item("A", "Moda", "100.00", 2, "10.00", "4.00"),
+                item("B", "Casa", "50.00", 1, "5.00", None),
+            ],
+        },
+        {
+            "orderId": "2",
+            "purchaseTime": 20,
+            "items": [
+                item("A", "Casa", "20.00", 1, "1.00", "0.50"),
+                item("C", None, "", 1, "30.00", "30.00"),
+            ],
+        },
+    ]
+
+
+def test_totals_include_seller_vs_shopee_split():
+    frame = analytics.CommissionFrame.from_orders(_orders())
+
+    totals = frame.totals()
+
+    assert len(frame) == 4
+    assert totals["total_commission"] == pytest.approx(46.0)
+    assert totals["seller_commission"] == pytest.approx(34.5)
+    assert totals["shopee_commission"] == pytest.approx(11.5)
+    assert totals["gmv"] == pytest.approx(270.0)
+    assert totals["items"] == 4
+
+
+def test_sum_by_and_top_use_categorical_codes():
+    frame = analytics.CommissionFrame.from_orders(_orders())
+
+    assert frame.sum_by("shop") == [
+        ("3", "C", 30.0),
+        ("1", "A", 11.0),
+        ("2", "B", 5.0),
+    ]
+    assert frame.sum_by("category", "gmv") == [
+        ("Moda", "Moda", 200.0),
+        ("Casa", "Casa", 70.0),
+        ("", "", 0.0),
+    ]
+    assert frame.top("shop", n=2) == [("3", "C", 30.0), ("1", "A", 11.0)]
+    assert frame.top("shop", n=10) == frame.sum_by("shop")
+
+
+def test_shops_are_grouped_by_id_not_name():
+    def order(shop_id, name, total):
+        items = [{"shopId": shop_id, "shopName": name, "itemTotalCommission": total}]
+        return {"orderId": f"{shop_id}-{total}", "items": items}
+
+    frame = analytics.CommissionFrame.from_orders(
+        [
+            order(1, "Loja", "5.00"),
+            order(2, "Loja", "3.00"),  # outra loja, mesmo nome
+            order(1, "Loja Nova", "2.00"),  # loja 1 renomeada
+        ]
+    )
+
+    assert frame.sum_by("shop") == [("1", "Loja Nova", 7.0), ("2", "Loja", 3.0)]
+
+
+def test_percentiles_ignore_missing_values():
+    frame = analytics.CommissionFrame.from_orders(_orders())
+
+    p = frame.percentiles("total_commission", q=(0, 50, 100))
+
+    assert p == {0.0: 1.0, 50.0: 7.5, 100.0: 30.0}
+    empty = analytics.CommissionFrame.from_orders([])
+    assert math.isnan(empty.percentiles()[50.0])
+    assert empty.sum_by("shop") == []
+
+
+def test_invalid_key_or_value():
+    frame = analytics.CommissionFrame.from_orders(_orders())
+    with pytest.raises(ValueError):
+        frame.sum_by("brand")
+    with pytest.raises(ValueError):
+        frame.percentiles("price")
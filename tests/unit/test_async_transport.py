@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from shopee_affiliate import AsyncShopeeAffiliateClient
+from shopee_affiliate.transport import AsyncShopeeAffiliateTransport, RetryConfig
+
+httpx = pytest.importorskip("httpx")
+
+
+def _async_transport(handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncShopeeAffiliateTransport("1", "sec", client=client, **kwargs)
+
+
+def test_async_request_sends_canonical_payload():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    async def run():
+        async with _async_transport(handler) as transport:
+            return await transport.request("query{x}", {"a": 1})
+
+    assert asyncio.run(run()) == {"data": {"ok": True}}
+    assert seen[0].content == b'{"query":"query{x}","variables":{"a":1}}'
+    assert seen[0].headers["Authorization"].startswith("SHA256 Credential=1,")
+
+
+def test_async_request_retries_on_429(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(s):
+        sleeps.append(s)
+
+    monkeypatch.setattr("shopee_affiliate.transport.asyncio.sleep", fake_sleep)
+    statuses = [429, 200]
+
+    def handler(request):
+        return httpx.Response(
+            statuses.pop(0), headers={"Retry-After": "1"}, content=json.dumps({})
+        )
+
+    async def run():
+        async with _async_transport(handler, retry=RetryConfig()) as transport:
+            return await transport.request("query{x}")
+
+    assert asyncio.run(run()) == {}
+    assert sleeps == [1.0]
+
+
+def test_async_client_iterates_conversion_orders():
+    pages = [
+        {
+            "data": {
+                "conversionReport": {
+                    "nodes": [{"orders": [{"orderId": "1"}, {"orderId": "2"}]}],
+                    "pageInfo": {"hasNextPage": True, "scrollId": "s1"},
+                }
+            }
+        },
+        {
+            "data": {
+                "conversionReport": {
+                    "nodes": [{"orders": [{"orderId": "3"}]}],
+                    "pageInfo": {"hasNextPage": False, "scrollId": None},
+                }
+            }
+        },
+    ]
+
+    def handler(request):
+        return httpx.Response(200, json=pages.pop(0))
+
+    async def run():
+        client = AsyncShopeeAffiliateClient("1", "sec")
+        client.transport = _async_transport(handler)
+        async with client:
+            return [
+                o["orderId"]
+                async for o in client.iter_conversion_report_orders(0, 1, limit=2)
+            ]
+
+    assert asyncio.run(run()) == ["1", "2", "3"]
@@ -12,3 +12,25 @@ def test_build_authorization_header_contains_parts():
     assert header.startswith("SHA256 Credential=123")
     assert "Timestamp=1" in header
     assert "Signature=" in header
+
+
+def test_generate_signature_accepts_utf8_bytes():
+    payload = '{"query":"ç"}'
+    assert generate_signature("1", "secret", payload.encode(), 123) == (
+        generate_signature("1", "secret", payload, 123)
+    )
+
+
+def test_signer_matches_reference_formula_and_is_reusable():
+    import hashlib
+
+    from shopee_affiliate.auth import Signer
+
+    signer = Signer("123", "sec")
+    payload = b'{"query":"x","variables":{"a":1}}'
+    for ts in (1, 1700000000):
+        expected = hashlib.sha256(b"123%d" % ts + payload + b"sec").hexdigest()
+        assert signer.signature(payload, ts) == expected
+    assert signer.authorization_header(payload, timestamp=5) == (
+        build_authorization_header("123", "sec", payload, timestamp=5)
+    )
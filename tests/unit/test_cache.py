@@ -0,0 +1,106 @@
+from shopee_affiliate import ShopeeAffiliateClient
+from shopee_affiliate.cache import ShortLinkCache, normalize_link_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_link_key_is_canonical():
+    a = normalize_link_key("HTTPS://Shopee.com.br/p/1?b=2&a=1#frag", ["s1", "s2"])
+    b = normalize_link_key("https://shopee.com.br/p/1?a=1&b=2", ["s1", "s2"])
+    assert a == b
+    assert a != normalize_link_key("https://shopee.com.br/p/1?a=1&b=2", ["s2", "s1"])
+
+
+def test_cache_counts_hits_and_expires_entries():
+    clock = FakeClock()
+    cache = ShortLinkCache(ttl_s=10, clock=clock)
+
+    assert cache.get("https://a", None) is None
+    cache.set("https://a", None, "https://s/1")
+    assert cache.get("https://a", None) == "https://s/1"
+
+    clock.now += 11
+    assert cache.get("https://a", None) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ShortLinkCache(maxsize=2)
+    cache.set("https://a", None, "1")
+    cache.set("https://b", None, "2")
+    cache.get("https://a", None)
+    cache.set("https://c", None, "3")
+
+    assert cache.get("https://b", None) is None
+    assert cache.get("https://a", None) == "1"
+
+
+def test_disk_store_survives_new_instance(tmp_path):
+    path = tmp_path / "links.db"
+    ShortLinkCache(path).set("https://a", ["s1"], "https://s/1")
+
+    assert ShortLinkCache(path).get("https://a", ["s1"]) == "https://s/1"
+
+
+def test_disk_only_cache_serves_hits(tmp_path):
+    cache = ShortLinkCache(tmp_path / "links.db", maxsize=0)
+    cache.set("https://a", None, "https://s/1")
+
+    assert cache.get("https://a", None) == "https://s/1"
+    assert cache.get("https://a", None) == "https://s/1"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["memory_size"] == 0
+
+
+def test_disk_hit_only_touches_accessed_at_after_interval(tmp_path):
+    clock = FakeClock()
+    cache = ShortLinkCache(tmp_path / "links.db", maxsize=0, clock=clock)
+    cache.set("https://a", None, "https://s/1")
+
+    def accessed_at():
+        return cache._conn.execute("SELECT accessed_at FROM short_links").fetchone()[0]
+
+    clock.now += 60
+    cache.get("https://a", None)
+    assert accessed_at() == 1_000.0
+
+    clock.now += 3600
+    cache.get("https://a", None)
+    assert accessed_at() == clock.now
+
+
+def test_client_uses_cache_for_single_and_batch_links(monkeypatch):
+    cache = ShortLinkCache()
+    client = ShopeeAffiliateClient("1", "sec", short_link_cache=cache)
+    calls = []
+
+    def fake_request(query, variables=None):
+        calls.append(query)
+        if "generateBatchShortLink" in query:
+            links = [
+                {"originUrl": "https://b", "shortLink": "https://s/b", "success": True}
+            ]
+            return {"data": {"generateBatchShortLink": {"links": links}}}
+        return {"data": {"generateShortLink": {"shortLink": "https://s/a"}}}
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    client.generate_short_link("https://a")
+    again = client.generate_short_link("https://a")
+    batch = client.generate_short_links(["https://a", "https://b", "https://a"])
+    client.generate_short_links(["https://b"])
+
+    assert again["data"]["generateShortLink"]["shortLink"] == "https://s/a"
+    assert [r["shortLink"] for r in batch] == [
+        "https://s/a",
+        "https://s/b",
+        "https://s/a",
+    ]
+    assert len(calls) == 2
@@ -0,0 +1,174 @@
+import json
+import sqlite3
+
+import pytest
+
+from shopee_affiliate.catalog import FeedCatalog
+
+
+def _row(item_id, name="x", update_type=None):
+    return {
+        "columns": json.dumps({"itemid": item_id, "name": name}),
+        "updateType": update_type,
+    }
+
+
+def test_load_full_replaces_snapshot():
+    catalog = FeedCatalog(":memory:", key="itemid", batch_size=2)
+    catalog.load_full([_row(1), _row(2), _row(3)])
+    result = catalog.load_full([_row(2, "novo"), _row(4)], datafeed_id="f1")
+
+    assert (result.rows, result.upserted) == (2, 2)
+    assert catalog.count() == 2
+    assert catalog.get(2) == {"itemid": 2, "name": "novo"}
+    assert catalog.get(1) is None
+
+
+def test_apply_delta_inserts_updates_and_deletes_by_key():
+    catalog = FeedCatalog(":memory:", key="itemid", batch_size=2)
+    catalog.load_full([_row(1), _row(2), _row(3)], datafeed_id="full")
+
+    result = catalog.apply_delta(
+        [
+            _row(4, update_type="NEW"),
+            _row(2, "alterado", update_type="UPDATE"),
+            _row(3, update_type="DELETE"),
+            _row(9, update_type="DELETE"),
+            _row(5, update_type="NEW"),
+            _row(5, update_type="DELETE"),
+        ],
+        datafeed_id="d1",
+    )
+
+    assert (result.rows, result.upserted, result.deleted) == (6, 2, 1)
+    assert sorted(r[0] for r in catalog.execute("SELECT item_key FROM items")) == [
+        "1",
+        "2",
+        "4",
+    ]
+    assert catalog.get("2")["name"] == "alterado"
+
+    again = catalog.apply_delta([_row(1, update_type="DELETE")], datafeed_id="d1")
+    assert again.skipped
+    assert catalog.count() == 3
+
+
+def test_item_key_accepts_function_and_rejects_missing_key():
+    catalog = FeedCatalog(":memory:", key=lambda row: row["columns"].split(",")[0])
+    catalog.load_full([{"columns": "7,abc"}, {"columns": "8,def"}])
+    assert catalog.get("7") == "7,abc"
+
+    with pytest.raises(ValueError):
+        FeedCatalog(":memory:", key="itemid").load_full(
+            [{"columns": json.dumps({"id": 1})}]
+        )
+
+
+def test_download_does_not_lock_the_catalog(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    catalog = FeedCatalog(path, key="itemid", batch_size=2)
+    catalog.load_full([_row(1)], datafeed_id="f0")
+    other = sqlite3.connect(path, timeout=0.1)
+
+    def rows():
+        for i in range(2, 7):
+            # No meio do download, outro writer e leituras não esperam o lock.
+            other.execute("DELETE FROM applied_feeds WHERE datafeed_id = 'x'")
+            other.commit()
+            assert catalog.count() == 1
+            yield _row(i)
+
+    result = catalog.load_full(rows(), datafeed_id="f1")
+
+    assert result.rows == 5
+    assert catalog.count() == 5
+    assert catalog.execute("SELECT name FROM temp.sqlite_master") == []
+
+
+def test_failed_download_keeps_previous_snapshot():
+    catalog = FeedCatalog(":memory:", key="itemid", batch_size=2)
+    catalog.load_full([_row(1)])
+
+    def rows():
+        yield _row(2)
+        yield _row(3)
+        raise ConnectionError("caiu")
+
+    with pytest.raises(ConnectionError):
+        catalog.load_full(rows())
+    assert catalog.count() == 1
+    assert catalog.get(1) is not None
+
+
+class FakeFeedClient:
+    def __init__(self, feeds, rows):
+        self.feeds = feeds
+        self.rows = rows
+        self.downloaded = []
+
+    def list_item_feeds(self, feed_mode=None):
+        feeds = [f for f in self.feeds if f["feedMode"] == feed_mode]
+        return {"data": {"listItemFeeds": {"feeds": feeds}}}
+
+    def iter_item_feed_rows(self, datafeed_id, *, limit, max_workers):
+        self.downloaded.append(datafeed_id)
+        return iter(self.rows[datafeed_id])
+
+
+def test_sync_loads_full_once_then_only_new_deltas(tmp_path):
+    feeds = [
+        {"datafeedId": "full1", "feedMode": "FULL", "date": "2024-05-01"},
+        {"datafeedId": "full2", "feedMode": "FULL", "date": "2024-05-02"},
+        {"datafeedId": "d0", "feedMode": "DELTA", "date": "2024-05-01"},
+        {"datafeedId": "d1", "feedMode": "DELTA", "date": "2024-05-02"},
+    ]
+    client = FakeFeedClient(
+        feeds,
+        {
+            "full2": [_row(1), _row(2)],
+            "d1": [_row(2, update_type="DELETE")],
+            "d2": [_row(3, update_type="NEW")],
+        },
+    )
+    path = str(tmp_path / "catalog.db")
+
+    with FeedCatalog(path, key="itemid") as catalog:
+        catalog.sync(client)
+        assert client.downloaded == ["full2", "d1"]
+        assert catalog.count() == 1
+
+    feeds.append({"datafeedId": "d2", "feedMode": "DELTA", "date": "2024-05-03"})
+    with FeedCatalog(path, key="itemid") as catalog:
+        results = catalog.sync(client)
+        assert [r.datafeed_id for r in results] == ["d2"]
+        assert client.downloaded == ["full2", "d1", "d2"]
+        assert catalog.count() == 2
+
+
+def test_sync_reloads_when_a_newer_full_is_listed(tmp_path):
+    feeds = [
+        {"datafeedId": "full1", "feedMode": "FULL", "date": "2024-05-01"},
+        {"datafeedId": "d1", "feedMode": "DELTA", "date": "2024-05-01"},
+    ]
+    client = FakeFeedClient(
+        feeds,
+        {
+            "full1": [_row(1), _row(2)],
+            "d1": [_row(2, update_type="DELETE")],
+            "full2": [_row(1), _row(3)],
+        },
+    )
+
+    with FeedCatalog(str(tmp_path / "catalog.db"), key="itemid") as catalog:
+        catalog.sync(client)
+        assert catalog.sync(client) == []
+
+        feeds.append({"datafeedId": "full2", "feedMode": "FULL", "date": "2024-05-02"})
+        results = catalog.sync(client)
+
+        assert [r.datafeed_id for r in results] == ["full2"]
+        assert catalog.last_full_date() == "2024-05-02"
+        assert sorted(r[0] for r in catalog.execute("SELECT item_key FROM items")) == [
+            "1",
+            "3",
+        ]
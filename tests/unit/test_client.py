@@ -0,0 +1,274 @@
+import json
+
+import pytest
+
+from shopee_affiliate import ShopeeAffiliateClient
+
+
+def _batch_response(urls, failed=()):
+    links = [
+        {
+            "originUrl": u,
+            "shortLink": None if u in failed else f"https://s.shopee/{i}",
+            "success": u not in failed,
+            "errorMessage": "invalid url" if u in failed else None,
+        }
+        for i, u in enumerate(urls)
+    ]
+    return {"data": {"generateBatchShortLink": {"links": links}}}
+
+
+def test_generate_short_links_chunks_and_keeps_order(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    urls = [f"https://shopee.com.br/p/{i}" for i in range(5)]
+    calls = []
+
+    def fake_request(query, variables=None):
+        chunk = variables["input"]["links"]
+        calls.append(chunk)
+        return _batch_response(list(reversed(chunk)), failed={urls[3]})
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    out = client.generate_short_links(urls, ["camp1"], chunk_size=2)
+
+    assert calls == [urls[0:2], urls[2:4], urls[4:5]]
+    assert [r["originUrl"] for r in out] == urls
+    assert [r["success"] for r in out] == [True, True, True, False, True]
+    assert out[3]["errorMessage"] == "invalid url"
+
+
+def test_generate_short_links_maps_request_errors_to_every_url(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(
+        client,
+        "_request",
+        lambda q, variables=None: {"errors": [{"message": "Params Error"}]},
+    )
+
+    out = client.generate_short_links(["https://a", "https://b"])
+
+    assert [r["success"] for r in out] == [False, False]
+    assert {r["errorMessage"] for r in out} == {"Params Error"}
+
+
+def test_generate_short_links_validates_sub_ids():
+    client = ShopeeAffiliateClient("1", "sec")
+    with pytest.raises(ValueError):
+        client.generate_short_links(["https://a"], ["canal_email"])
+
+
+def _fake_conversion_pages(total):
+    def fake_report(purchase_time_start, purchase_time_end, scroll_id=None, limit=10):
+        page = 0 if scroll_id is None else int(scroll_id)
+        return {
+            "data": {
+                "conversionReport": {
+                    "nodes": [{"orders": [{"orderId": page}]}],
+                    "pageInfo": {
+                        "hasNextPage": page + 1 < total,
+                        "scrollId": str(page + 1),
+                    },
+                }
+            }
+        }
+
+    return fake_report
+
+
+def test_iter_conversion_report_pages_prefetch_keeps_order(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(client, "get_conversion_report", _fake_conversion_pages(6))
+
+    orders = client.iter_conversion_report_orders(0, 10, prefetch=2)
+
+    assert [o["orderId"] for o in orders] == list(range(6))
+
+
+def test_iter_conversion_report_pages_warns_when_scroll_id_gets_old(
+    monkeypatch, caplog
+):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(client, "get_conversion_report", _fake_conversion_pages(2))
+    monkeypatch.setattr("shopee_affiliate.client.SCROLL_ID_WARN_S", 0.0)
+
+    with caplog.at_level("WARNING", logger="shopee_affiliate.client"):
+        pages = list(client.iter_conversion_report_pages(0, 10))
+
+    assert len(pages) == 2
+    assert "scrollId" in caplog.text
+
+
+def test_iter_conversion_report_orders_stream_decodes_pages(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    fake_page = _fake_conversion_pages(3)
+    pages = []
+
+    def fake_stream(query, variables=None):
+        pages.append(variables.get("scrollId"))
+        body = fake_page(0, 10, scroll_id=variables.get("scrollId"))
+        body["data"]["conversionReport"]["nodes"][0]["purchaseTime"] = 5
+        raw = json.dumps(body).encode()
+        for i in range(0, len(raw), 7):
+            yield raw[i : i + 7]
+
+    monkeypatch.setattr(client.transport, "request_stream", fake_stream)
+
+    orders = list(client.iter_conversion_report_orders(0, 10, stream=True))
+
+    assert [o["orderId"] for o in orders] == [0, 1, 2]
+    assert all(o["purchaseTime"] == 5 for o in orders)
+    assert pages == [None, "1", "2"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_conversion_orders_follow_scroll_id_past_an_empty_page(monkeypatch, stream):
+    client = ShopeeAffiliateClient("1", "sec")
+
+    def body(scroll_id):
+        page = 0 if scroll_id is None else int(scroll_id)
+        nodes = [] if page == 0 else [{"orders": [{"orderId": page}]}]
+        page_info = {"hasNextPage": page < 2, "scrollId": str(page + 1)}
+        return {"data": {"conversionReport": {"nodes": nodes, "pageInfo": page_info}}}
+
+    monkeypatch.setattr(
+        client, "_request", lambda q, variables=None: body(variables.get("scrollId"))
+    )
+
+    def fake_stream(query, variables=None):
+        yield json.dumps(body(variables.get("scrollId"))).encode()
+
+    monkeypatch.setattr(client.transport, "request_stream", fake_stream)
+
+    orders = client.iter_conversion_report_orders(0, 10, stream=stream)
+
+    assert [o["orderId"] for o in orders] == [1, 2]
+
+
+def _fake_partner_page(variables):
+    page = int(variables.get("searchNextToken") or 0)
+    return {
+        "data": {
+            "partnerOrderReport": {
+                "nodes": [{"orderId": f"{page}-{i}"} for i in range(2)],
+                "searchNextPageInfo": {
+                    "size": 2,
+                    "limit": variables["limit"],
+                    "searchNextToken": str(page + 1) if page < 2 else "",
+                },
+            }
+        }
+    }
+
+
+def test_iter_partner_order_report_orders_follows_search_next_token(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    tokens = []
+
+    def fake_request(query, variables=None):
+        tokens.append(variables.get("searchNextToken"))
+        return _fake_partner_page(variables)
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    orders = list(client.iter_partner_order_report_orders(1, 2, prefetch=2))
+
+    assert [o["orderId"] for o in orders] == [
+        "0-0",
+        "0-1",
+        "1-0",
+        "1-1",
+        "2-0",
+        "2-1",
+    ]
+    assert tokens == [None, "1", "2"]
+
+
+def test_iter_partner_order_report_orders_stream(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+
+    def fake_stream(query, variables=None):
+        assert "partnerOrderReport" in query
+        raw = json.dumps(_fake_partner_page(variables)).encode()
+        for i in range(0, len(raw), 5):
+            yield raw[i : i + 5]
+
+    monkeypatch.setattr(client.transport, "request_stream", fake_stream)
+
+    orders = client.iter_partner_order_report_orders(
+        complete_time_start=1, complete_time_end=2, limit=2, stream=True
+    )
+
+    assert [o["orderId"] for o in orders][-2:] == ["2-0", "2-1"]
+
+
+def test_async_iter_partner_order_report_pages_prefetch(monkeypatch):
+    pytest.importorskip("httpx")
+    import asyncio
+
+    from shopee_affiliate import AsyncShopeeAffiliateClient
+
+    async def run():
+        async with AsyncShopeeAffiliateClient("1", "sec") as client:
+
+            async def fake_request(query, variables=None):
+                return _fake_partner_page(variables)
+
+            monkeypatch.setattr(client, "_request", fake_request)
+            return [
+                o
+                async for o in client.iter_partner_order_report_orders(1, 2, prefetch=1)
+            ]
+
+    assert len(asyncio.run(run())) == 6
+
+
+def test_conversion_report_filters_are_pushed_to_every_page(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    seen = []
+
+    def fake_request(query, variables=None):
+        seen.append(variables)
+        return _fake_conversion_pages(2)(
+            0, 10, scroll_id=variables.get("scrollId"), limit=variables["limit"]
+        )
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    orders = list(
+        client.iter_conversion_report_orders(
+            0, 10, shop_id=42, conversion_status="COMPLETED"
+        )
+    )
+
+    assert len(orders) == 2
+    assert [(v["shopId"], v["conversionStatus"]) for v in seen] == [
+        (42, "COMPLETED"),
+        (42, "COMPLETED"),
+    ]
+    with pytest.raises(ValueError):
+        list(client.iter_conversion_report_orders(0, 10, device="TV", stream=True))
+
+
+def test_projected_fields_are_sent_on_every_page(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    seen = []
+
+    def fake_request(query, variables=None):
+        seen.append(query)
+        return _fake_conversion_pages(2)(
+            0, 10, scroll_id=variables.get("scrollId"), limit=variables["limit"]
+        )
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    orders = list(
+        client.iter_conversion_report_orders(
+            0, 10, fields=["orders.items.itemTotalCommission"], shop_id=42
+        )
+    )
+
+    assert len(orders) == 2
+    assert len(seen) == 2 and seen[0] is seen[1]
+    assert "itemTotalCommission" in seen[0] and "imageUrl" not in seen[0]
+    with pytest.raises(ValueError):
+        list(client.iter_partner_order_report_orders(1, 2, fields=["clickId"]))
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from shopee_affiliate.codec import JsonCodec, OrjsonCodec, default_codec, get_codec
+from shopee_affiliate.transport import ShopeeAffiliateTransport
+
+VARIABLES = [
+    {"keyword": "fone", "page": 1, "limit": 500, "sortType": 2},
+    {"purchaseTimeStart": 1700000000, "scrollId": None, "flag": True},
+    {"keyword": "promoção relâmpago ✓", "shopId": 2**62},
+    {"input": {"originUrl": "https://shopee.com.br/x?a=1&b=\\"}, "subIds": ["a"]},
+    {"ctrl": "\b\f\n\r\t\x00\x1f\x7f ", "emoji": "\U0001f600"},
+    {"rate": 0.1, "small": 1e-5, "big": 1e16, "neg": -0.0},
+    {"huge": 2**70, 1: "chave int"},
+    [],
+    {},
+]
+
+
+@pytest.mark.parametrize("obj", VARIABLES)
+def test_orjson_codec_is_byte_identical_to_stdlib(obj):
+    pytest.importorskip("orjson")
+    canonical = json.dumps(obj, separators=(",", ":")).encode()
+
+    assert JsonCodec().dumps(obj) == canonical
+    assert OrjsonCodec().dumps(obj) == canonical
+
+
+def test_orjson_codec_loads_bytes_and_str():
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+
+    assert codec.loads(b'{"a":[1,"\xc3\xa7"]}') == {"a": [1, "ç"]}
+    assert codec.loads('{"a":null}') == {"a": None}
+
+
+def test_get_codec_resolves_names_and_instances():
+    stdlib = JsonCodec()
+
+    assert get_codec(stdlib) is stdlib
+    assert get_codec("stdlib").name == "stdlib"
+    assert get_codec(None).name == default_codec().name
+    with pytest.raises(ValueError):
+        get_codec("ujson")
+
+
+def test_transport_uses_configured_codec():
+    transport = ShopeeAffiliateTransport("1", "sec", codec="stdlib")
+
+    assert transport.codec.name == "stdlib"
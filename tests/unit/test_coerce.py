@@ -0,0 +1,7 @@
+from shopee_affiliate.coerce import to_float, to_int, to_text
+
+
+def test_empty_values_become_none_and_strings_are_converted():
+    assert [to_int(v) for v in (None, "", "7", 7)] == [None, None, 7, 7]
+    assert [to_float(v) for v in (None, "", "12.34")] == [None, None, 12.34]
+    assert [to_text(v) for v in (None, 5, "a")] == [None, "5", "a"]
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+import pytest
+
+from shopee_affiliate import export
+
+
+def _orders(n):
+    return [
+        {
+            "orderId": str(i),
+            "purchaseTime": 1000 + i,
+            "orderStatus": "COMPLETED",
+            "items": [
+                {"itemId": i, "qty": 1, "itemPrice": "9.90", "shopName": "loja"},
+                {"itemId": i + 100, "itemTotalCommission": "0.5"},
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def test_iter_item_rows_flattens_and_converts_types():
+    rows = list(export.iter_item_rows(_orders(1)))
+
+    assert len(rows) == 2
+    assert rows[0]["orderId"] == "0"
+    assert rows[0]["itemPrice"] == 9.9
+    assert rows[1]["itemTotalCommission"] == 0.5
+    assert rows[1]["shopName"] is None
+    assert list(rows[0]) == [name for name, *_ in export.COLUMNS]
+
+
+def test_jsonl_export_is_compact_and_gzip_aware(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+
+    summary = export.write_conversion_report(_orders(3), path)
+
+    assert (summary.format, summary.rows) == ("jsonl", 6)
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        first = json.loads(fh.readline())
+    assert first == {
+        "orderId": "0",
+        "purchaseTime": 1000,
+        "orderStatus": "COMPLETED",
+        "itemId": 0,
+        "qty": 1,
+        "itemPrice": 9.9,
+        "shopName": "loja",
+    }
+
+
+def test_auto_falls_back_to_jsonl_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "pa", None)
+
+    summary = export.write_conversion_report(_orders(1), tmp_path / "out.parquet")
+
+    assert summary.format == "jsonl"
+    assert summary.path.endswith("out.jsonl")
+    with pytest.raises(ImportError):
+        export.write_conversion_report([], tmp_path / "x", format="parquet")
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_columnar_export_writes_batches(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"out{suffix}"
+
+    summary = export.write_conversion_report(_orders(5), path, batch_rows=4)
+
+    assert summary.rows == 10
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        meta = pq.ParquetFile(path).metadata
+        assert meta.num_row_groups == 3
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            assert reader.num_record_batches == 3
+            table = reader.read_all()
+    assert table.num_rows == 10
+    assert table.schema.field("itemPrice").type == pa.float64()
+    assert table.column("itemId").to_pylist()[:2] == [0, 100]
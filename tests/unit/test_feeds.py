@@ -0,0 +1,177 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from shopee_affiliate import AsyncShopeeAffiliateClient, ShopeeAffiliateClient, feeds
+
+
+def _fake_feed(total, *, server_limit=None, grow_to=None, calls=None):
+    lock = threading.Lock()
+
+    def get_item_feed_data(datafeed_id, offset=0, limit=500):
+        with lock:
+            if calls is not None:
+                calls.append((offset, limit))
+        # páginas chegam fora de ordem
+        time.sleep(0.01 * ((offset // max(limit, 1)) % 3))
+        size = min(limit, server_limit or limit)
+        current = grow_to if grow_to and offset > 0 else total
+        rows = [
+            {"columns": json.dumps({"id": i}), "updateType": "NEW"}
+            for i in range(offset, min(offset + size, current))
+        ]
+        return {
+            "data": {
+                "getItemFeedData": {
+                    "rows": rows,
+                    "pageInfo": {
+                        "offset": offset,
+                        "limit": size,
+                        "totalCount": current,
+                        "hasMore": offset + size < current,
+                    },
+                }
+            }
+        }
+
+    return get_item_feed_data
+
+
+def _ids(rows):
+    return [json.loads(r["columns"])["id"] for r in rows]
+
+
+def test_iter_item_feed_rows_fans_out_offsets_and_keeps_order(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    calls = []
+    monkeypatch.setattr(client, "get_item_feed_data", _fake_feed(95, calls=calls))
+
+    rows = list(client.iter_item_feed_rows("f1", limit=10, max_workers=3))
+
+    assert _ids(rows) == list(range(95))
+    assert sorted(offset for offset, _ in calls) == list(range(0, 95, 10))
+
+
+def test_iter_item_feed_rows_follows_server_page_size(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(client, "get_item_feed_data", _fake_feed(23, server_limit=4))
+
+    rows = list(client.iter_item_feed_rows("f1", limit=10))
+
+    assert _ids(rows) == list(range(23))
+
+
+def test_iter_item_feed_rows_continues_when_feed_grows(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(client, "get_item_feed_data", _fake_feed(20, grow_to=35))
+
+    rows = list(client.iter_item_feed_rows("f1", limit=10))
+
+    assert _ids(rows) == list(range(35))
+
+
+def test_download_item_feed_writes_columns_in_order(monkeypatch, tmp_path):
+    client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(client, "get_item_feed_data", _fake_feed(42))
+    path = str(tmp_path / "feed.jsonl.gz")
+
+    summary = client.download_item_feed("f1", path, limit=5, max_workers=4)
+
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(42))
+    assert (summary.rows, summary.total_count) == (42, 42)
+    assert not (tmp_path / "feed.jsonl.gz.part").exists()
+
+
+def test_download_item_feed_fails_on_missing_page(monkeypatch, tmp_path):
+    client = ShopeeAffiliateClient("1", "sec")
+    fake = _fake_feed(30)
+
+    def flaky(datafeed_id, offset=0, limit=500):
+        if offset == 20:
+            return {"errors": [{"message": "System error"}], "data": None}
+        return fake(datafeed_id, offset, limit)
+
+    monkeypatch.setattr(client, "get_item_feed_data", flaky)
+    path = tmp_path / "feed.jsonl"
+
+    with pytest.raises(RuntimeError, match="System error"):
+        client.download_item_feed("f1", str(path), limit=10)
+    assert not path.exists()
+    assert not (tmp_path / "feed.jsonl.part").exists()
+
+
+def test_async_iter_item_feed_rows_keeps_order(monkeypatch):
+    pytest.importorskip("httpx")
+    fake = _fake_feed(57)
+
+    async def get_item_feed_data(datafeed_id, offset=0, limit=500):
+        await asyncio.sleep(0.001 * ((offset // limit) % 3))
+        return fake(datafeed_id, offset, limit)
+
+    async def run():
+        async with AsyncShopeeAffiliateClient("1", "sec") as client:
+            monkeypatch.setattr(client, "get_item_feed_data", get_item_feed_data)
+            return [
+                row
+                async for row in client.iter_item_feed_rows(
+                    "f1", limit=10, max_workers=3
+                )
+            ]
+
+    assert _ids(asyncio.run(run())) == list(range(57))
+
+
+def test_async_download_item_feed_matches_sync_output(monkeypatch, tmp_path):
+    pytest.importorskip("httpx")
+    fake = _fake_feed(23)
+    sync_client = ShopeeAffiliateClient("1", "sec")
+    monkeypatch.setattr(sync_client, "get_item_feed_data", fake)
+    sync_summary = sync_client.download_item_feed(
+        "f1", str(tmp_path / "sync.jsonl"), limit=5
+    )
+
+    async def get_item_feed_data(datafeed_id, offset=0, limit=500):
+        return fake(datafeed_id, offset, limit)
+
+    async def run():
+        async with AsyncShopeeAffiliateClient("1", "sec") as client:
+            monkeypatch.setattr(client, "get_item_feed_data", get_item_feed_data)
+            return await client.download_item_feed(
+                "f1", str(tmp_path / "async.jsonl"), limit=5
+            )
+
+    async_summary = asyncio.run(run())
+
+    assert (async_summary.rows, async_summary.total_count) == (
+        sync_summary.rows,
+        sync_summary.total_count,
+    )
+    assert (tmp_path / "async.jsonl").read_bytes() == (
+        tmp_path / "sync.jsonl"
+    ).read_bytes()
+
+
+def test_map_ordered_threaded_limits_in_flight_calls():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fn(x):
+        with lock:
+            active.append(x)
+            peak.append(len(active))
+        time.sleep(0.005)
+        with lock:
+            active.remove(x)
+        return x * 2
+
+    out = list(feeds.map_ordered_threaded(fn, range(20), max_workers=3))
+
+    assert out == [x * 2 for x in range(20)]
+    assert max(peak) <= 3
@@ -0,0 +1,87 @@
+import runpy
+import sys
+from pathlib import Path
+
+from shopee_affiliate import models
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _node():
+    return {
+        "purchaseTime": 100,
+        "conversionId": "c1",
+        "totalCommission": "1.50",
+        "unknownField": "descartado",
+        "orders": [
+            {
+                "orderId": "o1",
+                "orderStatus": "PENDING",
+                "items": [{"itemId": 7, "itemPrice": "19.90", "qty": 2}],
+            }
+        ],
+    }
+
+
+def test_models_are_slotted_and_drop_unknown_fields():
+    conversion = models.Conversion.from_dict(_node())
+
+    assert not hasattr(conversion, "__dict__")
+    assert "unknownField" not in conversion.to_dict()
+    assert isinstance(conversion.orders[0], models.ConversionOrder)
+    assert isinstance(conversion.orders[0].items[0], models.ConversionItem)
+
+
+def test_numeric_strings_are_decoded_once_on_first_access():
+    item = models.ConversionItem.from_dict({"itemPrice": "19.90", "itemCommission": ""})
+
+    assert item._itemPrice == "19.90"
+    assert item.itemPrice == 19.9
+    assert item._itemPrice == 19.9
+    assert item.itemCommission is None
+    assert models.ProductOffer.from_dict({"sales": "42"}).sales == 42
+
+
+def test_malformed_numeric_string_is_returned_raw():
+    item = models.ConversionItem.from_dict({"itemPrice": "N/A", "qty": 2})
+
+    assert item.itemPrice == "N/A"
+    assert item.to_dict()["qty"] == 2
+
+
+def test_low_cardinality_strings_are_interned():
+    status = "".join(["PEN", "DING"])
+    a = models.ConversionOrder.from_dict({"orderStatus": status})
+    b = models.ConversionOrder.from_dict({"orderStatus": "".join(["PEND", "ING"])})
+
+    assert a.orderStatus is b.orderStatus
+
+
+def test_to_dict_roundtrip_and_equality():
+    conversion = models.Conversion.from_dict(_node())
+
+    data = conversion.to_dict()
+
+    assert data["totalCommission"] == 1.5
+    assert data["orders"][0]["items"][0] == {"itemId": 7, "itemPrice": 19.9, "qty": 2}
+    assert models.Conversion.from_dict(data) == conversion
+
+
+def test_parse_nodes_uses_query_model():
+    resp = {"data": {"productOfferV2": {"nodes": [{"itemId": 1, "price": "9.99"}]}}}
+
+    (offer,) = models.parse_nodes(resp, "productOfferV2")
+
+    assert isinstance(offer, models.ProductOffer)
+    assert offer.price == 9.99
+    assert models.parse_nodes({"data": None}, "shopOfferV2") == []
+
+
+def test_generated_models_are_up_to_date(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["generate_models.py"])
+    script = runpy.run_path(str(ROOT / "scripts" / "generate_models.py"))
+
+    generated = (ROOT / "src" / "shopee_affiliate" / "models.py").read_text(
+        encoding="utf-8"
+    )
+    assert script["render"]() == generated
@@ -0,0 +1,60 @@
+import pytest
+
+from shopee_affiliate import projection, queries
+from shopee_affiliate.graphql import load_document
+
+
+def _report(fields):
+    return queries.q_conversion_report(
+        purchase_time_start=1,
+        purchase_time_end=2,
+        scroll_id=None,
+        limit=10,
+        fields=fields,
+    ).query
+
+
+def test_no_projection_keeps_default_document():
+    assert _report(None) is load_document("conversionReport.graphql")
+
+
+def test_fields_replace_node_selection_and_keep_key_fields():
+    query = _report(["orders.items.itemTotalCommission"])
+
+    assert query.endswith(
+        "{nodes{purchaseTime conversionId orders{orderId items{itemTotalCommission}}}"
+        "pageInfo{limit hasNextPage scrollId}}}"
+    )
+    # Argumentos/variáveis não mudam, só a seleção.
+    assert query.split("{nodes{")[0] == _report(None).split("{nodes{")[0]
+
+
+def test_equivalent_projections_share_the_cached_document():
+    a = _report(["orders.items.qty", "conversionStatus", "orders.items.qty"])
+    b = _report(["conversionStatus", "orders.items.qty"])
+
+    assert a is b
+
+
+def test_object_path_selects_whole_subtree():
+    query = queries.q_partner_order_report(limit=5, fields=["extInfo"]).query
+
+    assert "{nodes{orderId purchaseTime extInfo{clickId videoId userType}}" in query
+
+
+def test_presets():
+    minimal = queries.q_product_offer_v2(fields="minimal").query
+    full = queries.q_shop_offer_v2(fields="full").query
+
+    assert "{nodes{itemId commissionRate price productName offerLink}" in minimal
+    assert "sellerCommCoveRatio" in full
+    assert "bannerInfo" not in full  # objeto sem modelo não é selecionável
+
+
+@pytest.mark.parametrize(
+    "fields",
+    ["tudo", [], ["orders.nope"], ["purchaseTime.x"], ["purchaseTimeStart"]],
+)
+def test_invalid_fields_are_rejected(fields):
+    with pytest.raises(ValueError):
+        projection.normalize("conversionReport", fields)
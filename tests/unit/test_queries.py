@@ -0,0 +1,257 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from shopee_affiliate import ShopeeAffiliateClient, queries
+from shopee_affiliate.graphql import minify
+from shopee_affiliate.transport import _encode_payload
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_query_text_is_constant_and_arguments_go_to_variables():
+    page1 = queries.q_product_offer_v2(keyword='tenis "azul"', page=1)
+    page2 = queries.q_product_offer_v2(keyword="tenis", page=2, shop_id=7)
+
+    assert page1.query is page2.query
+    assert "tenis" not in page1.query
+    assert page1.variables == {
+        "keyword": 'tenis "azul"',
+        "listType": 0,
+        "sortType": 1,
+        "page": 1,
+        "limit": 10,
+    }
+    assert page2.variables["shopId"] == 7
+
+
+def test_conversion_report_omits_scroll_id_on_first_page():
+    first = queries.q_conversion_report(
+        purchase_time_start=1, purchase_time_end=2, scroll_id=None, limit=500
+    )
+    assert "scrollId" not in first.variables
+
+
+def test_encoded_payload_matches_canonical_json():
+    op = queries.m_generate_short_link(origin_url="https://x/ç", sub_ids=["a1"])
+    canonical = json.dumps(
+        {"query": op.query, "variables": op.variables}, separators=(",", ":")
+    )
+    assert _encode_payload(op.query, op.variables) == canonical.encode()
+    assert _encode_payload("query{x}", None) == b'{"query":"query{x}"}'
+
+
+def test_minify_keeps_only_significant_tokens():
+    source = """
+    # comentário
+    query Q($a: Int, $b: [String!]!) {
+      x(a: $a, b: $b, s: "a,  b # c") {
+        ... on T { y z }
+      }
+    }
+    """
+    assert minify(source) == (
+        'query Q($a:Int$b:[String!]!){x(a:$a b:$b s:"a,  b # c"){...on T{y z}}}'
+    )
+
+
+def test_documents_are_loaded_minified():
+    op = queries.q_conversion_report(
+        purchase_time_start=1, purchase_time_end=2, scroll_id=None, limit=500
+    )
+    assert "\n" not in op.query and "  " not in op.query
+    assert op.query.startswith("query ConversionReport($purchaseTimeStart:Int64")
+
+
+def test_batch_operations_aliases_selections_and_variables():
+    op, aliases = queries.batch_operations(
+        [
+            queries.q_product_offer_v2(keyword="tenis", page=1),
+            queries.q_product_offer_v2(keyword="tenis", page=2),
+        ]
+    )
+
+    assert aliases == ["q0", "q1"]
+    assert op.query.startswith("query($q0_keyword:String$q0_shopId:Int64")
+    assert "q0:productOfferV2(" in op.query
+    assert "page:$q1_page" in op.query
+    assert op.query == minify(op.query)
+    assert op.variables["q0_page"] == 1
+    assert op.variables["q1_page"] == 2
+
+
+def test_batch_operations_rejects_mixed_operations():
+    with pytest.raises(ValueError):
+        queries.batch_operations(
+            [
+                queries.q_shopee_offer_v2(),
+                queries.m_generate_short_link(origin_url="https://x", sub_ids=None),
+            ]
+        )
+
+
+def test_split_batch_response_routes_errors_by_alias():
+    resp = {
+        "data": {"q0": {"nodes": [1]}, "q1": None},
+        "errors": [{"message": "boom", "path": ["q1"]}],
+    }
+
+    first, second = queries.split_batch_response(resp, ["q0", "q1"], "productOfferV2")
+
+    assert first == {"data": {"productOfferV2": {"nodes": [1]}}}
+    assert second["data"] == {"productOfferV2": None}
+    assert second["errors"][0]["message"] == "boom"
+
+
+def test_client_batch_chunks_requests(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    sent = []
+
+    def fake_request(query, variables=None):
+        sent.append(variables)
+        n = query.count("productOfferV2(")
+        return {
+            "data": {f"q{i}": {"nodes": [variables[f"q{i}_page"]]} for i in range(n)}
+        }
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    out = client.get_product_offers_batch(
+        [{"keyword": "x", "page": p} for p in range(1, 6)], per_request=2
+    )
+
+    assert len(sent) == 3
+    assert [r["data"]["productOfferV2"]["nodes"] for r in out] == [
+        [1],
+        [2],
+        [3],
+        [4],
+        [5],
+    ]
+
+
+def test_item_feed_queries_validate_feed_mode_and_pass_offsets():
+    assert queries.q_list_item_feeds().variables == {}
+    assert queries.q_list_item_feeds(feed_mode="DELTA").variables == {
+        "feedMode": "DELTA"
+    }
+    with pytest.raises(ValueError):
+        queries.q_list_item_feeds(feed_mode="delta")
+
+    op = queries.q_get_item_feed_data(datafeed_id="f1", offset=0, limit=500)
+    assert op.variables == {"datafeedId": "f1", "offset": 0, "limit": 500}
+
+
+def test_conversion_report_filters_become_variables_with_constant_query():
+    base = queries.q_conversion_report(
+        purchase_time_start=1, purchase_time_end=2, scroll_id=None, limit=500
+    )
+    op = queries.q_conversion_report(
+        purchase_time_start=1,
+        purchase_time_end=2,
+        scroll_id="s",
+        limit=500,
+        shop_id=123,
+        shop_type="C2C_CB",
+        order_status="COMPLETED",
+        fraud_status="VERIFIED",
+        device="APP",
+        campaign_type="MCN_CAMPAIGN",
+        product_name='tenis "x"',
+        conversion_status=None,
+    )
+
+    assert op.query is base.query
+    assert 'tenis "x"' not in op.query
+    assert op.variables == {
+        "purchaseTimeStart": 1,
+        "purchaseTimeEnd": 2,
+        "scrollId": "s",
+        "limit": 500,
+        "shopId": 123,
+        "shopType": ["C2C_CB"],
+        "orderStatus": "COMPLETED",
+        "fraudStatus": "VERIFIED",
+        "device": "APP",
+        "campaignType": "MCN_CAMPAIGN",
+        "productName": 'tenis "x"',
+    }
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"order_status": "completed"},
+        {"fraud_status": "OK"},
+        {"shop_type": ["C2C_CB", "MALL"]},
+        {"shopId": 1},
+    ],
+)
+def test_conversion_report_filters_are_validated(filters):
+    with pytest.raises(ValueError):
+        queries.conversion_report_filters(**filters)
+
+
+def test_filter_enums_match_the_schema():
+    with open(ROOT / "docs" / "introspection_raw.json", encoding="utf-8") as fh:
+        types = json.load(fh)["data"]["__schema"]["types"]
+    schema = {
+        t["name"]: tuple(v["name"] for v in t["enumValues"])
+        for t in types
+        if t["kind"] == "ENUM"
+    }
+
+    for _, enum in queries.CONVERSION_REPORT_FILTERS.values():
+        if enum is not None:
+            assert queries.ENUMS[enum] == schema[enum]
+    assert queries.conversion_report_filters(shop_type="None") == {"shopType": ["None"]}
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "query Q($page:Int$extra:Int){q(page:$page)}",  # declarada sem builder
+        "query Q{q(page:$page)}",  # builder envia, documento não declara
+        "query Q($page:Int){q(page:$page limit:$limit)}",  # uso sem declaração
+    ],
+)
+def test_document_variables_must_match_the_builder(monkeypatch, document):
+    monkeypatch.setattr(queries, "_load", lambda name: document)
+
+    with pytest.raises(ValueError):
+        queries._document("q.graphql", "page")
+
+
+def test_builders_only_send_declared_variables():
+    operations = [
+        queries.q_shopee_offer_v2(keyword="k"),
+        queries.q_shop_offer_v2(keyword="k", shop_id=1, shop_type=[1]),
+        queries.q_product_offer_v2(
+            keyword="k", shop_id=1, item_id=2, product_cat_id=3, match_id=4
+        ),
+        queries.q_conversion_report(
+            purchase_time_start=1,
+            purchase_time_end=2,
+            scroll_id="s",
+            limit=10,
+            **{
+                name: queries.ENUMS[enum][0] if enum else 1
+                for name, (_, enum) in queries.CONVERSION_REPORT_FILTERS.items()
+            },
+        ),
+        queries.q_partner_order_report(
+            purchase_time_start=1,
+            purchase_time_end=2,
+            complete_time_start=3,
+            complete_time_end=4,
+            search_next_token="t",
+            limit=10,
+        ),
+        queries.q_list_item_feeds(feed_mode="FULL"),
+        queries.q_get_item_feed_data(datafeed_id="d", offset=0, limit=10),
+        queries.m_generate_short_link(origin_url="https://a", sub_ids=None),
+    ]
+    for op in operations:
+        header = op.query[: op.query.index("{")]
+        declared = {name for name, _ in queries._VARIABLE_DEFINITION.findall(header)}
+        assert set(op.variables) <= declared, op.query[:40]
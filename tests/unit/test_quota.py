@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+
+from shopee_affiliate.quota import SQLiteQuotaLedger
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ledgers_on_same_file_share_one_budget(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "quota.db"
+    a = SQLiteQuotaLedger(path, key="app", requests_per_hour=100, burst=2, clock=clock)
+    b = SQLiteQuotaLedger(path, key="app", requests_per_hour=100, burst=2, clock=clock)
+
+    assert a._try_acquire(1) == 0.0
+    assert b._try_acquire(1) == 0.0
+    assert a._try_acquire(1) == pytest.approx(3600 / 98)
+
+    clock.now += 3600 / 98
+    assert b._try_acquire(1) == 0.0
+
+
+def test_ledger_keys_are_independent(tmp_path):
+    path = tmp_path / "quota.db"
+    a = SQLiteQuotaLedger(path, key="a", requests_per_hour=10, burst=1)
+    b = SQLiteQuotaLedger(path, key="b", requests_per_hour=10, burst=1)
+
+    assert a._try_acquire(1) == 0.0
+    assert b._try_acquire(1) == 0.0
+
+
+def _drain(path, n, out):
+    ledger = SQLiteQuotaLedger(path, key="app", requests_per_hour=1000, burst=50)
+    out.put(sum(1 for _ in range(n) if ledger._try_acquire(1) == 0.0))
+
+
+def test_ledger_budget_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "quota.db")
+    SQLiteQuotaLedger(path, key="app")._connection()
+    out = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_drain, args=(path, 40, out)) for _ in range(3)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    granted = sum(out.get() for _ in procs)
+    assert 50 <= granted < 55
+
+
+def test_async_acquire_does_not_block_the_event_loop(tmp_path):
+    path = tmp_path / "quota.db"
+    ledger = SQLiteQuotaLedger(path, key="app")
+    ledger._connection()
+    # Outro "processo" segura o lock de escrita por um tempo.
+    holder = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+    holder.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.3, lambda: holder.execute("COMMIT"))
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await ledger.acquire_async()
+        task.cancel()
+        return ticks
+
+    release.start()
+    try:
+        ticks = asyncio.run(run())
+    finally:
+        release.join()
+        holder.close()
+        ledger.close()
+
+    assert ticks >= 10
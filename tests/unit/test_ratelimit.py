@@ -0,0 +1,63 @@
+import pytest
+
+from shopee_affiliate.ratelimit import RateLimiter, TokenBucket, shared_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_reports_wait():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=2.0, burst=3, clock=clock)
+
+    assert [bucket._try_acquire(1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._try_acquire(1) == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket._try_acquire(1) == 0.0
+
+
+def test_token_bucket_refill_is_capped_at_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=1.0, burst=2, clock=clock)
+    clock.now = 100.0
+
+    assert bucket._try_acquire(2) == 0.0
+    assert bucket._try_acquire(1) > 0
+
+
+def test_acquire_sleeps_until_token_available(monkeypatch):
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=4.0, burst=1, clock=clock)
+
+    def fake_sleep(s):
+        clock.now += s
+
+    monkeypatch.setattr("shopee_affiliate.ratelimit.time.sleep", fake_sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    assert clock.now == pytest.approx(0.25)
+
+
+def test_per_hour_never_exceeds_quota_in_one_hour():
+    bucket = TokenBucket.per_hour(2000, burst=20, clock=FakeClock())
+    assert bucket.burst + bucket.rate_per_s * 3600 == pytest.approx(2000)
+
+
+def test_shared_limiter_is_per_app_id():
+    assert shared_limiter("app-a") is shared_limiter("app-a")
+    assert shared_limiter("app-a") is not shared_limiter("app-b")
+
+
+def test_incomplete_limiter_fails_on_instantiation():
+    class NoAcquire(RateLimiter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoAcquire()
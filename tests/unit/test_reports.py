@@ -0,0 +1,320 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from shopee_affiliate import ShopeeAffiliateClient, reports
+
+
+def test_split_time_window_covers_range_with_shared_bounds():
+    windows = reports.split_time_window(0, 100, 3)
+
+    assert windows == [(0, 33), (33, 67), (67, 100)]
+
+
+def test_split_time_window_never_creates_empty_windows():
+    assert reports.split_time_window(10, 12, 8) == [(10, 11), (11, 12)]
+    assert reports.split_time_window(5, 5, 4) == [(5, 5)]
+
+
+def test_split_time_window_validates_arguments():
+    with pytest.raises(ValueError):
+        reports.split_time_window(0, 10, 0)
+    with pytest.raises(ValueError):
+        reports.split_time_window(10, 0, 2)
+
+
+def test_dedupe_orders_keeps_first_and_orders_without_id():
+    orders = [{"orderId": 1}, {"orderId": 2}, {"orderId": 1}, {}, {}]
+
+    assert list(reports.dedupe_orders(orders)) == [
+        {"orderId": 1},
+        {"orderId": 2},
+        {},
+        {},
+    ]
+
+
+def test_merge_threaded_yields_everything_and_propagates_errors():
+    merged = reports.merge_threaded([lambda: range(0, 50), lambda: range(50, 100)])
+    assert sorted(merged) == list(range(100))
+
+    def boom():
+        yield 1
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError, match="falhou"):
+        list(reports.merge_threaded([boom, lambda: range(3)]))
+
+
+def test_merge_threaded_close_stops_producers():
+    produced = []
+
+    def endless():
+        i = 0
+        while True:
+            produced.append(i)
+            yield i
+            i += 1
+
+    merged = reports.merge_threaded([endless], queue_size=2)
+    assert next(merged) == 0
+    merged.close()
+
+    # close() só retorna depois que a thread produtora terminou
+    count = len(produced)
+    time.sleep(0.05)
+    assert len(produced) == count
+    assert not any(t.name.startswith("shopee-shard") for t in threading.enumerate())
+
+
+def test_merge_async_yields_everything_and_propagates_errors():
+    async def numbers(start, stop):
+        for i in range(start, stop):
+            await asyncio.sleep(0)
+            yield i
+
+    async def boom():
+        yield 1
+        raise RuntimeError("falhou")
+
+    async def collect(producers):
+        return [item async for item in reports.merge_async(producers)]
+
+    merged = asyncio.run(collect([lambda: numbers(0, 5), lambda: numbers(5, 10)]))
+    assert sorted(merged) == list(range(10))
+
+    with pytest.raises(RuntimeError, match="falhou"):
+        asyncio.run(collect([boom, lambda: numbers(0, 3)]))
+
+
+def test_sharded_orders_walk_each_window_and_dedupe(monkeypatch):
+    client = ShopeeAffiliateClient("1", "sec")
+    calls = []
+
+    def fake_report(purchase_time_start, purchase_time_end, scroll_id=None, limit=10):
+        calls.append((purchase_time_start, purchase_time_end, scroll_id))
+        if scroll_id is None:
+            # pedido 999 aparece nas duas janelas (fronteira compartilhada)
+            orders = [{"orderId": purchase_time_start}, {"orderId": 999}]
+            page_info = {"hasNextPage": True, "scrollId": f"s{purchase_time_start}"}
+        else:
+            orders = [{"orderId": purchase_time_start + 1}]
+            page_info = {"hasNextPage": False}
+        return {
+            "data": {
+                "conversionReport": {
+                    "nodes": [{"orders": orders}],
+                    "pageInfo": page_info,
+                }
+            }
+        }
+
+    monkeypatch.setattr(client, "get_conversion_report", fake_report)
+    orders = list(client.iter_conversion_report_orders_sharded(0, 100, shards=2))
+
+    assert sorted(o["orderId"] for o in orders) == [0, 1, 50, 51, 999]
+    assert sorted(calls, key=lambda c: (c[0], c[2] or "")) == [
+        (0, 50, None),
+        (0, 50, "s0"),
+        (50, 100, None),
+        (50, 100, "s50"),
+    ]
+
+
+class _FakeReportClient:
+    """Duas páginas por janela; orderIds derivados do início da janela."""
+
+    def __init__(self, fail_at=None):
+        self.calls = []
+        self.fail_at = fail_at
+
+    def iter_conversion_report_pages(self, start, end, *, limit, prefetch):
+        for page in range(2):
+            self.calls.append((start, end, page))
+            if self.fail_at == (start, page):
+                raise ConnectionError("rede caiu")
+            yield {
+                "data": {
+                    "conversionReport": {
+                        "nodes": [
+                            {
+                                "purchaseTime": start + page,
+                                "conversionId": f"c{start}-{page}",
+                                "orders": [{"orderId": f"{start}-{page}"}],
+                            }
+                        ]
+                    }
+                }
+            }
+
+
+def test_conversion_page_orders_carries_node_context():
+    resp = {
+        "data": {
+            "conversionReport": {
+                "nodes": [
+                    {
+                        "purchaseTime": 5,
+                        "conversionId": "c1",
+                        "orders": [{"orderId": 1}],
+                    }
+                ]
+            }
+        }
+    }
+
+    assert list(reports.conversion_page_orders(resp)) == [
+        {"orderId": 1, "purchaseTime": 5, "conversionId": "c1"}
+    ]
+    # A resposta da API não é alterada.
+    assert resp["data"]["conversionReport"]["nodes"][0]["orders"] == [{"orderId": 1}]
+
+
+def test_journal_appends_without_blank_lines_and_skips_torn_line(tmp_path):
+    path = str(tmp_path / "export.json.ids")
+    reports._append_journal(path, [(10, "a", False)])
+    reports._append_journal(path, [(10, "b", True)])
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('[10,"c"')  # queda no meio da escrita
+    reports._append_journal(path, [(10, "d", False)])
+
+    with open(path, encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    assert lines == ['[10,"a",false]', '[10,"b",true]', '[10,"c"', '[10,"d",false]']
+    assert reports._read_journal(path, 10) == ({"a", "b", "d"}, {"b"})
+
+
+def test_export_resumes_from_checkpoint(tmp_path):
+    state_path = str(tmp_path / "export.json")
+    failing = _FakeReportClient(fail_at=(20, 1))
+
+    seen = []
+    with pytest.raises(ConnectionError):
+        for order in reports.export_conversion_report(
+            failing, 0, 30, state_path, window_s=10
+        ):
+            seen.append(order["orderId"])
+    assert seen == ["0-0", "0-1", "10-0", "10-1", "20-0"]
+
+    state = reports.ExportCheckpoint.load(state_path)
+    assert state.completed_until == 20
+    assert state.emitted_order_ids == []
+    assert reports._read_journal(state_path + ".ids", 30) == ({"20-0"}, set())
+
+    resumed = _FakeReportClient()
+    rest = [
+        o["orderId"]
+        for o in reports.export_conversion_report(
+            resumed, 0, 30, state_path, window_s=10
+        )
+    ]
+
+    assert rest == ["20-1"]
+    assert {c[:2] for c in resumed.calls} == {(20, 30)}
+    assert reports.ExportCheckpoint.load(state_path).completed_until == 30
+    assert (
+        list(reports.export_conversion_report(resumed, 0, 30, state_path, window_s=10))
+        == []
+    )
+
+
+class _FakeBoundaryClient:
+    """Páginas fixas por janela; `fail_at=(start, page)` derruba a conexão."""
+
+    def __init__(self, pages, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+
+    def iter_conversion_report_pages(self, start, end, *, limit, prefetch):
+        for page, orders in enumerate(self.pages[start]):
+            if self.fail_at == (start, page):
+                raise ConnectionError("rede caiu")
+            nodes = [{"purchaseTime": t, "orders": [{"orderId": o}]} for o, t in orders]
+            yield {"data": {"conversionReport": {"nodes": nodes}}}
+
+
+def test_export_resume_keeps_boundary_orders_emitted_before_the_crash(tmp_path):
+    state_path = str(tmp_path / "export.json")
+    # "x" cai na fronteira (purchaseTime == fim da 1ª janela) e volta na 2ª.
+    pages = {0: [[("x", 10)], [("y", 5)]], 10: [[("x", 10), ("z", 15)]]}
+
+    seen = []
+    with pytest.raises(ConnectionError):
+        for order in reports.export_conversion_report(
+            _FakeBoundaryClient(pages, fail_at=(0, 1)), 0, 20, state_path, window_s=10
+        ):
+            seen.append(order["orderId"])
+    assert seen == ["x"]
+
+    rest = [
+        o["orderId"]
+        for o in reports.export_conversion_report(
+            _FakeBoundaryClient(pages), 0, 20, state_path, window_s=10
+        )
+    ]
+
+    assert rest == ["y", "z"]
+
+
+def test_export_rejects_checkpoint_of_another_export(tmp_path):
+    state_path = str(tmp_path / "export.json")
+    reports.ExportCheckpoint(0, 30, 10).save(state_path)
+
+    with pytest.raises(ValueError):
+        next(reports.export_conversion_report(_FakeReportClient(), 0, 60, state_path))
+
+
+class _FakeSyncClient:
+    def __init__(self, orders):
+        self.orders = orders
+        self.calls = []
+
+    def iter_conversion_report_pages(self, start, end, *, limit, prefetch):
+        self.calls.append((start, end))
+        nodes = [
+            {"purchaseTime": t, "orders": [{"orderId": oid}]}
+            for oid, t in self.orders
+            if start <= t <= end
+        ]
+        yield {"data": {"conversionReport": {"nodes": nodes}}}
+
+
+def test_sync_reads_only_the_delta_with_overlap(tmp_path):
+    state_path = str(tmp_path / "sync.json")
+    store = {}
+
+    def sink(orders):
+        store.update({o["orderId"]: o for o in orders})
+
+    client = _FakeSyncClient([("a", 100), ("b", 900)])
+    first = reports.sync_conversion_report(
+        client, state_path, sink, initial_lookback_s=1000, overlap_s=50, now=1000
+    )
+    assert client.calls == [(0, 1000)]
+    assert (first.orders, first.watermark) == (2, 900)
+
+    client.orders.append(("c", 1500))
+    second = reports.sync_conversion_report(
+        client, state_path, sink, overlap_s=50, now=2000
+    )
+    assert client.calls[-1] == (850, 2000)
+    assert second.orders == 2  # "b" volta pela margem de sobreposição
+    assert reports.SyncState.load(state_path).watermark == 1500
+    assert sorted(store) == ["a", "b", "c"]
+
+
+def test_sync_keeps_watermark_when_run_fails(tmp_path):
+    state_path = str(tmp_path / "sync.json")
+    reports.SyncState(watermark=500).save(state_path)
+
+    def sink(orders):
+        raise RuntimeError("banco fora do ar")
+
+    with pytest.raises(RuntimeError):
+        reports.sync_conversion_report(
+            _FakeSyncClient([("a", 600)]), state_path, sink, now=1000
+        )
+
+    assert reports.SyncState.load(state_path).watermark == 500
@@ -0,0 +1,95 @@
+from shopee_affiliate import reports
+from shopee_affiliate.store import OrderStore
+
+
+def _order(order_id, purchase_time, status="PENDING", items=()):
+    return {
+        "orderId": order_id,
+        "purchaseTime": purchase_time,
+        "conversionStatus": status,
+        "orderStatus": "COMPLETED",
+        "items": [
+            {
+                "itemId": item_id,
+                "shopId": shop_id,
+                "shopName": f"loja{shop_id}",
+                "qty": 1,
+                "itemPrice": "10.00",
+                "itemTotalCommission": commission,
+            }
+            for item_id, shop_id, commission in items
+        ],
+    }
+
+
+def test_upsert_replaces_order_and_items():
+    store = OrderStore(":memory:")
+
+    assert (
+        store.upsert_orders([_order("1", 100, items=[(10, 1, "1.5"), (11, 2, "2")])])
+        == 1
+    )
+    store.upsert_orders([_order("1", 100, status="COMPLETED", items=[(10, 1, "3")])])
+
+    assert store.count() == 1
+    assert store.execute("SELECT conversion_status FROM orders") == [("COMPLETED",)]
+    assert store.execute("SELECT item_id, item_total_commission FROM order_items") == [
+        (10, 3.0)
+    ]
+
+
+def test_upsert_batches_skip_orders_without_id_and_keep_last_duplicate():
+    store = OrderStore(":memory:", batch_size=2)
+    orders = [
+        _order("1", 1, items=[(10, 1, "1")]),
+        {"items": []},
+        _order("2", 2),
+        _order("2", 2, status="CANCELLED"),
+        _order("3", 3),
+    ]
+
+    assert store.upsert_orders(iter(orders)) == 3
+    assert store.execute(
+        "SELECT order_id, conversion_status FROM orders ORDER BY 1"
+    ) == [
+        ("1", "PENDING"),
+        ("2", "CANCELLED"),
+        ("3", "PENDING"),
+    ]
+
+
+def test_commission_by_shop_filters_by_period_and_status():
+    store = OrderStore(":memory:")
+    store.upsert_orders(
+        [
+            _order("1", 100, items=[(10, 1, "1.5"), (11, 2, "4")]),
+            _order("2", 200, items=[(12, 1, "3")]),
+            _order("3", 300, status="CANCELLED", items=[(13, 1, "100")]),
+        ]
+    )
+
+    assert store.commission_by_shop(since=150) == [(1, "loja1", 103.0)]
+    assert store.commission_by_shop(conversion_status="PENDING") == [
+        (1, "loja1", 4.5),
+        (2, "loja2", 4.0),
+    ]
+
+
+def test_store_works_as_sync_sink(tmp_path):
+    class Client:
+        def iter_conversion_report_pages(self, start, end, *, limit, prefetch):
+            yield {
+                "data": {
+                    "conversionReport": {
+                        "nodes": [{"purchaseTime": 50, "orders": [{"orderId": 7}]}]
+                    }
+                }
+            }
+
+    store = OrderStore(tmp_path / "orders.db")
+    reports.sync_conversion_report(
+        Client(), str(tmp_path / "sync.json"), store.upsert_orders, now=100
+    )
+
+    assert store.execute("SELECT order_id, purchase_time FROM orders") == [("7", 50)]
+    store.close()
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from shopee_affiliate.streaming import NodeStreamDecoder
+
+
+def _body(nodes, **page_info):
+    return json.dumps(
+        {
+            "data": {
+                "conversionReport": {
+                    "nodes": nodes,
+                    "pageInfo": {"hasNextPage": True, "scrollId": "abc", **page_info},
+                }
+            }
+        },
+        ensure_ascii=False,
+        indent=1,
+    ).encode("utf-8")
+
+
+def _decode(body, size):
+    decoder = NodeStreamDecoder()
+    nodes = []
+    for i in range(0, len(body), size):
+        nodes += decoder.feed(body[i : i + size])
+    return nodes, decoder.finish()
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 10_000])
+def test_decoder_yields_nodes_across_any_chunk_boundary(size):
+    nodes = [
+        {"conversionId": i, "orders": [{"orderId": str(i), "shop": "Loja ção ✓"}]}
+        for i in range(5)
+    ]
+
+    decoded, envelope = _decode(_body(nodes), size)
+
+    assert decoded == nodes
+    report = envelope["data"]["conversionReport"]
+    assert report["nodes"] == []
+    assert report["pageInfo"] == {"hasNextPage": True, "scrollId": "abc"}
+
+
+def test_decoder_emits_nodes_before_body_ends():
+    body = _body([{"conversionId": 1}, {"conversionId": 2}])
+    cut = body.index(b'"pageInfo"')
+    decoder = NodeStreamDecoder()
+
+    assert decoder.feed(body[:cut]) == [{"conversionId": 1}, {"conversionId": 2}]
+
+
+def test_decoder_returns_whole_body_without_nodes_array():
+    body = b'{"errors":[{"message":"Invalid Signature"}],"data":null}'
+
+    decoded, envelope = _decode(body, 5)
+
+    assert decoded == []
+    assert envelope["errors"][0]["message"] == "Invalid Signature"
+
+
+def test_decoder_rejects_truncated_nodes():
+    body = _body([{"conversionId": 1}, {"conversionId": 2}])
+    decoder = NodeStreamDecoder()
+    decoder.feed(body[: body.index(b'"conversionId": 2')])
+
+    with pytest.raises(ValueError):
+        decoder.finish()
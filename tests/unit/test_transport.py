@@ -0,0 +1,76 @@
+import json
+
+from shopee_affiliate.transport import ShopeeAffiliateTransport
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body if body is not None else {"data": {}}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+    def iter_content(self, chunk_size):
+        raw = json.dumps(self._body).encode()
+        for i in range(0, len(raw), chunk_size):
+            yield raw[i : i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def post(self, url, headers, data, timeout, stream=False):
+        self.calls.append({"headers": headers, "data": data, "stream": stream})
+        return self.responses.pop(0)
+
+
+def test_request_sends_canonical_payload_and_signature():
+    session = FakeSession([FakeResponse(body={"data": {"ok": True}})])
+    transport = ShopeeAffiliateTransport("1", "sec", session=session)
+
+    assert transport.request("query{x}", {"a": 1}) == {"data": {"ok": True}}
+
+    call = session.calls[0]
+    assert call["data"] == b'{"query":"query{x}","variables":{"a":1}}'
+    assert call["headers"]["Authorization"].startswith("SHA256 Credential=1,")
+
+
+def test_request_retries_on_429_respecting_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("shopee_affiliate.transport.time.sleep", sleeps.append)
+    session = FakeSession(
+        [FakeResponse(429, headers={"Retry-After": "2"}), FakeResponse()]
+    )
+    transport = ShopeeAffiliateTransport("1", "sec", session=session)
+
+    transport.request("query{x}")
+
+    assert sleeps == [2.0]
+    assert len(session.calls) == 2
+
+
+def test_request_stream_yields_raw_chunks_and_closes_response():
+    resp = FakeResponse(body={"data": {"ok": True}})
+    session = FakeSession([resp])
+    transport = ShopeeAffiliateTransport("1", "sec", session=session)
+
+    chunks = list(transport.request_stream("query{x}", chunk_size=4))
+
+    assert session.calls[0]["stream"] is True
+    assert all(len(c) <= 4 for c in chunks)
+    assert json.loads(b"".join(chunks)) == {"data": {"ok": True}}
+    assert resp.closed